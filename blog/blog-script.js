@@ -15,6 +15,9 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Simple fade-in animation for posts
     initPostAnimations();
+    
+    // Load older posts from JSON shards while scrolling
+    initLazyPosts();
 });
 
 // Smooth scrolling for anchor links
@@ -65,6 +68,99 @@ function initPostAnimations() {
     });
 }
 
+// Lazy loading of older posts
+// The index only contains the newest posts; section.posts[data-next-shard] points at the
+// JSON shard for the next page (page/N/posts.json). Each shard names the one after it.
+function initLazyPosts() {
+    const postsSection = document.querySelector('.posts[data-next-shard]');
+    if (!postsSection || !('IntersectionObserver' in window) || !window.fetch) {
+        return;
+    }
+    
+    const pagination = postsSection.querySelector('.pagination');
+    const sentinel = document.createElement('div');
+    sentinel.className = 'posts-sentinel';
+    postsSection.appendChild(sentinel);
+    
+    let nextShard = postsSection.dataset.nextShard;
+    let loading = false;
+    
+    function createPostItem(post) {
+        const article = document.createElement('article');
+        article.className = 'post-item';
+        article.innerHTML = `
+                    <div class="post-content">
+                        <h3 class="post-title"><a></a></h3>
+                        <p class="post-summary"></p>
+                    </div>
+                    <div class="post-meta">
+                        <time></time>
+                        <span class="reading-time"></span>
+                        <span class="author">Joyce Gu</span>
+                    </div>`;
+        const link = article.querySelector('.post-title a');
+        link.href = post.url;
+        link.textContent = post.title;
+        article.querySelector('.post-summary').textContent = post.summary;
+        const time = article.querySelector('time');
+        time.dateTime = post.date;
+        time.textContent = post.date_formatted;
+        article.querySelector('.reading-time').textContent = `${post.reading_time} min`;
+        return article;
+    }
+    
+    function loadNextShard() {
+        if (loading || !nextShard) {
+            return;
+        }
+        loading = true;
+        
+        fetch(nextShard)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(shard => {
+                const anchor = pagination || sentinel;
+                shard.posts.forEach(post => {
+                    const item = createPostItem(post);
+                    item.style.opacity = '0';
+                    item.style.transform = 'translateY(20px)';
+                    item.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
+                    postsSection.insertBefore(item, anchor);
+                    requestAnimationFrame(() => {
+                        item.style.opacity = '1';
+                        item.style.transform = 'translateY(0)';
+                    });
+                });
+                nextShard = shard.next;
+                if (!nextShard) {
+                    // Everything is on the page now; the static page links are no longer needed
+                    observer.disconnect();
+                    if (pagination) {
+                        pagination.remove();
+                    }
+                }
+                loading = false;
+            })
+            .catch(error => {
+                // Leave the static "Older posts" link in place as the fallback
+                console.error('Failed to load more posts:', error);
+                observer.disconnect();
+            });
+    }
+    
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            loadNextShard();
+        }
+    }, { rootMargin: '0px 0px 400px 0px' });
+    
+    observer.observe(sentinel);
+}
+
 // Handle external links
 function initExternalLinks() {
     const externalLinks = document.querySelectorAll('a[href^="http"]');
@@ -114,42 +210,155 @@ function initSearch() {
     
     console.log('Search functionality initialized successfully');
     
-    // Article data for search
-    const articles = [
-        {
-            title: "How to Set Up Notion and Blog Sync",
-            summary: "Overview This integration system allows you to write blog posts directly in Notion and automatically sync them to your website! Fully compatible with ...",
-            date: "2025-08-18",
-            url: "posts/how-to-set-up-notion-and-blog-sync.html",
-            content: "notion integration blog sync automatic website markdown"
-        },
-
-        {
-            title: "Hello to My Little World",
-            summary: "Welcome to my personal corner of the internet! This is where I'll be sharing my thoughts, discoveries, and adventures in technology, life, and everything in between.",
-            date: "2024-01-18",
-            url: "posts/hello-to-my-little-world.html",
-            content: "personal blog welcome introduction digital garden technology life thoughts discoveries adventures"
-        }
-    ];
+    // Prebuilt search index (blog/search, written by the build):
+    // meta.json lists the term shards; terms/<key>.json holds delta-encoded postings
+    // [Δdoc, weight, ...]; docs/<n>.json holds [title, url, date, summary] per doc id
+    // (docs_per_chunk ids per file).
+    // Only the shards a query needs are downloaded, and each one only once.
+    const SEARCH_ROOT = 'search/';
+    const MAX_RESULTS = 20;
+    // Same token pattern as scripts/search_index.py
+    const TOKEN_PATTERN = /([a-z0-9]+)|([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+)/g;
+    const CJK_SHARDS = 64;
+    const shardCache = new Map();
+    let searchMeta = null;
     
     let searchTimeout;
+    let searchGeneration = 0;
+    
+    function fetchJSON(path) {
+        if (!shardCache.has(path)) {
+            shardCache.set(path, fetch(SEARCH_ROOT + path).then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                return response.json();
+            }));
+        }
+        return shardCache.get(path);
+    }
+    
+    function loadMeta() {
+        if (!searchMeta) {
+            searchMeta = fetchJSON('meta.json').then(meta => {
+                meta.shardSet = new Set(meta.shards);
+                return meta;
+            });
+        }
+        return searchMeta;
+    }
+    
+    // Latin words (2+ chars) and CJK bigrams; the last Latin word and lone CJK characters
+    // match as prefixes so results show up while typing
+    function tokenizeQuery(query) {
+        const tokens = [];
+        const text = query.toLowerCase();
+        let match;
+        TOKEN_PATTERN.lastIndex = 0;
+        while ((match = TOKEN_PATTERN.exec(text)) !== null) {
+            if (match[1]) {
+                tokens.push({ term: match[1], prefix: TOKEN_PATTERN.lastIndex === text.length });
+            } else if (match[2].length === 1) {
+                tokens.push({ term: match[2], prefix: true });
+            } else {
+                for (let i = 0; i < match[2].length - 1; i++) {
+                    tokens.push({ term: match[2].slice(i, i + 2), prefix: false });
+                }
+            }
+        }
+        // Single Latin letters are not indexed unless they are being typed as a prefix
+        return tokens.filter(token => token.term.length > 1 || token.prefix);
+    }
+    
+    function shardKey(term) {
+        if (term.charCodeAt(0) < 0x80) {
+            return term.slice(0, 2);
+        }
+        return 'cjk-' + (term.codePointAt(0) % CJK_SHARDS).toString(16).padStart(2, '0');
+    }
     
-    // Search function
+    // doc id -> summed weight for every indexed term matching the token
+    function tokenScores(token, meta) {
+        const key = shardKey(token.term);
+        if (!meta.shardSet.has(key)) {
+            // A one-letter prefix spans every shard starting with that letter
+            const keys = token.term.length === 1 && token.term.charCodeAt(0) < 0x80
+                ? meta.shards.filter(shard => shard[0] === token.term)
+                : [];
+            return Promise.all(keys.map(shard => fetchJSON(`terms/${shard}.json`)))
+                .then(shards => mergePostings(shards, token));
+        }
+        return fetchJSON(`terms/${key}.json`).then(shard => mergePostings([shard], token));
+    }
+    
+    function mergePostings(shards, token) {
+        const scores = new Map();
+        shards.forEach(shard => {
+            Object.keys(shard).forEach(term => {
+                if (term === token.term || (token.prefix && term.startsWith(token.term))) {
+                    const postings = shard[term];
+                    let docId = 0;
+                    for (let i = 0; i < postings.length; i += 2) {
+                        docId += postings[i];
+                        scores.set(docId, (scores.get(docId) || 0) + postings[i + 1]);
+                    }
+                }
+            });
+        });
+        return scores;
+    }
+    
+    function loadDocs(docIds, meta) {
+        const chunks = [...new Set(docIds.map(id => Math.floor(id / meta.docs_per_chunk)))];
+        return Promise.all(chunks.map(chunk => fetchJSON(`docs/${chunk}.json`).then(docs => [chunk, docs])))
+            .then(loaded => {
+                const byChunk = new Map(loaded);
+                return docIds.map(id => {
+                    const [title, url, date, summary] = byChunk.get(Math.floor(id / meta.docs_per_chunk))[id % meta.docs_per_chunk];
+                    return { title, url, date, summary };
+                });
+            });
+    }
+    
+    // Search function: every query term must match; docs are ranked by summed weight,
+    // then by doc id (newer posts get higher ids)
     function performSearch(query) {
-        console.log('Performing search for:', query);
-        if (!query.trim()) {
+        const generation = ++searchGeneration;
+        const tokens = tokenizeQuery(query);
+        if (!query.trim() || tokens.length === 0) {
             hideSearchResults();
             return;
         }
         
-        const results = articles.filter(article => {
-            const searchText = (article.title + ' ' + article.summary + ' ' + article.content).toLowerCase();
-            return searchText.includes(query.toLowerCase());
-        });
-        
-        console.log('Search results:', results);
-        displaySearchResults(results, query);
+        loadMeta()
+            .then(meta => Promise.all(tokens.map(token => tokenScores(token, meta))).then(perToken => {
+                let combined = perToken[0];
+                perToken.slice(1).forEach(scores => {
+                    const next = new Map();
+                    combined.forEach((score, docId) => {
+                        if (scores.has(docId)) {
+                            next.set(docId, score + scores.get(docId));
+                        }
+                    });
+                    combined = next;
+                });
+                const ranked = [...combined.entries()]
+                    .sort((a, b) => b[1] - a[1] || b[0] - a[0])
+                    .slice(0, MAX_RESULTS)
+                    .map(([docId]) => docId);
+                return loadDocs(ranked, meta);
+            }))
+            .then(results => {
+                // Ignore answers to queries the user has already typed past
+                if (generation === searchGeneration) {
+                    displaySearchResults(results, query);
+                }
+            })
+            .catch(error => {
+                console.error('Search failed:', error);
+                shardCache.clear();
+                searchMeta = null;
+            });
     }
     
     // Display search results
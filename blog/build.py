@@ -1,35 +1,100 @@
 #!/usr/bin/env python3
 """
 Blog build script - Convert markdown to HTML and update blog
-Usage: python3 build.py
+Usage: python3 build.py [--force] [--jobs N] [--feed-items N] [--[no-]feed-full-content]
+                        [--profile [FILE]] [--trace [FILE]] [--watch [--port PORT]]
 """
 
 import sys
 import os
+import argparse
 from pathlib import Path
 
 # Add scripts directory to path
 script_dir = Path(__file__).parent / "scripts"
 sys.path.insert(0, str(script_dir))
 
+import build_trace
+from feeds import FEED_FULL_CONTENT, FEED_ITEMS
 from simple_md_converter import SimpleBlogConverter
+import convert_image  # site root, put on sys.path by simple_md_converter
+
+CACHE_DIR = Path(__file__).parent / ".cache"
 
 def main():
     print("🚀 Building Joyce's Blog...")
     print("=" * 50)
     
-    converter = SimpleBlogConverter()
+    parser = argparse.ArgumentParser(description="Build the blog from blog/markdown")
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the build manifest and re-render every post")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="render posts in N worker processes (default: 1)")
+    parser.add_argument('--feed-items', type=int, default=FEED_ITEMS, metavar='N',
+                        help=f"newest posts in feed.xml / atom.xml / feed.json "
+                             f"(default: $BLOG_FEED_ITEMS, currently {FEED_ITEMS})")
+    parser.add_argument('--feed-full-content', action=argparse.BooleanOptionalAction, default=FEED_FULL_CONTENT,
+                        help="put each post's full HTML in the feeds instead of only its summary "
+                             "(default: $BLOG_FEED_FULL_CONTENT, currently %(default)s)")
+    parser.add_argument('--profile', nargs='?', const=CACHE_DIR / "build.prof", type=Path, metavar='FILE',
+                        help="write a cProfile dump of the build (default: blog/.cache/build.prof; "
+                             "with --jobs only the main process is profiled)")
+    parser.add_argument('--trace', nargs='?', const=CACHE_DIR / "build-trace.json", type=Path, metavar='FILE',
+                        help="write per-stage / per-post spans as Chrome trace JSON "
+                             "(default: blog/.cache/build-trace.json)")
+    parser.add_argument('--watch', action='store_true',
+                        help="after building, serve the site with live reload and rebuild changed posts")
+    parser.add_argument('--port', type=int, default=8000,
+                        help="port for --watch's local server (default: 8000)")
+    args = parser.parse_args()
+    if args.feed_items < 1:
+        parser.error("--feed-items must be at least 1")
+    
+    profiler = None
+    if args.profile or args.trace:
+        build_trace.enable()
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
+    converter = SimpleBlogConverter(feed_items=args.feed_items, feed_full_content=args.feed_full_content)
+    
+    # Responsive variants of blog/assets first: post markup is generated from their manifest.
+    # Pillow is only needed when there is something new to process.
+    try:
+        with build_trace.span('images'):
+            processed, _ = convert_image.process_root(converter.blog_dir / "assets", jobs=args.jobs)
+        if processed:
+            print(f"✅ Generated responsive variants for {processed} images")
+    except ImportError:
+        print("⚠️  Pillow is not installed; skipping responsive images (pip install -r requirements.txt)")
     
     # Convert markdown files
-    articles = converter.convert_all_markdown()
+    articles = converter.convert_all_markdown(force=args.force, jobs=args.jobs)
     
     if articles:
         # Update blog index
         converter.update_blog_index(articles)
-        
+    
+    if profiler:
+        profiler.disable()
+        args.profile.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(args.profile)
+    if build_trace.is_enabled():
+        build_trace.print_summary()
+    if args.profile:
+        print(f"📈 cProfile dump: {args.profile} (inspect with: python3 -m pstats {args.profile})")
+    if args.trace:
+        args.trace.parent.mkdir(parents=True, exist_ok=True)
+        build_trace.write_chrome_trace(args.trace)
+        print(f"📈 Chrome trace: {args.trace} (open in chrome://tracing or https://ui.perfetto.dev)")
+    
+    if articles:
         print("\n" + "=" * 50)
         print(f"✨ Blog build complete!")
         print(f"📝 Processed {len(articles)} articles")
+        print(f"♻️  Rebuilt {converter.rebuilt_count} posts, skipped {converter.skipped_count} unchanged")
         print(f"🌐 Visit: http://localhost:8000/blog/")
         
         # List processed articles
@@ -41,6 +106,10 @@ def main():
         print("📝 No articles found to build.")
         print(f"💡 Add markdown files to: blog/markdown/")
         print("📖 See blog/templates/HOW-TO-CREATE-ARTICLES.md for help")
+    
+    if args.watch:
+        from dev_server import watch
+        watch(converter, jobs=args.jobs, port=args.port)
 
 if __name__ == "__main__":
     main()
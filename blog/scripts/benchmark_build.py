@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Build benchmark for Joyce's Blog
+Generates synthetic markdown corpora and times SimpleBlogConverter / BlogConverter
+end to end and per stage, then compares the results against a stored baseline.
+Baseline timings are scaled by a calibration run (a fixed pure-Python workload timed on
+both machines), and only stages present in both runs are compared.
+
+Usage: python3 benchmark_build.py [--sizes 100,1000,10000,50000] [--repeat N]
+                                  [--output results.json] [--save-baseline]
+"""
+
+import io
+import re
+import json
+import sys
+import time
+import random
+import hashlib
+import shutil
+import argparse
+import platform
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import template_engine
+from simple_md_converter import SimpleBlogConverter
+
+BLOG_DIR = Path(__file__).parent.parent
+DEFAULT_BASELINE = BLOG_DIR / "benchmarks" / "baseline.json"
+DEFAULT_SIZES = [100, 1000]
+CORPUS_SIZES = [100, 1000, 10000, 50000]
+
+# A stage is reported as a regression when it is this much slower than the baseline
+# and the slowdown is above the noise floor (small corpora finish in tens of milliseconds)
+REGRESSION_THRESHOLD = 0.20
+NOISE_FLOOR_SECONDS = 0.05
+
+# Rounds of the calibration workload (a few tenths of a second) and runs of it; the fastest run counts
+CALIBRATION_ROUNDS = 1000
+CALIBRATION_RUNS = 3
+
+LATIN_WORDS = (
+    "growth notion python build cache render stream token parser garden reading notes "
+    "product metric retention funnel experiment habit design system curious data team "
+    "feedback loop launch iterate insight model vibe coding template index feed"
+).split()
+
+CJK_PHRASES = [
+    "增长黑客", "阅读笔记", "产品思维", "用户留存", "数据驱动", "快速迭代",
+    "核心指标", "实验设计", "写作习惯", "个人成长", "技术博客", "工作流程",
+    "缓存策略", "性能优化", "同步脚本", "模板渲染",
+]
+
+TAG_POOL = [
+    "读书笔记", "增长", "Notion", "Python", "Productivity", "AI",
+    "Vibe Coding", "产品", "Life", "Tech", "写作", "Tutorial",
+]
+
+CODE_SNIPPETS = [
+    ("python", ["def fib(n):", "    a, b = 0, 1", "    for _ in range(n):", "        a, b = b, a + b", "    return a"]),
+    ("javascript", ["const posts = await fetch('/feed.json');", "posts.forEach(p => console.log(p.title));"]),
+    ("bash", ["cd blog", "python3 build.py --force"]),
+    ("", ["plain <pre> block with *stars* and [brackets]"]),
+]
+
+
+class CorpusGenerator:
+    """Deterministic synthetic posts: same seed and count always produce the same corpus"""
+
+    def __init__(self, seed=42):
+        self.seed = seed
+
+    def sentence(self, rng):
+        words = []
+        for _ in range(rng.randint(6, 16)):
+            if rng.random() < 0.35:
+                words.append(rng.choice(CJK_PHRASES))
+            else:
+                words.append(rng.choice(LATIN_WORDS))
+        # Sprinkle inline markup so the inline renderer has work to do
+        roll = rng.random()
+        if roll < 0.15:
+            words[0] = f"**{words[0]}**"
+        elif roll < 0.25:
+            words[-1] = f"*{words[-1]}*"
+        elif roll < 0.35:
+            words[1] = f"`{words[1]}`"
+        elif roll < 0.45:
+            words[2] = f"[{words[2]}](https://example.com/{words[2]})"
+        return ' '.join(words).capitalize() + '.'
+
+    def paragraph(self, rng):
+        return ' '.join(self.sentence(rng) for _ in range(rng.randint(2, 5)))
+
+    def body(self, rng):
+        blocks = []
+        for section in range(rng.randint(3, 6)):
+            blocks.append(f"## {self.sentence(rng).rstrip('.')}")
+            for _ in range(rng.randint(1, 3)):
+                kind = rng.random()
+                if kind < 0.5:
+                    blocks.append(self.paragraph(rng))
+                elif kind < 0.65:
+                    blocks.append('\n'.join(f"- {self.sentence(rng)}" for _ in range(rng.randint(2, 6))))
+                elif kind < 0.75:
+                    blocks.append('\n'.join(f"{i}. {self.sentence(rng)}" for i in range(1, rng.randint(3, 6))))
+                elif kind < 0.85:
+                    blocks.append(f"> {self.sentence(rng)}")
+                else:
+                    language, lines = rng.choice(CODE_SNIPPETS)
+                    blocks.append('\n'.join([f"```{language}", *lines, "```"]))
+        return '\n\n'.join(blocks)
+
+    def post(self, index):
+        rng = random.Random(f"{self.seed}-{index}")
+        title = f"{rng.choice(CJK_PHRASES)} {rng.choice(LATIN_WORDS).title()} {index}"
+        date = f"{rng.randint(2019, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        tags = ', '.join(rng.sample(TAG_POOL, rng.randint(1, 4)))
+        summary = self.sentence(rng)
+        return (
+            f"---\n"
+            f"title: \"{title}\"\n"
+            f"date: \"{date}\"\n"
+            f"tags: {tags}\n"
+            f"summary: \"{summary}\"\n"
+            f"filename: post-{index:05d}\n"
+            f"---\n\n"
+            f"{self.body(rng)}\n"
+        )
+
+    def write(self, markdown_dir, count):
+        markdown_dir.mkdir(parents=True, exist_ok=True)
+        total_bytes = 0
+        for index in range(count):
+            data = self.post(index).encode('utf-8')
+            (markdown_dir / f"post-{index:05d}.md").write_bytes(data)
+            total_bytes += len(data)
+        return total_bytes
+
+
+class StageTimer:
+    """
+    Wraps callables so each stage accumulates its own (exclusive) wall time.
+    Nested stages are subtracted from their parent, e.g. feeds are not counted inside index.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+        self._stack = []
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._stack.pop()
+                self.totals[stage] = self.totals.get(stage, 0.0) + elapsed - nested
+                self.counts[stage] = self.counts.get(stage, 0) + 1
+                if self._stack:
+                    self._stack[-1] += elapsed
+        return timed
+
+
+def point_at(converter, work_dir):
+    """Redirect a converter's inputs/outputs into work_dir so the real blog is never touched"""
+    converter.blog_dir = work_dir
+    converter.markdown_dir = work_dir / "markdown"
+    converter.posts_dir = work_dir / "posts"
+    converter.posts_dir.mkdir(exist_ok=True)
+    shutil.copyfile(BLOG_DIR / "index.html", work_dir / "index.html")
+    if hasattr(converter, 'manifest_path'):
+        converter.manifest_path = work_dir / ".cache" / "build-manifest.json"
+    if hasattr(converter, 'pages_dir'):
+        converter.pages_dir = work_dir / "page"
+
+
+def instrument_template(timer):
+    """Time Template.render for the duration of a run; returns a callable that restores it"""
+    original = template_engine.Template.render
+    timed = timer.wrap('template', original)
+    template_engine.Template.render = lambda self, values: timed(self, values)
+    return lambda: setattr(template_engine.Template, 'render', original)
+
+
+def run_simple(work_dir):
+    converter = SimpleBlogConverter()
+    point_at(converter, work_dir)
+    # Stages are compared by name: re-record the baseline (--save-baseline) when adding or renaming one
+    timer = StageTimer()
+    converter.parse_frontmatter = timer.wrap('frontmatter', converter.parse_frontmatter)
+    converter.simple_markdown_to_html = timer.wrap('render', converter.simple_markdown_to_html)
+    converter.write_if_changed = timer.wrap('write', converter.write_if_changed)
+    converter.update_blog_index = timer.wrap('index', converter.update_blog_index)
+    converter.feeds.update = timer.wrap('feeds', converter.feeds.update)
+    converter.search_index.update = timer.wrap('search', converter.search_index.update)
+    converter.listing_pages.update = timer.wrap('listings', converter.listing_pages.update)
+    restore = instrument_template(timer)
+    try:
+        start = time.perf_counter()
+        articles = converter.convert_all_markdown(force=True)
+        converter.update_blog_index(articles)
+        total = time.perf_counter() - start
+
+        # A second build with nothing changed measures the manifest fast path
+        start = time.perf_counter()
+        converter.convert_all_markdown()
+        noop = time.perf_counter() - start
+    finally:
+        restore()
+    return total, timer, len(articles), {'noop_rebuild': noop}
+
+
+def run_markdown(work_dir):
+    from md_to_html import BlogConverter
+
+    converter = BlogConverter()
+    point_at(converter, work_dir)
+    timer = StageTimer()
+    converter.parse_frontmatter = timer.wrap('frontmatter', converter.parse_frontmatter)
+    converter.md.convert = timer.wrap('render', converter.md.convert)
+    converter.write_if_changed = timer.wrap('write', converter.write_if_changed)
+    converter.generate_blog_index = timer.wrap('index', converter.generate_blog_index)
+    restore = instrument_template(timer)
+    try:
+        start = time.perf_counter()
+        articles = converter.convert_all_markdown()
+        converter.generate_blog_index(articles)
+        total = time.perf_counter() - start
+    finally:
+        restore()
+    # BlogConverter has no feed, listing or search steps
+    return total, timer, len(articles), {}
+
+
+CONVERTERS = {
+    'simple': run_simple,
+    'markdown': run_markdown,
+}
+
+
+def benchmark(name, corpus_dir, repeat):
+    """Run one converter over one corpus `repeat` times and keep the fastest run"""
+    best = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as tmp:
+            work_dir = Path(tmp)
+            shutil.copytree(corpus_dir, work_dir / "markdown")
+            with redirect_stdout(io.StringIO()):
+                total, timer, posts, extra = CONVERTERS[name](work_dir)
+        if best is None or total < best[0]:
+            best = (total, timer, posts, extra)
+
+    total, timer, posts, extra = best
+    stages = {stage: round(seconds, 4) for stage, seconds in sorted(timer.totals.items())}
+    stages['other'] = round(max(0.0, total - sum(timer.totals.values())), 4)
+    result = {
+        'posts': posts,
+        'total': round(total, 4),
+        'per_post_ms': round(total / posts * 1000, 4) if posts else None,
+        'stages': stages,
+    }
+    result.update({key: round(value, 4) for key, value in extra.items()})
+    return result
+
+
+def calibrate(rounds=CALIBRATION_ROUNDS, runs=CALIBRATION_RUNS):
+    """
+    Time a fixed pure-Python workload (string building, regex, json, hashing) that does not
+    depend on the converters, so timings from different machines can be put on one scale
+    """
+    text = ' '.join(LATIN_WORDS + CJK_PHRASES) * 4
+    pattern = re.compile(r'(\w+) (\w+)')
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        for i in range(rounds):
+            swapped = pattern.sub(r'\2 \1', text)
+            data = json.loads(json.dumps({'i': i, 'words': swapped.split()}, ensure_ascii=False))
+            hashlib.sha256(' '.join(data['words']).encode('utf-8')).hexdigest()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 4)
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD, scale=1.0):
+    """
+    Per converter/size/stage ratio of current to baseline time; ratio > 1 means slower.
+    Baseline times are multiplied by scale (this machine's calibration time over the baseline's).
+    Only stages present in both runs are compared, and 'total' is their sum, so a stage that was
+    added or renamed since the baseline shows up in `unmatched` instead of as a regression.
+    """
+    comparison = {}
+    regressions = []
+    unmatched = set()
+    for name, sizes in results.items():
+        for size, current in sizes.items():
+            previous = baseline.get(name, {}).get(size)
+            if not previous:
+                continue
+            previous_stages = previous.get('stages', {})
+            # 'other' is whatever the stages don't cover, so it moves whenever the stage set does
+            shared = [stage for stage in current['stages'] if stage in previous_stages and stage != 'other']
+            unmatched.update(f"{name}/{stage}" for stage in set(current['stages']) ^ set(previous_stages))
+            if set(current['stages']) == set(previous_stages):
+                shared.append('other')
+            metrics = {stage: (current['stages'][stage], previous_stages[stage] * scale) for stage in shared}
+            metrics['total'] = (sum(now for now, _ in metrics.values()),
+                                sum(before for _, before in metrics.values()))
+            entry = {}
+            for metric, (now, before) in metrics.items():
+                if before <= 0:
+                    continue
+                ratio = round(now / before, 3)
+                entry[metric] = ratio
+                if ratio > 1 + threshold and now - before > NOISE_FLOOR_SECONDS:
+                    regressions.append(f"{name}/{size}/{metric}: {before:.3f}s → {now:.3f}s (x{ratio})")
+            comparison.setdefault(name, {})[size] = entry
+    return comparison, regressions, sorted(unmatched)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the blog build on synthetic corpora")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help=f"comma-separated corpus sizes (full suite: {','.join(map(str, CORPUS_SIZES))})")
+    parser.add_argument('--converters', default=','.join(CONVERTERS),
+                        help="comma-separated converters to run (default: simple,markdown)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="runs per converter and size; the fastest is reported (default: 3)")
+    parser.add_argument('--seed', type=int, default=42, help="corpus generator seed")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against")
+    parser.add_argument('--output', type=Path, help="write the JSON results to this file")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store these results as the new baseline")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exit with status 1 if any stage regressed past the threshold")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    names = [name.strip() for name in args.converters.split(',') if name.strip()]
+    for name in names:
+        if name not in CONVERTERS:
+            parser.error(f"unknown converter: {name}")
+    if 'markdown' in names:
+        try:
+            import markdown, yaml  # noqa: F401
+        except ImportError as e:
+            print(f"⚠️  Skipping BlogConverter: {e}")
+            names.remove('markdown')
+
+    calibration = calibrate()
+    print(f"⚖️  Calibration workload: {calibration:.3f}s")
+    generator = CorpusGenerator(seed=args.seed)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench-corpus-") as corpus_root:
+        for size in sizes:
+            corpus_dir = Path(corpus_root) / str(size)
+            start = time.perf_counter()
+            corpus_bytes = generator.write(corpus_dir, size)
+            print(f"📝 Generated {size} posts ({corpus_bytes / 1024 / 1024:.1f} MB) "
+                  f"in {time.perf_counter() - start:.2f}s")
+            for name in names:
+                result = benchmark(name, corpus_dir, args.repeat)
+                result['corpus_bytes'] = corpus_bytes
+                results.setdefault(name, {})[str(size)] = result
+                stages = ', '.join(f"{stage} {seconds:.3f}s" for stage, seconds in result['stages'].items())
+                print(f"⏱  {name:<8} {size:>6} posts: {result['total']:.3f}s "
+                      f"({result['per_post_ms']:.3f} ms/post) [{stages}]")
+            shutil.rmtree(corpus_dir)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'calibration': calibration,
+        'results': results,
+    }
+
+    regressions = []
+    if args.baseline.exists():
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        # Baselines without a calibration time are compared as recorded
+        scale = calibration / baseline['calibration'] if baseline.get('calibration') else 1.0
+        report['comparison'], regressions, unmatched = compare(results, baseline.get('results', {}), scale=scale)
+        print(f"\n📊 Compared against {args.baseline} (baseline timings scaled x{scale:.2f} for this machine)")
+        if unmatched:
+            print(f"⚠️  Stages only in one of the runs, not compared: {', '.join(unmatched)} "
+                  f"(re-record the baseline with --save-baseline)")
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) over {REGRESSION_THRESHOLD:.0%}:")
+            for line in regressions:
+                print(f"   • {line}")
+        else:
+            print("✅ No regressions")
+    else:
+        print(f"\n📊 No baseline at {args.baseline} (create one with --save-baseline)")
+    report['regressions'] = regressions
+
+    text = json.dumps(report, ensure_ascii=False, indent=2, sort_keys=True) + '\n'
+    if args.output:
+        args.output.write_text(text, encoding='utf-8')
+        print(f"💾 Results written to {args.output}")
+    if args.save_baseline:
+        baseline_report = {key: report[key] for key in ('python', 'platform', 'seed', 'calibration', 'results')}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(baseline_report, ensure_ascii=False, indent=2, sort_keys=True) + '\n', encoding='utf-8'
+        )
+        print(f"💾 Baseline saved to {args.baseline}")
+    if not args.output and not args.save_baseline:
+        print(text)
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Build instrumentation for Joyce's Blog
+Converters wrap each stage in span(); spans are only recorded after enable() (build.py --trace / --profile),
+otherwise span() hands back a shared no-op context manager.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+
+_NULL_SPAN = nullcontext()
+_tracer = None
+
+
+class Tracer:
+    def __init__(self):
+        self.events = []
+        self.pid = os.getpid()
+
+    @contextmanager
+    def span(self, name, args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            # Chrome trace "complete" event; timestamps in microseconds
+            self.events.append({
+                'name': name,
+                'cat': 'build',
+                'ph': 'X',
+                'ts': round(start * 1e6, 3),
+                'dur': round((end - start) * 1e6, 3),
+                'pid': self.pid,
+                'tid': threading.get_ident(),
+                'args': args,
+            })
+
+
+def span(name, **args):
+    """Time the enclosed block as stage `name` (no-op unless tracing is enabled)"""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, args)
+
+
+def enable():
+    """Start recording with a fresh tracer (forked workers must not inherit the parent's events)"""
+    global _tracer
+    _tracer = Tracer()
+
+
+def is_enabled():
+    return _tracer is not None
+
+
+def drain():
+    """Return and clear the recorded events (used to ship worker-process spans to the parent)"""
+    if _tracer is None:
+        return []
+    events, _tracer.events = _tracer.events, []
+    return events
+
+
+def merge(events):
+    """Add events recorded in another process"""
+    if _tracer is not None and events:
+        _tracer.events.extend(events)
+
+
+def write_chrome_trace(path):
+    """Write the recorded spans as Chrome trace JSON (open in chrome://tracing or ui.perfetto.dev)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': _tracer.events if _tracer else [], 'displayTimeUnit': 'ms'}, f)
+
+
+def summary(slowest=10):
+    """Per-stage totals (inclusive seconds, call count) and the slowest individual posts"""
+    stages = {}
+    posts = []
+    for event in (_tracer.events if _tracer else []):
+        seconds = event['dur'] / 1e6
+        total, count = stages.get(event['name'], (0.0, 0))
+        stages[event['name']] = (total + seconds, count + 1)
+        if event['name'] == 'post':
+            posts.append((seconds, event['args'].get('file', '?')))
+    posts.sort(reverse=True)
+    return stages, posts[:slowest]
+
+
+def print_summary():
+    stages, posts = summary()
+    if not stages:
+        return
+    print("\n⏱  Build stages (inclusive):")
+    for name, (total, count) in sorted(stages.items(), key=lambda item: item[1][0], reverse=True):
+        print(f"   • {name:<12} {total * 1000:10.1f} ms  ({count}×)")
+    if posts:
+        print("🐢 Slowest posts:")
+        for seconds, name in posts:
+            print(f"   • {seconds * 1000:8.1f} ms  {name}")
@@ -5,14 +5,17 @@ Notion数据库重复文章清理脚本
 """
 
 import os
-import requests
 import json
-import re
-from datetime import datetime
 from pathlib import Path
 from difflib import SequenceMatcher
 from collections import defaultdict
 
+from notion_api import BLOG_PROPERTIES, NotionClient, page_properties, status_payload
+from notion_cache import NotionCache, cached_block_tree
+from near_duplicates import candidate_pairs, normalize_text
+from fingerprint_index import FingerprintIndex, comparable_text
+from notion_index import NotionIndex
+
 def load_env_file():
     """Load environment variables from .env file"""
     env_path = Path(__file__).parent.parent.parent / '.env'
@@ -28,7 +31,7 @@ def load_env_file():
 load_env_file()
 
 class NotionDuplicateCleaner:
-    def __init__(self):
+    def __init__(self, use_cache=True):
         self.notion_token = os.getenv('NOTION_TOKEN')
         self.database_id = os.getenv('NOTION_DATABASE_ID')
         
@@ -38,140 +41,45 @@ class NotionDuplicateCleaner:
             print("   export NOTION_DATABASE_ID='your_database_id'")
             return
             
-        self.headers = {
-            'Authorization': f'Bearer {self.notion_token}',
-            'Content-Type': 'application/json',
-            'Notion-Version': '2022-06-28'
-        }
+        self.client = NotionClient(self.notion_token)
+        # 与同步脚本共用 blog/.cache/notion，紧接着同步运行时几乎不需要再请求块内容
+        self.cache = NotionCache() if use_cache else None
     
     def query_all_posts(self):
         """查询所有文章（包括Published和Draft状态）"""
-        url = f'https://api.notion.com/v1/databases/{self.database_id}/query'
-        
-        # 查询所有文章，不筛选状态
-        payload = {
-            "sorts": [
-                {
-                    "property": "Date",
-                    "direction": "descending"
-                }
-            ]
-        }
+        # 查询所有文章，不筛选状态；只取比较用到的属性
+        sorts = [{"property": "Date", "direction": "descending"}]
         
         all_posts = []
-        has_more = True
-        start_cursor = None
-        
-        while has_more:
-            if start_cursor:
-                payload['start_cursor'] = start_cursor
-            
-            try:
-                response = requests.post(url, headers=self.headers, json=payload)
-                if response.status_code == 200:
-                    data = response.json()
-                    all_posts.extend(data['results'])
-                    has_more = data.get('has_more', False)
-                    start_cursor = data.get('next_cursor')
-                else:
-                    print(f"❌ 查询Notion失败: {response.status_code}")
-                    print(f"错误信息: {response.text}")
-                    break
-            except Exception as e:
-                print(f"❌ 连接Notion失败: {e}")
-                break
+        try:
+            for page in self.client.iter_database(self.database_id, properties=BLOG_PROPERTIES, sorts=sorts):
+                all_posts.append(page)
+        except Exception as e:
+            print(f"❌ 查询Notion失败: {e}")
+        else:
+            # 只有完整扫描才刷新本地元数据索引，半截结果会被当成已删除
+            index = NotionIndex()
+            index.replace_all(all_posts)
+            index.close()
         
         print(f"📚 找到 {len(all_posts)} 篇文章（所有状态）")
         return all_posts
     
-    def get_page_content(self, page_id):
-        """获取页面内容"""
-        url = f'https://api.notion.com/v1/blocks/{page_id}/children'
-        
+    def get_page_content(self, page_id, last_edited_time=None):
+        """获取页面内容（含分页与嵌套子块），last_edited_time 未变时读本地缓存；失败时返回 None"""
         try:
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                return response.json()['results']
-            else:
-                return []
+            return [block for _, block in cached_block_tree(self.client, self.cache, page_id, last_edited_time)]
         except Exception as e:
             print(f"❌ 获取页面内容错误: {e}")
-            return []
-    
-    def extract_rich_text(self, rich_text_array):
-        """提取富文本内容"""
-        if not rich_text_array:
-            return ""
-            
-        result = []
-        for text_obj in rich_text_array:
-            text = text_obj.get('text', {}).get('content', '')
-            result.append(text)
-        
-        return ''.join(result)
+            return None
     
     def convert_notion_to_text(self, blocks):
-        """将Notion块转换为纯文本（用于比较）"""
-        text_content = []
-        
-        for block in blocks:
-            block_type = block.get('type')
-            block_data = block.get(block_type, {})
-            
-            if block_type == 'paragraph':
-                text = self.extract_rich_text(block_data.get('rich_text', []))
-                if text.strip():
-                    text_content.append(text)
-            
-            elif block_type in ['heading_1', 'heading_2', 'heading_3']:
-                text = self.extract_rich_text(block_data.get('rich_text', []))
-                if text.strip():
-                    text_content.append(text)
-            
-            elif block_type in ['bulleted_list_item', 'numbered_list_item']:
-                text = self.extract_rich_text(block_data.get('rich_text', []))
-                if text.strip():
-                    text_content.append(text)
-            
-            elif block_type == 'quote':
-                text = self.extract_rich_text(block_data.get('rich_text', []))
-                if text.strip():
-                    text_content.append(text)
-        
-        # 合并所有文本，移除多余空格
-        full_text = ' '.join(text_content)
-        # 移除所有标点符号和空格，只保留字母数字，用于比较
-        clean_text = re.sub(r'[^\w]', '', full_text.lower())
-        return clean_text
+        """将Notion块转换为纯文本（用于比较）：段落、标题、列表与引用，去掉标点和空格、统一小写"""
+        return comparable_text(blocks)
     
     def extract_page_properties(self, page):
-        """提取页面属性"""
-        properties = page.get('properties', {})
-        
-        # 标题
-        title = "Untitled"
-        title_prop = properties.get('Title') or properties.get('Name')
-        if title_prop and title_prop.get('title'):
-            title = title_prop['title'][0]['text']['content']
-        
-        # 状态
-        status = "Draft"
-        status_prop = properties.get('Status')
-        if status_prop and status_prop.get('select'):
-            status = status_prop['select']['name']
-        
-        # 日期
-        date = datetime.now().strftime('%Y-%m-%d')
-        date_prop = properties.get('Date')
-        if date_prop and date_prop.get('date') and date_prop['date'].get('start'):
-            date = date_prop['date']['start']
-        
-        return {
-            'title': title,
-            'status': status,
-            'date': date,
-            'page_id': page['id']
-        }
+        """提取页面属性（见 notion_api.page_properties）"""
+        return page_properties(page)
     
     def calculate_similarity(self, text1, text2):
         """计算两个文本的相似度"""
@@ -191,33 +99,98 @@ class NotionDuplicateCleaner:
             print("📝 文章数量不足，无法查找重复")
             return []
         
-        # 提取所有文章的信息
-        posts_info = []
+        # 指纹索引中 last_edited_time 已过期（或不存在）的页面才重新获取内容
+        index = FingerprintIndex()
+        stored = index.stored_versions()
+        pages = []
+        updated = 0
         for post in all_posts:
             try:
                 properties = self.extract_page_properties(post)
                 if properties['title'] == "Untitled":
                     continue
+                pages.append((post, properties))
                 
-                # 获取内容
-                blocks = self.get_page_content(post['id'])
-                content_text = self.convert_notion_to_text(blocks)
-                
-                posts_info.append({
-                    'page_id': post['id'],
-                    'title': properties['title'],
-                    'status': properties['status'],
-                    'date': properties['date'],
-                    'content': content_text,
-                    'raw_post': post
-                })
-                
+                last_edited_time = post.get('last_edited_time')
+                if last_edited_time and stored.get(post['id']) == last_edited_time:
+                    continue
+                blocks = self.get_page_content(post['id'], last_edited_time)
+                if blocks is None or not last_edited_time:
+                    continue
+                index.update(post['id'], last_edited_time, properties['title'], self.convert_notion_to_text(blocks))
+                updated += 1
                 print(f"  📄 {properties['title']} ({properties['status']})")
             except Exception as e:
                 print(f"  ⚠️  处理文章时出错: {e}")
                 continue
         
-        # 查找重复
+        pruned = index.prune(post['id'] for post, _ in pages)
+        print(f"🗂  指纹索引: 更新 {updated} 篇，沿用 {len(pages) - updated} 篇" + (f"，移除 {pruned} 篇" if pruned else ""))
+        pairs = index.candidate_pairs()
+        index.close()
+        
+        # 只有出现在候选对中的文章需要原文做精确比较（通常命中块缓存）
+        candidates = {page_id for pair in pairs for page_id in pair}
+        posts_info = []
+        for post, properties in pages:
+            if post['id'] not in candidates:
+                continue
+            blocks = self.get_page_content(post['id'], post.get('last_edited_time'))
+            if blocks is None:
+                continue
+            posts_info.append({
+                'page_id': post['id'],
+                'title': properties['title'],
+                'status': properties['status'],
+                'date': properties['date'],
+                'content': self.convert_notion_to_text(blocks),
+                'raw_post': post
+            })
+        
+        if self.cache is not None and (self.cache.hits or self.cache.misses):
+            print(f"🗄  缓存命中 {self.cache.hits} 篇，从 Notion 抓取 {self.cache.misses} 篇")
+        
+        positions = {post['page_id']: i for i, post in enumerate(posts_info)}
+        index_pairs = {tuple(sorted((positions[a], positions[b]))) for a, b in pairs if a in positions and b in positions}
+        return self.group_duplicates(posts_info, index_pairs, total=len(pages))
+    
+    def is_duplicate(self, post1, post2):
+        """确认阶段：对候选对精确计算相似度，返回 (是否重复, 内容相似度, 标题相似度)"""
+        similarity = self.calculate_similarity(post1['content'], post2['content'])
+        
+        # 如果内容相似度超过70%，或者内容长度相似且相似度超过60%，认为是重复
+        # 同时检查标题是否相似（处理改标题的情况）
+        title_similarity = self.calculate_similarity(normalize_text(post1['title']), normalize_text(post2['title']))
+        
+        is_duplicate = False
+        if similarity > 0.7:
+            is_duplicate = True
+        elif similarity > 0.6 and abs(len(post1['content']) - len(post2['content'])) < max(len(post1['content']), len(post2['content'])) * 0.2:
+            # 内容长度相似且相似度超过60%
+            is_duplicate = True
+        elif title_similarity > 0.5 and similarity > 0.5:
+            # 标题相似且内容有一定相似度
+            is_duplicate = True
+        return is_duplicate, similarity, title_similarity
+    
+    def group_duplicates(self, posts_info, pairs=None, total=None):
+        """
+        MinHash/LSH 先找出候选对（内容或标题共享桶），只对候选对做精确比较；
+        pairs 为 posts_info 下标对，未给出时现场计算签名。
+        分组方式与逐对比较时相同：按文章顺序，每篇只归入第一个匹配它的组
+        """
+        if pairs is None:
+            pairs = candidate_pairs(
+                {i: post['content'] for i, post in enumerate(posts_info)},
+                {i: normalize_text(post['title']) for i, post in enumerate(posts_info)}
+            )
+        neighbors = defaultdict(list)
+        for i, j in pairs:
+            neighbors[i].append(j)
+        total = len(posts_info) if total is None else total
+        total_pairs = total * (total - 1) // 2
+        print(f"🔗 候选文章对 {len(pairs)} 对（逐对比较需要 {total_pairs} 对）")
+        
         duplicates = []
         checked = set()
         
@@ -227,30 +200,12 @@ class NotionDuplicateCleaner:
             
             similar_posts = [post1]
             
-            for j, post2 in enumerate(posts_info[i+1:], start=i+1):
+            for j in sorted(neighbors[i]):
+                post2 = posts_info[j]
                 if post2['page_id'] in checked:
                     continue
                 
-                # 计算相似度
-                similarity = self.calculate_similarity(post1['content'], post2['content'])
-                
-                # 如果内容相似度超过70%，或者内容长度相似且相似度超过60%，认为是重复
-                # 同时检查标题是否相似（处理改标题的情况）
-                title_similarity = self.calculate_similarity(
-                    re.sub(r'[^\w]', '', post1['title'].lower()),
-                    re.sub(r'[^\w]', '', post2['title'].lower())
-                )
-                
-                is_duplicate = False
-                if similarity > 0.7:
-                    is_duplicate = True
-                elif similarity > 0.6 and abs(len(post1['content']) - len(post2['content'])) < max(len(post1['content']), len(post2['content'])) * 0.2:
-                    # 内容长度相似且相似度超过60%
-                    is_duplicate = True
-                elif title_similarity > 0.5 and similarity > 0.5:
-                    # 标题相似且内容有一定相似度
-                    is_duplicate = True
-                
+                is_duplicate, similarity, title_similarity = self.is_duplicate(post1, post2)
                 if is_duplicate:
                     print(f"    🔍 发现相似: '{post1['title']}' vs '{post2['title']}' (相似度: {similarity:.2%}, 标题相似度: {title_similarity:.2%})")
                     similar_posts.append(post2)
@@ -264,20 +219,10 @@ class NotionDuplicateCleaner:
     
     def update_page_status(self, page_id, new_status="Draft"):
         """更新页面状态"""
-        url = f'https://api.notion.com/v1/pages/{page_id}'
-        
-        payload = {
-            "properties": {
-                "Status": {
-                    "select": {
-                        "name": new_status
-                    }
-                }
-            }
-        }
+        url = f'pages/{page_id}'
         
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
+            response = self.client.patch(url, json=status_payload(new_status))
             if response.status_code == 200:
                 return True
             else:
@@ -298,6 +243,7 @@ class NotionDuplicateCleaner:
         print(f"\n🔍 找到 {len(duplicates)} 组重复文章:")
         print("=" * 60)
         
+        to_draft = []
         for idx, group in enumerate(duplicates, 1):
             print(f"\n📦 重复组 {idx} ({len(group)} 篇文章):")
             
@@ -315,16 +261,23 @@ class NotionDuplicateCleaner:
             for dup in duplicate_posts:
                 print(f"  🗑️  标记为Draft: {dup['title']} ({dup['status']}, {dup['date']})")
             
-            if auto_clean:
-                print("\n  🔄 正在更新状态...")
-                for dup in duplicate_posts:
-                    if self.update_page_status(dup['page_id'], "Draft"):
-                        print(f"  ✅ 已将 '{dup['title']}' 标记为Draft")
-                    else:
-                        print(f"  ❌ 更新 '{dup['title']}' 失败")
-            else:
+            to_draft += [dup for dup in duplicate_posts if dup['status'] != 'Draft']
+            if not auto_clean:
                 print("\n  💡 提示: 运行脚本时添加 --auto 参数将自动更新状态")
         
+        if auto_clean and to_draft:
+            # 所有组的更新一起并发发出（共享限速器），而不是逐篇等待
+            print(f"\n🔄 正在更新 {len(to_draft)} 篇文章的状态...")
+            results = self.client.patch_pages([(dup['page_id'], status_payload("Draft")) for dup in to_draft])
+            index = NotionIndex()
+            for dup, (_, ok, error) in zip(to_draft, results):
+                if ok:
+                    index.set_status(dup['page_id'], "Draft")
+                    print(f"  ✅ 已将 '{dup['title']}' 标记为Draft")
+                else:
+                    print(f"  ❌ 更新 '{dup['title']}' 失败: {error}")
+            index.close()
+        
         print("\n" + "=" * 60)
         print(f"📊 总结: 找到 {len(duplicates)} 组重复，共 {sum(len(g) - 1 for g in duplicates)} 篇需要处理")
 
@@ -334,7 +287,7 @@ def main():
     print("🧹 Notion数据库重复文章清理工具")
     print("=" * 60)
     
-    cleaner = NotionDuplicateCleaner()
+    cleaner = NotionDuplicateCleaner(use_cache='--no-cache' not in sys.argv)
     
     if not cleaner.notion_token or not cleaner.database_id:
         print("\n💡 请先设置环境变量后重新运行")
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Watch mode for Joyce's Blog (build.py --watch)
+Polls blog/markdown, the templates and the stylesheets, re-renders only what changed,
+and serves the site with a tiny live-reload endpoint so open pages refresh themselves.
+"""
+
+import os
+import time
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BLOG_DIR = Path(__file__).parent.parent
+SITE_ROOT = BLOG_DIR.parent
+RELOAD_PATH = '/__livereload'
+POLL_INTERVAL = 0.2
+
+# Injected into HTML responses only; generated files on disk never contain it
+RELOAD_SNIPPET = (
+    f"<script>new EventSource('{RELOAD_PATH}').onmessage = () => location.reload();</script>"
+).encode('utf-8')
+
+
+class ReloadBroadcaster:
+    """Generation counter that SSE connections wait on; bump() reloads every open page"""
+
+    def __init__(self):
+        self.generation = 0
+        self.condition = threading.Condition()
+
+    def bump(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, seen, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != seen, timeout=timeout)
+            return self.generation
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    broadcaster = None
+
+    def log_message(self, format, *args):
+        # Keep the console for build output
+        pass
+
+    def end_headers(self):
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            return self.serve_events()
+        path = Path(self.translate_path(self.path))
+        if path.is_dir():
+            if not self.path.split('?', 1)[0].endswith('/'):
+                # Let the base handler issue its trailing-slash redirect so relative links resolve
+                return super().do_GET()
+            path = path / 'index.html'
+        if path.suffix == '.html' and path.is_file():
+            return self.serve_html(path)
+        return super().do_GET()
+
+    def serve_html(self, path):
+        body = path.read_bytes()
+        marker = body.rfind(b'</body>')
+        body = body[:marker] + RELOAD_SNIPPET + body[marker:] if marker != -1 else body + RELOAD_SNIPPET
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def serve_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        seen = self.broadcaster.generation
+        try:
+            while True:
+                current = self.broadcaster.wait(seen, timeout=15)
+                if current != seen:
+                    self.wfile.write(b'data: reload\n\n')
+                    seen = current
+                else:
+                    # Heartbeat so dead connections are noticed and the thread can exit
+                    self.wfile.write(b': ping\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start_server(port, broadcaster):
+    """Serve the site root (like `python3 -m http.server`) in a background thread"""
+    handler = partial(type('Handler', (LiveReloadHandler,), {'broadcaster': broadcaster}),
+                      directory=str(SITE_ROOT))
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def snapshot(paths, directories):
+    """
+    Map every watched file path (as str) to its (mtime_ns, size).
+    Plain strings keep a poll over tens of thousands of posts cheap; Path objects are only built for changes.
+    """
+    state = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        state[str(path)] = (stat.st_mtime_ns, stat.st_size)
+    for directory, suffix in directories:
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith(suffix):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Deleted between listing and stat; the next poll reports it as removed
+                    continue
+                state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def diff(before, after):
+    changed = {Path(path) for path, stamp in after.items() if before.get(path) != stamp}
+    removed = {Path(path) for path in before.keys() - after.keys()}
+    return changed, removed
+
+
+def watch(converter, jobs=1, port=8000):
+    """Rebuild incrementally on every change until interrupted"""
+    broadcaster = ReloadBroadcaster()
+    start_server(port, broadcaster)
+    print(f"\n👀 Watching {converter.markdown_dir}, templates and stylesheets")
+    print(f"🌐 Live reload: http://localhost:{port}/blog/ (Ctrl+C to stop)")
+
+    templates = [converter.template_path]
+    # Tag and archive pages only need the listing step, not a re-render of the posts
+    listing_template = converter.listing_pages.template_path
+    assets = [
+        listing_template,
+        BLOG_DIR / "blog-styles.css",
+        BLOG_DIR / "blog-script.js",
+        BLOG_DIR / "templates" / "article-styles.css",
+    ]
+    directories = [(converter.markdown_dir, '.md')]
+    state = snapshot(templates + assets, directories)
+
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = snapshot(templates + assets, directories)
+            changed, removed = diff(state, current)
+            state = current
+            if not changed and not removed:
+                continue
+
+            started = time.perf_counter()
+            if any(path in changed for path in templates):
+                # The converter version covers the template, so every post is stale
+                print("\n🔄 Template changed, rebuilding all posts...")
+                articles = converter.convert_all_markdown(jobs=jobs)
+            else:
+                markdown_changed = {path for path in changed if path.suffix == '.md'}
+                markdown_removed = {path for path in removed if path.suffix == '.md'}
+                if markdown_changed or markdown_removed:
+                    print(f"\n🔄 {', '.join(sorted(path.name for path in markdown_changed | markdown_removed))}")
+                    articles = converter.update_changed_markdown(markdown_changed, markdown_removed)
+                elif listing_template in changed:
+                    print("\n🔄 Listing template changed, rebuilding tag and archive pages...")
+                    articles = converter.update_changed_markdown(set())
+                else:
+                    articles = None
+
+            if articles:
+                converter.update_blog_index(articles, search=False)
+            broadcaster.bump()
+            print(f"⚡ Reloaded in {(time.perf_counter() - started) * 1000:.0f} ms")
+            # Pages are already visible; the search index can catch up after the reload
+            if articles:
+                converter.update_search_index(articles)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
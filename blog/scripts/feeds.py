@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Feeds for Joyce's Blog
+RSS 2.0 (feed.xml), Atom (atom.xml) and JSON Feed (feed.json) are written from the same article list.
+Every item is rendered once per format and cached by its post's hash, so a long full-content
+feed only re-renders the posts that changed.
+"""
+
+import os
+import re
+import json
+import sqlite3
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from html import escape as html_escape
+from urllib.parse import urljoin
+
+SITE_URL = 'https://joycegu.github.io/CuriousBuild/blog/'
+FEED_TITLE = "Joyce's Digital Garden"
+FEED_DESCRIPTION = 'Thoughts, discoveries, and adventures in technology, growth, and life insights.'
+AUTHOR_NAME = 'Joyce Gu'
+AUTHOR_EMAIL = 'joyce@example.com'
+
+# Newest posts per feed, and whether items carry the full post HTML instead of only the summary
+FEED_ITEMS = int(os.getenv('BLOG_FEED_ITEMS', '10'))
+FEED_FULL_CONTENT = os.getenv('BLOG_FEED_FULL_CONTENT', '').lower() in ('1', 'true', 'yes')
+
+CACHE_VERSION = 2
+# SQLite's default limit on parameters per statement is 999
+LOOKUP_BATCH = 500
+
+# Relative links and images in post HTML must be absolute once the HTML leaves the site;
+# srcset (responsive <picture> markup) holds a comma-separated list of "URL [descriptor]" entries
+URL_ATTRIBUTE_PATTERN = re.compile(r'\b(href|src|srcset)="([^"]*)"')
+
+RSS_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"{content_namespace}>
+    <channel>
+        <title>{title}</title>
+        <link>{site}</link>
+        <description>{description}</description>
+        <language>en-us</language>
+        <lastBuildDate>{last_build_date}</lastBuildDate>
+        <atom:link href="{site}feed.xml" rel="self" type="application/rss+xml"/>
+        <generator>Joyce's Blog Generator</generator>
+        <webMaster>{email} ({author})</webMaster>
+        <managingEditor>{email} ({author})</managingEditor>
+        <ttl>1440</ttl>
+{items}
+    </channel>
+</rss>'''
+
+ATOM_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="en">
+    <title>{title}</title>
+    <subtitle>{description}</subtitle>
+    <link href="{site}atom.xml" rel="self" type="application/atom+xml"/>
+    <link href="{site}" rel="alternate" type="text/html"/>
+    <id>{site}</id>
+    <updated>{updated}</updated>
+    <author>
+        <name>{author}</name>
+    </author>
+    <generator>Joyce's Blog Generator</generator>
+{entries}
+</feed>
+'''
+
+
+def rfc822_date(date_iso):
+    """RFC 822 date for a YYYY-MM-DD (midnight UTC), independent of the build machine's timezone"""
+    return format_datetime(datetime.strptime(date_iso, '%Y-%m-%d').replace(tzinfo=timezone.utc))
+
+
+def rfc3339_date(date_iso):
+    return f"{date_iso}T00:00:00Z"
+
+
+def cdata(text):
+    """Wrap text in CDATA; a literal ']]>' is split across two sections"""
+    return '<![CDATA[' + text.replace(']]>', ']]]]><![CDATA[>') + ']]>'
+
+
+def absolute_srcset(srcset, base):
+    entries = []
+    for entry in srcset.split(','):
+        url, _, descriptor = entry.strip().partition(' ')
+        if url:
+            entries.append(f"{urljoin(base, url)} {descriptor.strip()}".rstrip())
+    return ', '.join(entries)
+
+
+def absolute_urls(html, base):
+    def replace(match):
+        if match[1] == 'srcset':
+            return f'srcset="{absolute_srcset(match[2], base)}"'
+        return f'{match[1]}="{urljoin(base, match[2])}"'
+    return URL_ATTRIBUTE_PATTERN.sub(replace, html)
+
+
+class FeedBuilder:
+    """
+    Writes the three feeds for the newest item_count posts. Rendered items are kept in
+    blog/.cache/feed-items.sqlite3 under a key derived from the post's source and output hashes, its listing
+    fields, the converter version and the content mode.
+    """
+
+    def __init__(self, converter, item_count=FEED_ITEMS, full_content=FEED_FULL_CONTENT):
+        self.converter = converter
+        self.item_count = item_count
+        self.full_content = full_content
+        self.rendered_count = 0
+        # item key → {'rss', 'atom', 'json'} fragments of the last feed, kept in memory for watch-mode rebuilds
+        self.items = {}
+        self._conn = None
+
+    @property
+    def cache_path(self):
+        return self.converter.blog_dir / ".cache" / "feed-items.sqlite3"
+
+    def connect(self):
+        if self._conn is None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_path)
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] != CACHE_VERSION:
+                self._conn.executescript(f'''
+                    DROP TABLE IF EXISTS items;
+                    CREATE TABLE items (
+                        key TEXT PRIMARY KEY,
+                        rss TEXT NOT NULL,
+                        atom TEXT NOT NULL,
+                        json TEXT NOT NULL
+                    );
+                    PRAGMA user_version = {CACHE_VERSION};
+                ''')
+        return self._conn
+
+    def cached_items(self, keys):
+        """Look up rendered items by key: the last feed's items from memory, the rest from SQLite"""
+        found = {key: self.items[key] for key in keys if key in self.items}
+        missing = [key for key in keys if key not in found]
+        conn = self.connect()
+        for start in range(0, len(missing), LOOKUP_BATCH):
+            batch = missing[start:start + LOOKUP_BATCH]
+            rows = conn.execute(f"SELECT key, rss, atom, json FROM items WHERE key IN ({','.join('?' * len(batch))})", batch)
+            for key, rss, atom, json_item in rows:
+                found[key] = {'rss': rss, 'atom': atom, 'json': json_item}
+        return found
+
+    def update(self, articles):
+        """Write feed.xml, atom.xml and feed.json for the newest posts; returns the number of items"""
+        self.rendered_count = 0
+        recent = sorted(articles, key=lambda x: x['date_iso'], reverse=True)[:self.item_count]
+        if not recent:
+            return 0
+
+        # output filename → (markdown file, source hash, output hash), from the build manifest.
+        # The output hash covers what the source doesn't, e.g. image markup that depends on asset files
+        sources = {entry['article']['filename']: (md_name, entry['source_hash'], entry['output_hash'])
+                   for md_name, entry in self.converter.manifest.items()}
+        version = self.converter.converter_version()
+        keys = []
+        for article in recent:
+            _, source_hash, output_hash = sources.get(article['filename'], (None, None, None))
+            keys.append(hashlib.sha256(json.dumps(
+                [version, self.full_content, source_hash, output_hash, article], ensure_ascii=False, sort_keys=True
+            ).encode('utf-8')).hexdigest()[:16])
+
+        items = self.cached_items(keys)
+        rendered = []
+        for key, article in zip(keys, recent):
+            if key not in items:
+                md_name, _, _ = sources.get(article['filename'], (None, None, None))
+                content_html = self.post_html(md_name, article) if self.full_content else None
+                item = items[key] = self.render_item(article, content_html)
+                rendered.append((key, item['rss'], item['atom'], item['json']))
+        self.rendered_count = len(rendered)
+
+        ordered = [items[key] for key in keys]
+        self.write_rss(recent, ordered)
+        self.write_atom(recent, ordered)
+        self.write_json(ordered)
+
+        # Items that dropped out of the feed are not kept
+        if rendered or items.keys() != self.items.keys():
+            conn = self.connect()
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)', rendered)
+                stale = [(key,) for (key,) in conn.execute('SELECT key FROM items') if key not in items]
+                conn.executemany('DELETE FROM items WHERE key = ?', stale)
+        self.items = items
+        return len(recent)
+
+    def post_html(self, md_name, article):
+        """A post's rendered body with absolute URLs, or None if its markdown source is unknown"""
+        if md_name is None:
+            return None
+        with open(self.converter.markdown_dir / md_name, 'r', encoding='utf-8') as f:
+            _, markdown_content = self.converter.parse_frontmatter(f.read())
+        html = self.converter.simple_markdown_to_html(markdown_content)
+        return absolute_urls(html, f"{SITE_URL}posts/{article['filename']}")
+
+    def render_item(self, article, content_html):
+        url = f"{SITE_URL}posts/{article['filename']}"
+        # Clean summary for RSS (remove HTML if any)
+        clean_summary = article['summary'].replace('<', '&lt;').replace('>', '&gt;')
+
+        rss = [
+            '        <item>',
+            f"            <title>{cdata(article['title'])}</title>",
+            f'            <link>{url}</link>',
+            f'            <guid>{url}</guid>',
+            f'            <description>{cdata(clean_summary)}</description>',
+        ]
+        if content_html is not None:
+            rss.append(f'            <content:encoded>{cdata(content_html)}</content:encoded>')
+        rss += [
+            f"            <pubDate>{rfc822_date(article['date_iso'])}</pubDate>",
+            f'            <author>{AUTHOR_EMAIL} ({AUTHOR_NAME})</author>',
+            '        </item>',
+        ]
+
+        date = rfc3339_date(article['date_iso'])
+        atom = [
+            '    <entry>',
+            f"        <title>{html_escape(article['title'])}</title>",
+            f'        <link href="{html_escape(url)}" rel="alternate" type="text/html"/>',
+            f'        <id>{html_escape(url)}</id>',
+            f'        <published>{date}</published>',
+            f'        <updated>{date}</updated>',
+            *(f'        <category term="{html_escape(tag)}"/>' for tag in article['tags']),
+            f"        <summary>{html_escape(article['summary'])}</summary>",
+        ]
+        if content_html is not None:
+            atom.append(f'        <content type="html">{html_escape(content_html)}</content>')
+        atom.append('    </entry>')
+
+        entry = {
+            'id': url,
+            'url': url,
+            'title': article['title'],
+            'summary': article['summary'],
+            'date_published': date,
+            'tags': article['tags'],
+        }
+        # JSON Feed items need content_html or content_text
+        if content_html is not None:
+            entry['content_html'] = content_html
+        else:
+            entry['content_text'] = article['summary']
+
+        return {
+            'rss': '\n'.join(rss),
+            'atom': '\n'.join(atom),
+            'json': json.dumps(entry, ensure_ascii=False, separators=(',', ':')),
+        }
+
+    def write_rss(self, recent, items):
+        # The feed last changed when its newest post did
+        rss_content = RSS_TEMPLATE.format(
+            content_namespace=' xmlns:content="http://purl.org/rss/1.0/modules/content/"' if self.full_content else '',
+            title=FEED_TITLE,
+            site=SITE_URL,
+            description=FEED_DESCRIPTION,
+            last_build_date=rfc822_date(recent[0]['date_iso']),
+            email=AUTHOR_EMAIL,
+            author=AUTHOR_NAME,
+            items='\n'.join(item['rss'] for item in items),
+        )
+        self.converter.write_if_changed(self.converter.blog_dir / "feed.xml", rss_content)
+
+    def write_atom(self, recent, items):
+        atom_content = ATOM_TEMPLATE.format(
+            title=html_escape(FEED_TITLE),
+            description=html_escape(FEED_DESCRIPTION),
+            site=SITE_URL,
+            updated=rfc3339_date(recent[0]['date_iso']),
+            author=AUTHOR_NAME,
+            entries='\n'.join(item['atom'] for item in items),
+        )
+        self.converter.write_if_changed(self.converter.blog_dir / "atom.xml", atom_content)
+
+    def write_json(self, items):
+        header = json.dumps({
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': FEED_TITLE,
+            'home_page_url': SITE_URL,
+            'feed_url': f"{SITE_URL}feed.json",
+            'description': FEED_DESCRIPTION,
+            'language': 'en',
+            'authors': [{'name': AUTHOR_NAME}],
+        }, ensure_ascii=False, separators=(',', ':'))
+        # Items are cached already serialized; splice them in instead of re-encoding the whole feed
+        json_content = header[:-1] + ',"items":[' + ','.join(item['json'] for item in items) + ']}\n'
+        self.converter.write_if_changed(self.converter.blog_dir / "feed.json", json_content)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Notion 页面指纹索引（blog/.cache/notion/fingerprints.sqlite3）
+每个页面保存内容哈希、MinHash 签名、归一化标题与 LSH 桶号，以 last_edited_time 判断是否过期；
+清理脚本只需重新计算改动过的页面，同步脚本可以用几次索引查询判断新文章是否与已有页面重复
+"""
+
+import hashlib
+import sqlite3
+import struct
+from difflib import SequenceMatcher
+
+from near_duplicates import NUM_PERM, TITLE_SHINGLE_SIZE, band_keys, estimate_jaccard, minhash, normalize_text
+from notion_cache import DEFAULT_CACHE_DIR
+
+INDEX_VERSION = 1
+SIGNATURE_FORMAT = struct.Struct(f'>{NUM_PERM}Q')
+
+# 同步时只有签名可比较：估计的 Jaccard 达到这些值即提示可能重复（比确认阶段的规则宽松，宁可多提示）
+WARN_JACCARD = 0.5
+WARN_TITLE_JACCARD = 0.3
+WARN_TITLE_SIMILARITY = 0.5
+
+TEXT_BLOCK_TYPES = ('paragraph', 'heading_1', 'heading_2', 'heading_3',
+                    'bulleted_list_item', 'numbered_list_item', 'quote')
+
+SCHEMA = f'''
+DROP TABLE IF EXISTS pages;
+DROP TABLE IF EXISTS bands;
+CREATE TABLE pages (
+    page_id TEXT PRIMARY KEY,
+    last_edited_time TEXT NOT NULL,
+    title TEXT NOT NULL,
+    normalized_title TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    signature BLOB
+);
+CREATE INDEX pages_content_hash ON pages (content_hash);
+CREATE TABLE bands (
+    kind TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    page_id TEXT NOT NULL
+);
+CREATE INDEX bands_bucket ON bands (kind, band, bucket);
+CREATE INDEX bands_page ON bands (page_id);
+PRAGMA user_version = {INDEX_VERSION};
+'''
+
+
+def block_text(block):
+    """参与比较的块的纯文本（不带 Markdown 格式）；其他块返回空字符串"""
+    block_type = block.get('type')
+    if block_type not in TEXT_BLOCK_TYPES:
+        return ''
+    rich_text = block.get(block_type, {}).get('rich_text', [])
+    return ''.join(text_obj.get('text', {}).get('content', '') for text_obj in rich_text)
+
+
+def comparable_text(blocks):
+    """把块序列合并为比较用的归一化文本（去掉标点与空白、小写）"""
+    return normalize_text(' '.join(text for text in map(block_text, blocks) if text.strip()))
+
+
+def fingerprint(title, text):
+    """(归一化标题, 内容哈希, 内容签名, [(kind, band, 桶号)])；空内容没有哈希和签名"""
+    normalized_title = normalize_text(title)
+    signature = minhash(text)
+    keys = []
+    for kind, sig in (('content', signature), ('title', minhash(normalized_title, TITLE_SHINGLE_SIZE))):
+        if sig is not None:
+            keys += [(kind, band, bucket) for band, bucket in enumerate(band_keys(sig))]
+    content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest() if text else ''
+    return normalized_title, content_hash, signature, keys
+
+
+class FingerprintIndex:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / "fingerprints.sqlite3"
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != INDEX_VERSION:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def stored_versions(self):
+        """{page_id: last_edited_time}，一次读出，用来挑出需要重新计算的页面"""
+        return dict(self.conn.execute('SELECT page_id, last_edited_time FROM pages'))
+
+    def update(self, page_id, last_edited_time, title, text):
+        """写入（或替换）一个页面的指纹；text 为 comparable_text 的结果"""
+        normalized_title, content_hash, signature, keys = fingerprint(title, text)
+        with self.conn:
+            self.conn.execute('DELETE FROM bands WHERE page_id = ?', (page_id,))
+            self.conn.execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)', (
+                page_id, last_edited_time, title, normalized_title, content_hash,
+                SIGNATURE_FORMAT.pack(*signature) if signature is not None else None,
+            ))
+            self.conn.executemany('INSERT INTO bands VALUES (?, ?, ?, ?)', [(*key, page_id) for key in keys])
+
+    def prune(self, page_ids):
+        """删除数据库中已不存在的页面"""
+        page_ids = set(page_ids)
+        stale = [(page_id,) for (page_id,) in self.conn.execute('SELECT page_id FROM pages') if page_id not in page_ids]
+        with self.conn:
+            self.conn.executemany('DELETE FROM bands WHERE page_id = ?', stale)
+            self.conn.executemany('DELETE FROM pages WHERE page_id = ?', stale)
+        return len(stale)
+
+    def candidate_pairs(self):
+        """共享任一 LSH 桶或内容哈希完全相同的页面对 (page_id1, page_id2)，page_id1 < page_id2"""
+        pairs = set(self.conn.execute('''
+            SELECT DISTINCT a.page_id, b.page_id FROM bands a
+            JOIN bands b ON a.kind = b.kind AND a.band = b.band AND a.bucket = b.bucket AND a.page_id < b.page_id
+        '''))
+        pairs.update(self.conn.execute('''
+            SELECT a.page_id, b.page_id FROM pages a
+            JOIN pages b ON a.content_hash = b.content_hash AND a.page_id < b.page_id
+            WHERE a.content_hash != ''
+        '''))
+        return pairs
+
+    def find_similar(self, page_id, title, text):
+        """
+        新页面与索引中其他页面比较：只查 2 × LSH_BANDS 个桶（开销与索引大小无关），再用存储的签名估计相似度。
+        返回 [(page_id, 标题, 估计的内容 Jaccard, 标题相似度)]，按内容相似度从高到低
+        """
+        normalized_title, content_hash, signature, keys = fingerprint(title, text)
+
+        candidates = set()
+        for kind, band, bucket in keys:
+            candidates.update(page for (page,) in self.conn.execute(
+                'SELECT page_id FROM bands WHERE kind = ? AND band = ? AND bucket = ?', (kind, band, bucket)))
+        if content_hash:
+            candidates.update(page for (page,) in self.conn.execute(
+                'SELECT page_id FROM pages WHERE content_hash = ?', (content_hash,)))
+        candidates.discard(page_id)
+
+        matches = []
+        for candidate in candidates:
+            row = self.conn.execute(
+                'SELECT title, normalized_title, content_hash, signature FROM pages WHERE page_id = ?',
+                (candidate,)).fetchone()
+            if row is None:
+                continue
+            display_title, other_title, other_hash, other_signature = row
+            if content_hash and other_hash == content_hash:
+                jaccard = 1.0
+            elif signature is not None and other_signature is not None:
+                jaccard = estimate_jaccard(signature, SIGNATURE_FORMAT.unpack(other_signature))
+            else:
+                jaccard = 0.0
+            title_similarity = SequenceMatcher(None, normalized_title, other_title).ratio() if normalized_title and other_title else 0.0
+            if jaccard >= WARN_JACCARD or (title_similarity > WARN_TITLE_SIMILARITY and jaccard >= WARN_TITLE_JACCARD):
+                matches.append((candidate, display_title, jaccard, title_similarity))
+        return sorted(matches, key=lambda match: match[2], reverse=True)
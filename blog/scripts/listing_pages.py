@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tag and archive pages for Joyce's Blog
+One pass over the article metadata groups posts by tag and by month; each group's page is
+re-rendered only when its membership (or a member's listing fields) changed since the last build.
+"""
+
+import re
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from html import escape as html_escape
+
+from template_engine import load_template
+
+STATE_VERSION = 1
+
+
+def tag_slug(tag):
+    """URL path segment for a tag; CJK tags keep their characters, e.g. 'AI/ML' → 'ai-ml', '读书' → '读书'"""
+    slug = re.sub(r'[\W_]+', '-', tag.strip().lower()).strip('-')
+    return slug or 'tag-' + hashlib.sha1(tag.encode('utf-8')).hexdigest()[:8]
+
+
+def month_name(month_key):
+    """'2025-09' → 'September 2025'"""
+    return datetime.strptime(month_key, '%Y-%m').strftime('%B %Y')
+
+
+class ListingPagesBuilder:
+    """
+    Maintains blog/tags/ and blog/archives/. The digest of every page's inputs is recorded in
+    blog/.cache/listing-pages.json, so a build that adds one post rewrites only that post's tags,
+    its month and the two overview pages.
+    """
+
+    def __init__(self, converter):
+        self.converter = converter
+        self.template_path = converter.blog_dir / "templates" / "listing-template.html"
+        self.rendered_count = 0
+        # page path (relative to blog/) → digest; loaded once and kept in memory for watch-mode rebuilds
+        self.state = None
+
+    @property
+    def tags_dir(self):
+        return self.converter.blog_dir / "tags"
+
+    @property
+    def archives_dir(self):
+        return self.converter.blog_dir / "archives"
+
+    @property
+    def state_path(self):
+        return self.converter.blog_dir / ".cache" / "listing-pages.json"
+
+    def load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state.get('pages', {}) if state.get('version') == STATE_VERSION else {}
+
+    def save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'pages': self.state}, f,
+                      ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+    def group_articles(self, articles):
+        """
+        The single metadata pass: tag slug → (display name, posts) and 'YYYY-MM' → posts,
+        both in the order of articles (newest first). Tags differing only in case or
+        punctuation share a slug and a page; the first spelling seen names it.
+        """
+        tags = {}
+        months = {}
+        for article in articles:
+            for tag in article['tags']:
+                tags.setdefault(tag_slug(tag), (tag, []))[1].append(article)
+            months.setdefault(article['date_iso'][:7], []).append(article)
+        return tags, months
+
+    def update(self, articles):
+        """Bring blog/tags and blog/archives in line with articles (newest first); returns (tags, months)"""
+        if self.state is None:
+            self.state = self.load_state()
+        self.rendered_count = 0
+        template = load_template(self.template_path)
+        # Page markup comes from the converter (post items) and the listing template
+        version = self.converter.converter_version() + hashlib.sha256(self.template_path.read_bytes()).hexdigest()[:16]
+
+        # Listing fields of every post, computed once and shared by all the groups it belongs to
+        fingerprints = {
+            id(article): '\x1f'.join(str(article[field]) for field in
+                                     ('filename', 'title', 'date_iso', 'date_formatted', 'reading_time', 'summary'))
+            for article in articles
+        }
+        tags, months = self.group_articles(articles)
+        wanted = set()
+
+        def page(relative, depth, inputs, render):
+            wanted.add(relative)
+            digest = hashlib.sha256('\x1e'.join([version, *inputs]).encode('utf-8')).hexdigest()[:16]
+            path = self.converter.blog_dir / relative
+            if self.state.get(relative) == digest and path.exists():
+                return
+            title, heading, description, listing = render()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.converter.write_if_changed(path, template.render({
+                'BASE_HREF': '../' * depth,
+                'PAGE_TITLE': title,
+                'PAGE_HEADING': heading,
+                'PAGE_DESCRIPTION': description,
+                'LISTING': listing,
+            }))
+            self.state[relative] = digest
+            self.rendered_count += 1
+
+        for slug, (name, posts) in tags.items():
+            page(f"tags/{slug}/index.html", 2, [name, *(fingerprints[id(post)] for post in posts)],
+                 lambda name=name, posts=posts: (
+                     f"#{html_escape(name)}", f"#{html_escape(name)}",
+                     f"{len(posts)} post{'s' if len(posts) != 1 else ''} tagged “{html_escape(name)}”",
+                     self.render_posts(posts)))
+        for key, posts in months.items():
+            year, month = key.split('-')
+            page(f"archives/{year}/{month}/index.html", 3, [key, *(fingerprints[id(post)] for post in posts)],
+                 lambda key=key, posts=posts: (
+                     month_name(key), month_name(key),
+                     f"{len(posts)} post{'s' if len(posts) != 1 else ''} from {month_name(key)}",
+                     self.render_posts(posts)))
+
+        # The overview pages only depend on the group names and sizes
+        tag_counts = sorted(((slug, name, len(posts)) for slug, (name, posts) in tags.items()),
+                            key=lambda item: (-item[2], item[1].lower()))
+        page("tags/index.html", 1, [f"{slug}\x1f{name}\x1f{count}" for slug, name, count in tag_counts],
+             lambda: ("Tags", "Tags", f"{len(tag_counts)} tags across {len(articles)} posts",
+                      self.render_tag_cloud(tag_counts)))
+        month_counts = sorted(((key, len(posts)) for key, posts in months.items()), reverse=True)
+        page("archives/index.html", 1, [f"{key}\x1f{count}" for key, count in month_counts],
+             lambda: ("Archives", "Archives", f"{len(articles)} posts by month",
+                      self.render_archive_index(month_counts)))
+
+        self.remove_stale(wanted)
+        self.save_state()
+        return len(tags), len(months)
+
+    def render_posts(self, posts):
+        items = '\n'.join(self.converter.render_post_item(post) for post in posts)
+        return f'''            <section class="posts">
+{items}
+            </section>'''
+
+    def render_tag_cloud(self, tag_counts):
+        links = '\n'.join(
+            f'                <a class="tag" href="tags/{slug}/">{html_escape(name)} <span class="tag-count">{count}</span></a>'
+            for slug, name, count in tag_counts
+        )
+        return f'''            <section class="tag-cloud">
+{links}
+            </section>'''
+
+    def render_archive_index(self, month_counts):
+        years = {}
+        for key, count in month_counts:
+            years.setdefault(key[:4], []).append((key, count))
+        blocks = []
+        for year, entries in years.items():
+            months = '\n'.join(
+                f'                    <li><a href="archives/{key[:4]}/{key[5:]}/">{month_name(key)}</a> '
+                f'<span class="archive-count">{count}</span></li>'
+                for key, count in entries
+            )
+            blocks.append(f'''                <h2 class="archive-year" id="{year}">{year}</h2>
+                <ul class="archive-months">
+{months}
+                </ul>''')
+        body = '\n'.join(blocks)
+        return f'''            <section class="archives">
+{body}
+            </section>'''
+
+    def remove_stale(self, wanted):
+        """Drop pages of tags and months that no longer have posts"""
+        for relative in [relative for relative in self.state if relative not in wanted]:
+            del self.state[relative]
+        if self.tags_dir.exists():
+            for tag_dir in self.tags_dir.iterdir():
+                if tag_dir.is_dir() and f"tags/{tag_dir.name}/index.html" not in wanted:
+                    shutil.rmtree(tag_dir)
+        if self.archives_dir.exists():
+            for year_dir in self.archives_dir.iterdir():
+                if not year_dir.is_dir():
+                    continue
+                for month_dir in year_dir.iterdir():
+                    if month_dir.is_dir() and f"archives/{year_dir.name}/{month_dir.name}/index.html" not in wanted:
+                        shutil.rmtree(month_dir)
+                if not any(year_dir.iterdir()):
+                    year_dir.rmdir()
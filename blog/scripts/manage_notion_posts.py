@@ -5,11 +5,15 @@ Notion文章管理脚本
 """
 
 import os
-import requests
-import json
-from datetime import datetime
+import re
+import sys
+import time
+import argparse
 from pathlib import Path
 
+from notion_api import ARCHIVE_PAYLOAD, BLOG_PROPERTIES, NotionClient, status_payload
+from notion_index import NotionIndex
+
 def load_env_file():
     """Load environment variables from .env file"""
     env_path = Path(__file__).parent.parent.parent / '.env'
@@ -23,6 +27,9 @@ def load_env_file():
 
 load_env_file()
 
+# 完整的页面 ID（32 位十六进制，可带连字符）；更短的视为 list 输出的 ID 前缀
+FULL_PAGE_ID = re.compile(r'^[0-9a-f]{32}$')
+
 class NotionPostManager:
     def __init__(self):
         self.notion_token = os.getenv('NOTION_TOKEN')
@@ -34,98 +41,78 @@ class NotionPostManager:
             print("   export NOTION_DATABASE_ID='your_database_id'")
             return
             
-        self.headers = {
-            'Authorization': f'Bearer {self.notion_token}',
-            'Content-Type': 'application/json',
-            'Notion-Version': '2022-06-28'
-        }
+        self.client = NotionClient(self.notion_token)
+        # 本地元数据索引：list / 标题查找 / 批量筛选都读它，修改页面后同步更新
+        self.index = NotionIndex()
     
     def query_all_posts(self):
-        """查询所有文章"""
-        url = f'https://api.notion.com/v1/databases/{self.database_id}/query'
+        """查询所有文章（完整扫描），成功时同时刷新本地索引"""
+        sorts = [{"property": "Date", "direction": "descending"}]
         
         all_posts = []
-        has_more = True
-        start_cursor = None
-        
-        while has_more:
-            payload = {"sorts": [{"property": "Date", "direction": "descending"}]}
-            if start_cursor:
-                payload['start_cursor'] = start_cursor
-            
-            try:
-                response = requests.post(url, headers=self.headers, json=payload)
-                if response.status_code == 200:
-                    data = response.json()
-                    all_posts.extend(data['results'])
-                    has_more = data.get('has_more', False)
-                    start_cursor = data.get('next_cursor')
-                else:
-                    print(f"❌ 查询失败: {response.status_code}")
-                    break
-            except Exception as e:
-                print(f"❌ 连接失败: {e}")
-                break
+        try:
+            for page in self.client.iter_database(self.database_id, properties=BLOG_PROPERTIES, sorts=sorts):
+                all_posts.append(page)
+        except Exception as e:
+            print(f"❌ 查询失败: {e}")
+        else:
+            removed = self.index.replace_all(all_posts)
+            print(f"🗂  已从 Notion 重建本地索引: {len(all_posts)} 篇" + (f"，移除 {removed} 篇" if removed else ""))
         
         return all_posts
     
-    def extract_page_properties(self, page):
-        """提取页面属性"""
-        properties = page.get('properties', {})
-        
-        title = "Untitled"
-        title_prop = properties.get('Title') or properties.get('Name')
-        if title_prop and title_prop.get('title'):
-            title = title_prop['title'][0]['text']['content']
-        
-        status = "Draft"
-        status_prop = properties.get('Status')
-        if status_prop and status_prop.get('select'):
-            status = status_prop['select']['name']
-        
-        date = datetime.now().strftime('%Y-%m-%d')
-        date_prop = properties.get('Date')
-        if date_prop and date_prop.get('date') and date_prop['date'].get('start'):
-            date = date_prop['date']['start']
-        
-        return {
-            'title': title,
-            'status': status,
-            'date': date,
-            'page_id': page['id']
-        }
+    def refresh_index(self):
+        """
+        增量刷新：只查询索引中最新 last_edited_time 之后编辑过的页面。
+        Notion 的 last_edited_time 精确到分钟，所以从同一分钟开始查；
+        在 Notion 中直接归档或删除的页面不会出现在结果里，需要 --full-refresh
+        """
+        watermark = self.index.watermark()
+        if watermark is None:
+            return self.query_all_posts()
+        edited = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": watermark}}
+        try:
+            pages = list(self.client.iter_database(self.database_id, properties=BLOG_PROPERTIES, filter=edited))
+        except Exception as e:
+            print(f"❌ 查询失败: {e}")
+            return []
+        self.index.upsert(pages)
+        print(f"🔄 已增量刷新本地索引: {len(pages)} 篇有改动")
+        return pages
+    
+    def prepare_index(self, refresh=False, full=False):
+        """查询前准备本地索引：为空或 full 时完整扫描，refresh 时增量刷新，否则直接使用"""
+        if full or self.index.watermark() is None:
+            self.query_all_posts()
+        elif refresh:
+            self.refresh_index()
+        else:
+            refreshed_at = self.index.refreshed_at()
+            age = f"{(time.time() - refreshed_at) / 60:.0f} 分钟前" if refreshed_at else "未知时间"
+            print(f"🗂  使用本地索引（更新于 {age}；--refresh 从 Notion 增量更新）")
     
-    def list_posts(self):
-        """列出所有文章"""
-        posts = self.query_all_posts()
+    def list_posts(self, refresh=False, full=False):
+        """列出所有文章（读本地索引）"""
+        self.prepare_index(refresh, full)
+        posts = self.index.all_posts()
         
         print(f"\n📚 找到 {len(posts)} 篇文章:\n")
         print(f"{'序号':<6} {'标题':<50} {'状态':<12} {'日期':<12} {'ID'}")
         print("=" * 100)
         
-        for idx, post in enumerate(posts, 1):
-            props = self.extract_page_properties(post)
+        for idx, props in enumerate(posts, 1):
             print(f"{idx:<6} {props['title'][:48]:<50} {props['status']:<12} {props['date']:<12} {props['page_id'][:8]}...")
         
         return posts
     
     def update_page_status(self, page_id, new_status="Draft"):
         """更新页面状态"""
-        url = f'https://api.notion.com/v1/pages/{page_id}'
-        
-        payload = {
-            "properties": {
-                "Status": {
-                    "select": {
-                        "name": new_status
-                    }
-                }
-            }
-        }
+        url = f'pages/{page_id}'
         
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
+            response = self.client.patch(url, json=status_payload(new_status))
             if response.status_code == 200:
+                self.index.set_status(page_id, new_status)
                 return True
             else:
                 print(f"❌ 更新失败: {response.status_code} - {response.text}")
@@ -136,15 +123,12 @@ class NotionPostManager:
     
     def archive_page(self, page_id):
         """归档页面（Notion API不支持删除，只能归档）"""
-        url = f'https://api.notion.com/v1/pages/{page_id}'
-        
-        payload = {
-            "archived": True
-        }
+        url = f'pages/{page_id}'
         
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
+            response = self.client.patch(url, json=ARCHIVE_PAYLOAD)
             if response.status_code == 200:
+                self.index.remove(page_id)
                 return True
             else:
                 print(f"❌ 归档失败: {response.status_code} - {response.text}")
@@ -152,43 +136,204 @@ class NotionPostManager:
         except Exception as e:
             print(f"❌ 归档错误: {e}")
             return False
+    
+    def select_posts(self, page_ids=(), title=None, status=None):
+        """
+        批量命令的目标文章（从本地索引筛选），返回 [(page_id, 属性或 None)]。
+        page_ids 可以是完整 ID 或 list 输出的前缀；同时给出 ID 与筛选条件时取交集。
+        索引中还没有的完整 ID 照样处理（属性为 None），但不参与筛选
+        """
+        if page_ids:
+            selected = {}
+            for page_id in page_ids:
+                page_id = page_id.replace('-', '').lower()
+                matches = self.index.find_by_id_prefix(page_id)
+                if not matches and FULL_PAGE_ID.match(page_id):
+                    selected.setdefault(page_id, None)
+                elif not matches:
+                    print(f"⚠️  没有找到 ID 为 {page_id} 的文章")
+                elif len(matches) > 1:
+                    print(f"⚠️  ID 前缀 {page_id} 匹配到 {len(matches)} 篇文章，将全部处理")
+                for props in matches:
+                    selected[props['page_id']] = props
+            candidates = list(selected.items())
+        else:
+            candidates = [(props['page_id'], props) for props in self.index.all_posts()]
+        
+        if not title and not status:
+            return candidates
+        return [
+            (page_id, props) for page_id, props in candidates
+            if props is not None
+            and (not title or title.lower() in props['title'].lower())
+            and (not status or props['status'].lower() == status.lower())
+        ]
+    
+    def bulk_update(self, targets, payload, describe, dry_run=False):
+        """
+        并发修改多篇文章（共享限速器），并逐篇输出结果。
+        targets 为 select_posts 的结果；已经处于目标状态的文章直接跳过
+        """
+        new_status = payload.get('properties', {}).get('Status', {}).get('select', {}).get('name')
+        pending = []
+        skipped = 0
+        for page_id, props in targets:
+            if props is not None and new_status and props['status'] == new_status:
+                skipped += 1
+                continue
+            pending.append((page_id, props))
+        
+        def label(page_id, props):
+            return f"{props['title']} ({page_id[:8]}...)" if props else page_id
+        
+        if dry_run:
+            for page_id, props in pending:
+                old = f"{props['status']} → " if props else ""
+                print(f"  🔍 [dry-run] {label(page_id, props)}: {old}{describe}")
+            print(f"\n📊 将修改 {len(pending)} 篇，跳过 {skipped} 篇（已是 {new_status}）" if new_status
+                  else f"\n📊 将修改 {len(pending)} 篇")
+            return []
+        
+        started = time.perf_counter()
+        results = self.client.patch_pages([(page_id, payload) for page_id, _ in pending])
+        for (page_id, props), (_, ok, error) in zip(pending, results):
+            if ok:
+                if new_status:
+                    self.index.set_status(page_id, new_status)
+                else:
+                    self.index.remove(page_id)
+                print(f"  ✅ {label(page_id, props)}: {describe}")
+            else:
+                print(f"  ❌ {label(page_id, props)}: {error}")
+        
+        succeeded = sum(1 for _, ok, _ in results if ok)
+        print(f"\n📊 成功 {succeeded} 篇，失败 {len(results) - succeeded} 篇，跳过 {skipped} 篇，"
+              f"用时 {time.perf_counter() - started:.1f}s")
+        return results
 
-def main():
-    import sys
+def read_ids_file(path):
+    """每行一个页面 ID（空行和 # 开头的行忽略）；'-' 表示从标准输入读取（读完不关闭标准输入）"""
+    def parse(lines):
+        return [line.split('#', 1)[0].strip() for line in lines if line.split('#', 1)[0].strip()]
+    if path == '-':
+        return parse(sys.stdin)
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse(f)
+
+
+def confirm(prompt, use_terminal=False):
+    """
+    询问 yes/no。标准输入已经用来读取页面 ID 时（--ids-file -）改从终端 /dev/tty 读取回答；
+    没有终端（例如在管道或 CI 中）时视为取消，需要用 -y 或 --dry-run
+    """
+    if not use_terminal:
+        return input(prompt).lower() == 'yes'
+    try:
+        # 终端不能以 r+ 打开（不可 seek），读写分开
+        with open('/dev/tty', 'w', encoding='utf-8') as out, open('/dev/tty', 'r', encoding='utf-8') as tty:
+            out.write(prompt)
+            out.flush()
+            return tty.readline().strip().lower() == 'yes'
+    except OSError:
+        print("\n⚠️  标准输入已用于读取页面 ID，且没有可用的终端来确认；请加 -y 确认或用 --dry-run 预览")
+        return False
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='manage_notion_posts.py',
+        description='查看或修改 Notion 数据库中的文章',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""示例:
+  python3 manage_notion_posts.py list                                  # 列出所有文章
+  python3 manage_notion_posts.py draft <page_id>                       # 将文章标记为Draft
+  python3 manage_notion_posts.py archive <page_id>                     # 归档文章
+  python3 manage_notion_posts.py draft-by-title <title>                # 根据标题将文章标记为Draft
+  python3 manage_notion_posts.py bulk-status Draft <id> <id> ...       # 批量修改状态
+  python3 manage_notion_posts.py bulk-archive --status Draft --dry-run # 预览将被归档的草稿"""
+    )
+    commands = parser.add_subparsers(dest='command')
+    list_posts = commands.add_parser('list', help='列出所有文章')
+    commands.add_parser('draft', help='将文章标记为Draft').add_argument('page_id')
+    commands.add_parser('archive', help='归档文章').add_argument('page_id')
+    draft_by_title = commands.add_parser('draft-by-title', help='根据标题将文章标记为Draft')
+    draft_by_title.add_argument('title', nargs='+')
+
+    bulk_status = commands.add_parser('bulk-status', help='批量修改文章状态')
+    bulk_status.add_argument('new_status', help='目标状态，如 Draft / Published')
+    bulk_archive = commands.add_parser('bulk-archive', help='批量归档文章')
+    for bulk in (bulk_status, bulk_archive):
+        bulk.add_argument('page_ids', nargs='*', help='页面 ID 或 list 输出的 ID 前缀')
+        bulk.add_argument('--ids-file', help="从文件读取页面 ID，每行一个（'-' 为标准输入）")
+        bulk.add_argument('--title', help='只处理标题包含该文字的文章')
+        bulk.add_argument('--status', help='只处理当前为该状态的文章')
+        bulk.add_argument('--dry-run', action='store_true', help='只列出将要修改的文章')
+        bulk.add_argument('-y', '--yes', action='store_true', help='不再确认')
+    # 查询类命令默认只读本地索引
+    for command in (list_posts, draft_by_title, bulk_status, bulk_archive):
+        command.add_argument('--refresh', action='store_true', help='先从 Notion 增量刷新本地索引')
+        command.add_argument('--full-refresh', action='store_true', help='完整扫描 Notion 数据库重建本地索引')
+    return parser
+
+
+def run_bulk(manager, args):
+    page_ids = list(args.page_ids)
+    if args.ids_file:
+        page_ids += read_ids_file(args.ids_file)
+    if not page_ids and not args.title and not args.status:
+        print("\n❌ 请给出页面 ID，或用 --title / --status 筛选文章")
+        return
     
+    manager.prepare_index(args.refresh, args.full_refresh)
+    targets = manager.select_posts(page_ids, title=args.title, status=args.status)
+    if not targets:
+        print("\n📭 没有符合条件的文章")
+        return
+    
+    if args.command == 'bulk-archive':
+        payload, describe, action = ARCHIVE_PAYLOAD, "已归档", "归档"
+    else:
+        payload, describe, action = status_payload(args.new_status), f"→ {args.new_status}", f"标记为 {args.new_status}"
+    print(f"\n🔄 {action}: {len(targets)} 篇文章")
+    
+    if not args.dry_run and not args.yes and args.command == 'bulk-archive':
+        if not confirm(f"确认归档 {len(targets)} 篇文章? (yes/no): ", use_terminal=args.ids_file == '-'):
+            print("❌ 已取消")
+            return
+    manager.bulk_update(targets, payload, describe, dry_run=args.dry_run)
+
+
+def main():
     print("📝 Notion文章管理工具")
     print("=" * 60)
     
+    parser = build_parser()
+    args = parser.parse_args()
+    
     manager = NotionPostManager()
     
     if not manager.notion_token or not manager.database_id:
         print("\n💡 请先设置环境变量后重新运行")
         return
     
-    if len(sys.argv) < 2:
-        print("\n用法:")
-        print("  python3 manage_notion_posts.py list                    # 列出所有文章")
-        print("  python3 manage_notion_posts.py draft <page_id>         # 将文章标记为Draft")
-        print("  python3 manage_notion_posts.py archive <page_id>       # 归档文章")
-        print("  python3 manage_notion_posts.py draft-by-title <title>  # 根据标题将文章标记为Draft")
+    if args.command is None:
+        print()
+        parser.print_help()
         return
     
-    command = sys.argv[1]
+    if args.command == 'list':
+        manager.list_posts(args.refresh, args.full_refresh)
     
-    if command == 'list':
-        manager.list_posts()
-    
-    elif command == 'draft' and len(sys.argv) > 2:
-        page_id = sys.argv[2]
-        props = manager.extract_page_properties({'id': page_id, 'properties': {}})
+    elif args.command == 'draft':
+        page_id = args.page_id
         print(f"\n🔄 将文章标记为Draft: {page_id}")
         if manager.update_page_status(page_id, "Draft"):
             print("✅ 更新成功")
         else:
             print("❌ 更新失败")
     
-    elif command == 'archive' and len(sys.argv) > 2:
-        page_id = sys.argv[2]
+    elif args.command == 'archive':
+        page_id = args.page_id
         print(f"\n🗄️  归档文章: {page_id}")
         response = input("确认归档? (yes/no): ")
         if response.lower() == 'yes':
@@ -199,33 +344,31 @@ def main():
         else:
             print("❌ 已取消")
     
-    elif command == 'draft-by-title' and len(sys.argv) > 2:
-        search_title = ' '.join(sys.argv[2:])
-        posts = manager.query_all_posts()
-        
-        matching_posts = []
-        for post in posts:
-            props = manager.extract_page_properties(post)
-            if search_title.lower() in props['title'].lower():
-                matching_posts.append((post, props))
+    elif args.command == 'draft-by-title':
+        search_title = ' '.join(args.title)
+        manager.prepare_index(args.refresh, args.full_refresh)
+        matching_posts = manager.index.search_titles(search_title)
         
         if not matching_posts:
             print(f"\n❌ 没有找到标题包含 '{search_title}' 的文章")
             return
         
         print(f"\n🔍 找到 {len(matching_posts)} 篇匹配的文章:")
-        for idx, (post, props) in enumerate(matching_posts, 1):
+        for idx, props in enumerate(matching_posts, 1):
             print(f"  {idx}. {props['title']} ({props['status']}) - {props['page_id'][:8]}...")
         
         if len(matching_posts) == 1:
-            post, props = matching_posts[0]
+            props = matching_posts[0]
             print(f"\n🔄 将 '{props['title']}' 标记为Draft")
             if manager.update_page_status(props['page_id'], "Draft"):
                 print("✅ 更新成功")
             else:
                 print("❌ 更新失败")
         else:
-            print("\n💡 找到多篇文章，请使用 'draft <page_id>' 命令指定具体文章")
+            print("\n💡 找到多篇文章，请使用 'draft <page_id>' 或 'bulk-status Draft --title <title>' 命令")
+    
+    elif args.command in ('bulk-status', 'bulk-archive'):
+        run_bulk(manager, args)
 
 if __name__ == "__main__":
     main()
@@ -8,9 +8,13 @@ import os
 import re
 import markdown
 import yaml
-from datetime import datetime
 from pathlib import Path
 
+from build_trace import span
+from listing_pages import tag_slug
+from simple_md_converter import parse_post_date
+from template_engine import load_template
+
 class BlogConverter:
     def __init__(self):
         self.blog_dir = Path(__file__).parent.parent
@@ -21,79 +25,23 @@ class BlogConverter:
         # Ensure directories exist
         self.posts_dir.mkdir(exist_ok=True)
         
-        # HTML template
-        self.html_template = self._load_template()
+        # One Markdown instance for all files, reset between conversions
+        self.md = markdown.Markdown(extensions=['codehilite', 'fenced_code', 'tables'])
         
     def _load_template(self):
-        """Load the HTML template for articles"""
-        return '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - Joyce's Blog</title>
-    <link rel="stylesheet" href="../blog-styles.css">
-    <link rel="stylesheet" href="../templates/article-styles.css">
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap" rel="stylesheet">
-</head>
-<body>
-    <div class="container">
-        <!-- Header -->
-        <header class="header">
-            <div class="nav">
-                <a href="../../" class="site-title">Back to Joyce's Playground</a>
-                <div class="nav-links">
-                    <a href="../" class="nav-link">Home</a>
-                    <a href="#archives" class="nav-link">Archives</a>
-                    <a href="#tags" class="nav-link">Tags</a>
-                </div>
-            </div>
-        </header>
-
-        <!-- Article Content -->
-        <main class="main">
-            <article class="article">
-                <!-- Article Header -->
-                <header class="article-header">
-                    <h1 class="article-title">{title}</h1>
-                    <div class="article-meta">
-                        <time datetime="{date_iso}">{date_formatted}</time>
-                        <span class="reading-time">{reading_time} min</span>
-                        <span class="author">Joyce Gu</span>
-                    </div>
-                    <div class="article-tags">
-                        {tags_html}
-                    </div>
-                </header>
-
-                <!-- Article Content -->
-                <div class="article-content">
-                    {content}
-                </div>
+        """Load the compiled article template (cached until templates/article-template.html changes)"""
+        return load_template(self.templates_dir / "article-template.html")
 
-                <!-- Article Footer -->
-                <footer class="article-footer">
-                    <div class="article-navigation">
-                        <a href="../" class="nav-prev">← Back to Blog</a>
-                        <a href="#" class="nav-next">Next Article →</a>
-                    </div>
-                    
-                    <div class="article-share">
-                        <p>Share this article:</p>
-                        <div class="share-buttons">
-                            <a href="https://twitter.com/intent/tweet?text={title}&url={url}" class="share-button" target="_blank">Twitter</a>
-                            <a href="https://www.linkedin.com/sharing/share-offsite/?url={url}" class="share-button" target="_blank">LinkedIn</a>
-                            <a href="#" class="share-button" onclick="navigator.clipboard.writeText(window.location.href); alert('Link copied to clipboard!')">Copy Link</a>
-                        </div>
-                    </div>
-                </footer>
-            </article>
-        </main>
-    </div>
-
-    <script src="../blog-script.js"></script>
-</body>
-</html>'''
+    def write_if_changed(self, path, text):
+        """Write text to path only if the bytes differ; returns True when the file was written"""
+        data = text.encode('utf-8')
+        try:
+            if path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        path.write_bytes(data)
+        return True
 
     def parse_frontmatter(self, content):
         """Parse YAML frontmatter from markdown content"""
@@ -119,7 +67,7 @@ class BlogConverter:
         
         tags_html = []
         for tag in tags:
-            tags_html.append(f'<span class="tag">{tag}</span>')
+            tags_html.append(f'<a class="tag" href="../tags/{tag_slug(tag)}/">{tag}</a>')
         return "\n                        ".join(tags_html)
     
     def create_filename(self, title):
@@ -130,15 +78,16 @@ class BlogConverter:
     
     def convert_markdown_file(self, md_file_path):
         """Convert a single markdown file to HTML"""
-        with open(md_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with span('read'):
+            with open(md_file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
         
         # Parse frontmatter
-        metadata, markdown_content = self.parse_frontmatter(content)
+        with span('frontmatter'):
+            metadata, markdown_content = self.parse_frontmatter(content)
         
         # Extract metadata with defaults
         title = metadata.get('title', 'Untitled')
-        date_str = metadata.get('date', datetime.now().strftime('%Y-%m-%d'))
         
         # Handle tags - can be string or list
         tags_raw = metadata.get('tags', [])
@@ -150,18 +99,14 @@ class BlogConverter:
         else:
             tags = []
         
-        # Convert date
-        try:
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            date_iso = date_obj.strftime('%Y-%m-%d')
-            date_formatted = date_obj.strftime('%B %d, %Y')
-        except:
-            date_iso = datetime.now().strftime('%Y-%m-%d')
-            date_formatted = datetime.now().strftime('%B %d, %Y')
+        # Convert date (YAML may hand back a date object; never falls back to the build time)
+        date_obj = parse_post_date(metadata.get('date'), md_file_path.name)
+        date_iso = date_obj.strftime('%Y-%m-%d')
+        date_formatted = date_obj.strftime('%B %d, %Y')
         
         # Convert markdown to HTML
-        md = markdown.Markdown(extensions=['codehilite', 'fenced_code', 'tables'])
-        html_content = md.convert(markdown_content)
+        with span('render'):
+            html_content = self.md.reset().convert(markdown_content)
         
         # Calculate reading time
         reading_time = self.calculate_reading_time(markdown_content)
@@ -175,20 +120,21 @@ class BlogConverter:
             filename += '.html'
         
         # Generate final HTML
-        final_html = self.html_template.format(
-            title=title,
-            date_iso=date_iso,
-            date_formatted=date_formatted,
-            reading_time=reading_time,
-            tags_html=tags_html,
-            content=html_content,
-            url=f"https://joycegu.github.io/CuriousBuild/blog/posts/{filename}"
-        )
+        with span('template'):
+            final_html = self._load_template().render({
+                'ARTICLE_TITLE': title,
+                'ARTICLE_DATE': date_iso,
+                'ARTICLE_DATE_FORMATTED': date_formatted,
+                'READING_TIME': reading_time,
+                'ARTICLE_TAGS': tags_html,
+                'ARTICLE_CONTENT': html_content,
+                'ARTICLE_URL': f"https://joycegu.github.io/CuriousBuild/blog/posts/{filename}",
+            })
         
         # Write HTML file
         output_path = self.posts_dir / filename
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(final_html)
+        with span('write'):
+            self.write_if_changed(output_path, final_html)
         
         print(f"✅ Converted: {md_file_path.name} → {filename}")
         
@@ -216,7 +162,8 @@ class BlogConverter:
         articles = []
         for md_file in sorted(md_files):
             try:
-                article_info = self.convert_markdown_file(md_file)
+                with span('post', file=md_file.name):
+                    article_info = self.convert_markdown_file(md_file)
                 articles.append(article_info)
             except Exception as e:
                 print(f"❌ Error converting {md_file.name}: {e}")
@@ -262,11 +209,11 @@ class BlogConverter:
             </section>'''
         
         # Update the blog index
-        pattern = r'<!-- Posts List -->.*?</section>'
-        updated_content = re.sub(pattern, new_posts_section, current_content, flags=re.DOTALL)
-        
-        with open(blog_index_path, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        with span('index', articles=len(articles)):
+            pattern = r'<!-- Posts List -->.*?</section>'
+            updated_content = re.sub(pattern, new_posts_section, current_content, flags=re.DOTALL)
+            
+            self.write_if_changed(blog_index_path, updated_content)
         
         print(f"✅ Updated blog index with {len(articles)} articles")
 
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+近似重复检测：MinHash 签名 + LSH 分桶
+文章按字符 k-gram 切片后计算 MinHash 签名，签名按 band 分桶；只有落进同一个桶的文章才是候选对，
+候选对再交给精确的相似度规则确认，整体接近线性，不再两两比较全部文章
+"""
+
+import hashlib
+import random
+import re
+from collections import defaultdict
+
+SHINGLE_SIZE = 4
+NUM_PERM = 128
+# 每个 band 3 行、共 42 个 band：Jaccard 0.3 的文章约 2/3 概率成为候选，0.5 以上几乎必然，
+# 不相关文章（Jaccard < 0.05）落进同一个桶的概率低于 1%
+LSH_ROWS = 3
+LSH_BANDS = NUM_PERM // LSH_ROWS
+TITLE_SHINGLE_SIZE = 3
+
+# 64 位哈希的高 7 位选槽位（NUM_PERM = 128），其余 57 位参与取最小值
+BUCKET_SHIFT = 64 - (NUM_PERM - 1).bit_length()
+VALUE_MASK = (1 << BUCKET_SHIFT) - 1
+EMPTY = VALUE_MASK + 1
+# 空槽位的探测顺序：每个槽位一串固定的伪随机槽位（与文本无关，所有文章相同）
+DENSIFY_PROBES = [random.Random(slot).choices(range(NUM_PERM), k=4 * NUM_PERM) for slot in range(NUM_PERM)]
+
+
+def normalize_text(text):
+    """去掉标点与空白并转小写，只保留字母数字与汉字，与相似度比较使用同一份文本"""
+    return re.sub(r'[^\w]', '', text.lower())
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """字符 k-gram 的 64 位哈希集合；比 size 还短的文本整体作为一个切片"""
+    if not text:
+        return set()
+    if len(text) <= size:
+        grams = [text]
+    else:
+        grams = (text[i:i + size] for i in range(len(text) - size + 1))
+    return {int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'big') for gram in grams}
+
+
+def minhash(text, size=SHINGLE_SIZE):
+    """
+    单次哈希的 MinHash（one permutation hashing）：每个切片只哈希一次，按高位分到 NUM_PERM 个槽位，
+    每个槽位取最小值。短文本会留下空槽位，按该槽位固定的伪随机顺序借用第一个非空槽位的值
+    （optimal densification）；相邻空槽位不会借用同一个值，两篇文章在每个槽位相等的概率仍接近 Jaccard。
+    长文本也只需要一次遍历；空文本返回 None
+    """
+    signature = [EMPTY] * NUM_PERM
+    for value in shingle_hashes(text, size):
+        slot = value >> BUCKET_SHIFT
+        value &= VALUE_MASK
+        if value < signature[slot]:
+            signature[slot] = value
+    if all(value == EMPTY for value in signature):
+        return None
+    filled = [slot for slot, value in enumerate(signature) if value != EMPTY]
+    for slot in range(NUM_PERM):
+        if signature[slot] == EMPTY:
+            source = next((probe for probe in DENSIFY_PROBES[slot] if signature[probe] < EMPTY), None)
+            if source is None:
+                # 非空槽位极少、探测序列用完时退回到第一个非空槽位
+                source = filled[0]
+            signature[slot] = EMPTY + signature[source]
+    return tuple(signature)
+
+
+def estimate_jaccard(signature1, signature2):
+    return sum(a == b for a, b in zip(signature1, signature2)) / NUM_PERM
+
+
+def band_keys(signature):
+    """签名每个 band 的桶号；用 blake2b 而不是 hash()，保证跨进程、跨 Python 版本一致，可以落盘"""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(repr((band, rows)).encode('ascii'), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+class LSHIndex:
+    """内存中的 LSH 桶：key → 签名，(band, 桶号) → key 列表"""
+
+    def __init__(self):
+        self.buckets = defaultdict(list)
+
+    def add(self, key, signature):
+        for band, bucket in enumerate(band_keys(signature)):
+            self.buckets[(band, bucket)].append(key)
+
+    def query(self, signature):
+        found = set()
+        for band, bucket in enumerate(band_keys(signature)):
+            found.update(self.buckets.get((band, bucket), ()))
+        return found
+
+    def candidate_pairs(self):
+        """所有至少共享一个桶的 (key1, key2)"""
+        pairs = set()
+        for keys in self.buckets.values():
+            for i, key1 in enumerate(keys):
+                for key2 in keys[i + 1:]:
+                    if key1 != key2:
+                        pairs.add((key1, key2) if key1 < key2 else (key2, key1))
+        return pairs
+
+
+def candidate_pairs(contents, titles=None):
+    """
+    contents / titles 为 {key: 归一化文本}。内容签名共享桶的文章互为候选；
+    给出 titles 时，标题相近的文章也成为候选（对应“标题相似且内容有一定相似度”的规则）
+    """
+    pairs = set()
+    for texts, size in ((contents, SHINGLE_SIZE), (titles or {}, TITLE_SHINGLE_SIZE)):
+        index = LSHIndex()
+        for key, text in texts.items():
+            signature = minhash(text, size)
+            if signature is not None:
+                index.add(key, signature)
+        pairs |= index.candidate_pairs()
+    return pairs
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Notion API client shared by the sync / cleanup / manage scripts
+Keeps pooled keep-alive connections and retries throttled or failed requests
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+NOTION_API_BASE = 'https://api.notion.com/v1'
+NOTION_VERSION = '2022-06-28'
+
+# 429 为限流，5xx 为 Notion 侧暂时性错误，均可安全重试
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 可能存放标签的字段名，按顺序取第一个有值的
+TAG_PROPERTIES = ('Tags', 'Tag', 'tags', 'tag', 'Labels', 'Category', 'Categories')
+# 博客实际用到的数据库属性；查询时只请求这些字段以缩小响应体
+BLOG_PROPERTIES = ('Title', 'Name', 'Status', 'Date', 'Summary') + TAG_PROPERTIES
+
+# Notion 公开的平均速率上限约为每个 integration 3 req/s
+DEFAULT_RATE_LIMIT = float(os.getenv('NOTION_RATE_LIMIT', '3'))
+# 批量修改页面时的并发数；实际速率仍由限速器控制
+DEFAULT_WORKERS = int(os.getenv('NOTION_SYNC_WORKERS', '4'))
+
+
+def status_payload(status):
+    """把页面 Status（select）改为 status 的 PATCH 请求体"""
+    return {"properties": {"Status": {"select": {"name": status}}}}
+
+
+ARCHIVE_PAYLOAD = {"archived": True}
+
+
+def page_properties(page):
+    """
+    数据库查询结果中的一个页面 → 各脚本使用的属性：
+    page_id、title、status、date、tags、summary、last_edited_time
+    """
+    properties = page.get('properties', {})
+
+    # 标题
+    title = "Untitled"
+    title_prop = properties.get('Title') or properties.get('Name')
+    if title_prop and title_prop.get('title'):
+        title = title_prop['title'][0]['text']['content']
+
+    # 状态
+    status = "Draft"
+    status_prop = properties.get('Status')
+    if status_prop and status_prop.get('select'):
+        status = status_prop['select']['name']
+
+    # 日期（未设置时用页面创建日期，而不是同步当天，保证输出只取决于 Notion 内容）
+    date = page.get('created_time', '')[:10]
+    date_prop = properties.get('Date')
+    if date_prop and date_prop.get('date') and date_prop['date'].get('start'):
+        date = date_prop['date']['start']
+
+    # 标签：multi_select、select 或 status 类型的字段都可以
+    tags = []
+    for field_name in TAG_PROPERTIES:
+        tags_prop = properties.get(field_name)
+        if tags_prop:
+            if tags_prop.get('multi_select'):
+                tags = [tag['name'] for tag in tags_prop['multi_select']]
+                break
+            elif tags_prop.get('select'):
+                tags = [tags_prop['select']['name']]
+                break
+            elif tags_prop.get('status'):
+                tags = [tags_prop['status']['name']]
+                break
+
+    # 摘要
+    summary = ""
+    summary_prop = properties.get('Summary')
+    if summary_prop and summary_prop.get('rich_text'):
+        summary = summary_prop['rich_text'][0]['text']['content']
+
+    return {
+        'page_id': page['id'],
+        'title': title,
+        'status': status,
+        'date': date,
+        'tags': tags,
+        'summary': summary,
+        'last_edited_time': page.get('last_edited_time'),
+    }
+
+
+class NotionAPIError(Exception):
+    """Notion 在重试耗尽后仍返回非 200"""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        super().__init__(f"{response.status_code} - {response.text}")
+
+
+class RateLimiter:
+    """线程安全的令牌桶，所有共享它的请求合计不超过 rate 次/秒"""
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, burst=None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """阻塞直到拿到一个令牌；rate <= 0 表示不限速"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """收到 429 后让所有线程一起暂停，而不只是当前线程"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+_shared_rate_limiter = None
+_shared_rate_limiter_lock = threading.Lock()
+
+
+def get_shared_rate_limiter():
+    """进程内共享的限速器，同一进程中的多个 NotionClient 共用一份配额"""
+    global _shared_rate_limiter
+    with _shared_rate_limiter_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = RateLimiter()
+        return _shared_rate_limiter
+
+
+class NotionClient:
+    def __init__(self, token, timeout=(5, 30), max_retries=5,
+                 backoff_base=0.5, backoff_max=30.0, pool_size=10, rate_limiter=None):
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json',
+            'Notion-Version': NOTION_VERSION
+        })
+        # 重试由 request() 统一处理，连接池只负责复用 TCP+TLS 连接
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+
+    def _backoff_delay(self, attempt, response=None):
+        """计算第 attempt 次重试前的等待时间（带抖动的指数退避，优先遵循 Retry-After）"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return max(0.0, float(retry_after))
+                except ValueError:
+                    pass
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def request(self, method, path, **kwargs):
+        """
+        发送请求并在 429/5xx 或网络错误时自动重试。
+        返回最后一次的 Response；重试耗尽仍连接失败时抛出 requests.RequestException。
+        """
+        url = path if path.startswith('http') else f'{NOTION_API_BASE}/{path.lstrip("/")}'
+        kwargs.setdefault('timeout', self.timeout)
+
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                print(f"⚠️  Notion 连接异常，{delay:.1f}s 后重试 ({attempt + 1}/{self.max_retries}): {e}")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+                delay = self._backoff_delay(attempt, response)
+                if response.status_code == 429:
+                    self.rate_limiter.pause(delay)
+                print(f"⚠️  Notion 返回 {response.status_code}，{delay:.1f}s 后重试 ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request('PATCH', path, **kwargs)
+
+    def get_property_ids(self, database_id, names):
+        """把属性名解析为属性 ID（filter_properties 需要 ID），数据库中不存在的名字会被忽略"""
+        response = self.get(f'databases/{database_id}')
+        if response.status_code != 200:
+            raise NotionAPIError(response)
+        schema = response.json().get('properties', {})
+        # schema 中的 ID 已经 URL 编码，先还原，交给 requests 编码一次
+        return [unquote(schema[name]['id']) for name in names if name in schema]
+
+    def iter_database(self, database_id, properties=None, sorts=None, page_size=100, filter=None):
+        """
+        分页扫描整个数据库，逐条 yield 页面对象。
+        properties 为属性名列表时只返回这些属性，filter 为 Notion 查询过滤条件；任何一页失败都会抛出 NotionAPIError，
+        调用方不会把半截结果误当作完整数据库。
+        """
+        params = None
+        if properties:
+            property_ids = self.get_property_ids(database_id, properties)
+            if property_ids:
+                params = [('filter_properties', pid) for pid in property_ids]
+
+        body = {'page_size': page_size}
+        if sorts:
+            body['sorts'] = sorts
+        if filter:
+            body['filter'] = filter
+
+        while True:
+            response = self.post(f'databases/{database_id}/query', params=params, json=body)
+            if response.status_code != 200:
+                raise NotionAPIError(response)
+            data = response.json()
+            yield from data.get('results', [])
+            if not data.get('has_more'):
+                return
+            body['start_cursor'] = data.get('next_cursor')
+
+    def list_block_children(self, block_id, start_cursor=None, page_size=100):
+        """读取一页子块（原始响应，含 has_more / next_cursor）"""
+        params = {'page_size': page_size}
+        if start_cursor:
+            params['start_cursor'] = start_cursor
+        response = self.get(f'blocks/{block_id}/children', params=params)
+        if response.status_code != 200:
+            raise NotionAPIError(response)
+        return response.json()
+
+    def walk_block_tree(self, block_id, executor=None, depth=0, first_page=None, prefetch=None):
+        """
+        按文档顺序深度优先遍历块树，逐个 yield (depth, block)。
+        自动翻页并进入 has_children 的子块；传入 executor 时，在输出当前一页的同时预取
+        接下来最多 prefetch 个子树的第一页（默认为 executor 的线程数），进入一个子树就补上下一个。
+        内存上限：路径上每一层各保留当前一页和 prefetch 个预取页（每页最多 100 块），
+        与页面总块数无关。executor 只执行不等待其他任务的单次请求，不会互相阻塞。
+        """
+        if prefetch is None:
+            prefetch = getattr(executor, '_max_workers', 1) if executor is not None else 0
+        data = first_page if first_page is not None else self.list_block_children(block_id)
+        while True:
+            blocks = data.get('results', [])
+            waiting = deque(block['id'] for block in blocks if block.get('has_children'))
+            prefetched = {}
+
+            def top_up():
+                # 滑动窗口：始终只预取接下来的 prefetch 个子树
+                while executor is not None and waiting and len(prefetched) < prefetch:
+                    child_id = waiting.popleft()
+                    prefetched[child_id] = executor.submit(self.list_block_children, child_id)
+
+            top_up()
+            for block in blocks:
+                yield depth, block
+                if block.get('has_children'):
+                    future = prefetched.pop(block['id'], None)
+                    top_up()
+                    child_page = future.result() if future is not None else None
+                    yield from self.walk_block_tree(block['id'], executor, depth + 1, child_page, prefetch)
+            if not data.get('has_more'):
+                return
+            data = self.list_block_children(block_id, data.get('next_cursor'))
+
+    def patch_pages(self, updates, max_workers=DEFAULT_WORKERS):
+        """
+        并发 PATCH 多个页面，updates 为 [(page_id, payload)]。所有请求共用限速器，429 时一起暂停；
+        单个页面失败不影响其他页面。返回与 updates 同序的 [(page_id, 是否成功, 错误信息)]
+        """
+        def patch(update):
+            page_id, payload = update
+            try:
+                response = self.patch(f'pages/{page_id}', json=payload)
+            except requests.RequestException as e:
+                return page_id, False, str(e)
+            if response.status_code == 200:
+                return page_id, True, None
+            return page_id, False, f"{response.status_code} - {response.text}"
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            return list(pool.map(patch, updates))
+
+    def close(self):
+        self.session.close()
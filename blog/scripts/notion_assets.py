@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Notion 图片 / 文件 / 视频镜像
+Notion 托管文件的签名链接一小时后失效，同步时把它们下载到 blog/assets/，按内容哈希命名：
+相同字节只存一份（跨文章去重），文章里引用的是稳定的本地路径
+"""
+
+import hashlib
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import PurePosixPath
+from urllib.parse import unquote, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 同时下载的文件数与单个文件的大小上限（MB），可用环境变量覆盖
+DEFAULT_WORKERS = int(os.getenv('NOTION_ASSET_WORKERS', '4'))
+DEFAULT_MAX_BYTES = int(os.getenv('NOTION_ASSET_MAX_MB', '50')) * 1024 * 1024
+
+ASSET_BLOCK_TYPES = ('image', 'video', 'audio', 'file', 'pdf')
+DOWNLOAD_CHUNK = 256 * 1024
+MAX_ATTEMPTS = 3
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class AssetDownloadError(Exception):
+    pass
+
+
+def notion_file_id(url):
+    """
+    Notion 托管文件的稳定标识：签名链接去掉查询参数后的路径（/<workspace>/<file id>/<文件名>）。
+    每次读取块时签名都不同，路径不变
+    """
+    return urlsplit(url).path
+
+
+def original_name(url):
+    return unquote(PurePosixPath(urlsplit(url).path).name)
+
+
+def asset_suffix(url, content_type=None):
+    """扩展名优先取原文件名，没有时按 Content-Type 推断"""
+    suffix = PurePosixPath(original_name(url)).suffix.lower()
+    if suffix and len(suffix) <= 6 and suffix[1:].isalnum():
+        return '.jpg' if suffix == '.jpeg' else suffix
+    if content_type:
+        guessed = mimetypes.guess_extension(content_type.split(';', 1)[0].strip())
+        if guessed:
+            return '.jpg' if guessed in ('.jpe', '.jpeg') else guessed
+    return ''
+
+
+class AssetMirror:
+    """
+    有界线程池下载资源文件。签名链接不是 Notion API 请求，不经过 NotionClient 的限速器，
+    也不能带上 Notion 的 Authorization 头，所以使用独立的连接池
+    """
+
+    def __init__(self, assets_dir, max_workers=DEFAULT_WORKERS, max_bytes=DEFAULT_MAX_BYTES, timeout=(5, 60)):
+        self.assets_dir = assets_dir
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.downloaded = 0
+        self.deduplicated = 0
+        self.skipped = 0
+        self.bytes_written = 0
+        self._stats_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+    def for_page(self, known=None):
+        """一篇文章的镜像上下文；known 是上次同步记录的 {block_id: 记录}"""
+        return PageAssets(self, known or {})
+
+    def submit(self, block, url, known=None):
+        """
+        返回 Future，结果为记录 {'file_id', 'last_edited_time', 'name'}。
+        文件 id 与块的 last_edited_time 都没变且本地文件还在时不下载
+        """
+        record = {
+            'file_id': notion_file_id(url),
+            'last_edited_time': block.get('last_edited_time'),
+        }
+        if (known and known.get('file_id') == record['file_id']
+                and known.get('last_edited_time') == record['last_edited_time']
+                and (self.assets_dir / known.get('name', '')).is_file()):
+            with self._stats_lock:
+                self.skipped += 1
+            future = Future()
+            future.set_result(dict(record, name=known['name']))
+            return future
+        return self.executor.submit(lambda: dict(record, name=self.download(url)))
+
+    def download(self, url):
+        """流式下载到 assets 目录下的临时文件并同时计算哈希，完成后改名为 <sha256 前 16 位><扩展名>"""
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                response = self.session.get(url, stream=True, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            else:
+                if response.status_code == 200:
+                    with response:
+                        return self._store(response, url)
+                response.close()
+                error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRY_STATUS_CODES:
+                    break
+            time.sleep(2 ** attempt)
+        raise AssetDownloadError(f"下载失败 {original_name(url) or url}: {error}")
+
+    def _store(self, response, url):
+        digest = hashlib.sha256()
+        size = 0
+        # 临时文件放在同一目录，改名是原子的；.part 后缀不会被响应式图片流程当作原图
+        fd, temp_path = tempfile.mkstemp(dir=self.assets_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise AssetDownloadError(
+                            f"{original_name(url)} 超过 {self.max_bytes // (1024 * 1024)} MB 上限")
+                    digest.update(chunk)
+                    f.write(chunk)
+            name = digest.hexdigest()[:16] + asset_suffix(url, response.headers.get('Content-Type'))
+            target = self.assets_dir / name
+            if target.exists():
+                # 相同字节已经存在（其他文章或重复上传），只保留一份
+                os.unlink(temp_path)
+                with self._stats_lock:
+                    self.deduplicated += 1
+            else:
+                os.replace(temp_path, target)
+                with self._stats_lock:
+                    self.downloaded += 1
+                    self.bytes_written += size
+            return name
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+
+class PageAssets:
+    """收集一篇文章中提交的下载，records 为本次的 {block_id: 记录}，用于写入同步状态"""
+
+    def __init__(self, mirror, known):
+        self.mirror = mirror
+        self.known = known
+        self.futures = {}
+
+    def submit(self, block, url):
+        future = self.mirror.submit(block, url, self.known.get(block['id']))
+        self.futures[block['id']] = future
+        return future
+
+    @property
+    def records(self):
+        return {block_id: future.result() for block_id, future in self.futures.items()}
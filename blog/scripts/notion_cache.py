@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of Notion block trees shared by the sync / cleanup scripts
+Entries are keyed by page id and stay valid while the page's last_edited_time is unchanged
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "notion"
+DEFAULT_MAX_BYTES = int(os.getenv('NOTION_CACHE_MAX_MB', '200')) * 1024 * 1024
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    page_id TEXT PRIMARY KEY,
+    last_edited_time TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    page_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (page_id, seq)
+);
+'''
+
+# 每攒够一批块就提交一次，写入事务保持很短，不会阻塞其他线程
+WRITE_BATCH_SIZE = 100
+
+
+class NotionCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "blocks.sqlite3"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        """每个线程使用自己的连接（sqlite3 连接不能跨线程共享）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def record(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def has_blocks(self, page_id, last_edited_time):
+        """缓存中是否有该页面在 last_edited_time 时的完整块树"""
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT last_edited_time FROM entries WHERE page_id = ?', (page_id,)
+        ).fetchone()
+        return row is not None and row[0] == last_edited_time
+
+    def iter_blocks(self, page_id):
+        """按原顺序流式读出缓存的 (depth, block)，并刷新 LRU 时间"""
+        conn = self._connect()
+        with conn:
+            conn.execute('UPDATE entries SET accessed_at = ? WHERE page_id = ?', (time.time(), page_id))
+        cursor = conn.execute('SELECT depth, data FROM blocks WHERE page_id = ? ORDER BY seq', (page_id,))
+        for depth, data in cursor:
+            yield depth, json.loads(zlib.decompress(data))
+
+    def store_blocks(self, page_id, last_edited_time, blocks):
+        """
+        边透传 (depth, block) 边写入缓存。
+        只有完整遍历结束才登记 entry，中途出错或被中断不会留下可命中的半截缓存
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM entries WHERE page_id = ?', (page_id,))
+            conn.execute('DELETE FROM blocks WHERE page_id = ?', (page_id,))
+
+        size = 0
+        batch = []
+        for seq, (depth, block) in enumerate(blocks):
+            data = zlib.compress(json.dumps(block, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            size += len(data)
+            batch.append((page_id, seq, depth, data))
+            if len(batch) >= WRITE_BATCH_SIZE:
+                with conn:
+                    conn.executemany('INSERT INTO blocks VALUES (?, ?, ?, ?)', batch)
+                batch = []
+            yield depth, block
+
+        with conn:
+            if batch:
+                conn.executemany('INSERT INTO blocks VALUES (?, ?, ?, ?)', batch)
+            conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                (page_id, last_edited_time, size, time.time())
+            )
+        self.evict()
+
+    def invalidate(self, page_id):
+        """丢弃一个页面的缓存，下次读取时重新向 Notion 请求"""
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM entries WHERE page_id = ?', (page_id,))
+            conn.execute('DELETE FROM blocks WHERE page_id = ?', (page_id,))
+
+    def evict(self):
+        """总大小超过上限时，按最近最少使用顺序删除整页缓存"""
+        conn = self._connect()
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        victims = []
+        for page_id, size in conn.execute('SELECT page_id, size FROM entries ORDER BY accessed_at'):
+            if total <= self.max_bytes:
+                break
+            victims.append((page_id,))
+            total -= size
+        with conn:
+            conn.executemany('DELETE FROM entries WHERE page_id = ?', victims)
+            conn.executemany('DELETE FROM blocks WHERE page_id = ?', victims)
+        return len(victims)
+
+
+def cached_block_tree(client, cache, page_id, last_edited_time, executor=None):
+    """
+    返回页面块树的 (depth, block) 迭代器：
+    缓存命中时直接从磁盘读出，否则走 Notion API 并顺便写入缓存
+    """
+    if cache is None or not last_edited_time:
+        return client.walk_block_tree(page_id, executor)
+    if cache.has_blocks(page_id, last_edited_time):
+        cache.record(hit=True)
+        return cache.iter_blocks(page_id)
+    cache.record(hit=False)
+    return cache.store_blocks(page_id, last_edited_time, client.walk_block_tree(page_id, executor))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Notion 数据库的本地元数据索引（blog/.cache/notion/posts.sqlite3）
+保存每个页面的标题、状态、日期、标签与 last_edited_time，标题建有 trigram 全文索引；
+任何脚本完整扫描数据库时顺便刷新，list / 按标题查找直接读本地，不再请求 Notion
+"""
+
+import json
+import sqlite3
+import time
+
+from notion_api import page_properties
+from notion_cache import DEFAULT_CACHE_DIR
+
+INDEX_VERSION = 2
+
+SCHEMA = f'''
+DROP TABLE IF EXISTS posts;
+DROP TABLE IF EXISTS title_search;
+DROP TABLE IF EXISTS meta;
+CREATE TABLE posts (
+    page_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    date TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    last_edited_time TEXT
+);
+CREATE INDEX posts_date ON posts (date);
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+PRAGMA user_version = {INDEX_VERSION};
+'''
+
+# 标题的 trigram 全文索引（SQLite 3.34+）；外部内容表由触发器与 posts 保持同步
+FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE title_search USING fts5(title, content='posts', content_rowid='rowid', tokenize='trigram');
+CREATE TRIGGER posts_ai AFTER INSERT ON posts BEGIN
+    INSERT INTO title_search (rowid, title) VALUES (new.rowid, new.title);
+END;
+CREATE TRIGGER posts_ad AFTER DELETE ON posts BEGIN
+    INSERT INTO title_search (title_search, rowid, title) VALUES ('delete', old.rowid, old.title);
+END;
+CREATE TRIGGER posts_au AFTER UPDATE OF title ON posts BEGIN
+    INSERT INTO title_search (title_search, rowid, title) VALUES ('delete', old.rowid, old.title);
+    INSERT INTO title_search (rowid, title) VALUES (new.rowid, new.title);
+END;
+'''
+
+COLUMNS = ('page_id', 'title', 'status', 'date', 'tags', 'last_edited_time')
+
+
+class NotionIndex:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / "posts.sqlite3"
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != INDEX_VERSION:
+            self.conn.executescript(SCHEMA)
+            try:
+                self.conn.executescript(FTS_SCHEMA)
+            except sqlite3.OperationalError:
+                # 没有 FTS5 或 trigram 分词器时退回到 LIKE 查找
+                pass
+        self.has_fts = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'title_search'").fetchone() is not None
+
+    def close(self):
+        self.conn.close()
+
+    def _row(self, row):
+        post = dict(zip(COLUMNS, row))
+        post['tags'] = json.loads(post['tags'])
+        return post
+
+    def _upsert(self, pages):
+        rows = []
+        for page in pages:
+            meta = page_properties(page)
+            rows.append((meta['page_id'], meta['title'], meta['status'], meta['date'],
+                         json.dumps(meta['tags'], ensure_ascii=False), meta['last_edited_time']))
+        # ON CONFLICT 更新而不是 REPLACE：rowid 不变，标题没变时不用重写全文索引
+        self.conn.executemany('''
+            INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (page_id) DO UPDATE SET
+                title = excluded.title, status = excluded.status, date = excluded.date,
+                tags = excluded.tags, last_edited_time = excluded.last_edited_time
+            WHERE posts.last_edited_time IS NOT excluded.last_edited_time OR posts.status != excluded.status
+        ''', rows)
+        return len(rows)
+
+    def _mark_refreshed(self, key):
+        self.conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, str(time.time())))
+
+    def replace_all(self, pages):
+        """用一次完整扫描的结果更新索引：改动过的页面写入，扫描中已不存在的页面删除"""
+        page_ids = {page['id'] for page in pages}
+        with self.conn:
+            self._upsert(pages)
+            stale = [(page_id,) for (page_id,) in self.conn.execute('SELECT page_id FROM posts')
+                     if page_id not in page_ids]
+            self.conn.executemany('DELETE FROM posts WHERE page_id = ?', stale)
+            self._mark_refreshed('full_scan_at')
+            self._mark_refreshed('refreshed_at')
+        return len(stale)
+
+    def upsert(self, pages):
+        """增量刷新（只含上次之后编辑过的页面）的结果"""
+        with self.conn:
+            count = self._upsert(pages)
+            self._mark_refreshed('refreshed_at')
+        return count
+
+    def watermark(self):
+        """索引中最新的 last_edited_time，增量刷新从这里开始查询"""
+        return self.conn.execute('SELECT MAX(last_edited_time) FROM posts').fetchone()[0]
+
+    def refreshed_at(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def set_status(self, page_id, status):
+        with self.conn:
+            self.conn.execute('UPDATE posts SET status = ? WHERE page_id = ?', (status, page_id))
+
+    def remove(self, page_id):
+        with self.conn:
+            self.conn.execute('DELETE FROM posts WHERE page_id = ?', (page_id,))
+
+    def all_posts(self):
+        """全部页面，按日期从新到旧（与数据库查询的排序一致）"""
+        return [self._row(row) for row in self.conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM posts ORDER BY date DESC, title")]
+
+    def find_by_id_prefix(self, prefix):
+        """list 输出的 8 位 ID 前缀（不含连字符）对应的页面"""
+        return [self._row(row) for row in self.conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM posts WHERE REPLACE(page_id, '-', '') LIKE ? ESCAPE '\\' ORDER BY date DESC",
+            (prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%',))]
+
+    def search_titles(self, text):
+        """
+        标题包含 text 的页面（不区分大小写）。3 个字符以上走 trigram 全文索引，
+        更短的查询或没有 FTS5 时退回到 LIKE
+        """
+        columns = ', '.join(f'posts.{column}' for column in COLUMNS)
+        if self.has_fts and len(text) >= 3:
+            phrase = '"' + text.replace('"', '""') + '"'
+            rows = self.conn.execute(f'''
+                SELECT {columns} FROM title_search JOIN posts ON posts.rowid = title_search.rowid
+                WHERE title_search MATCH ? ORDER BY posts.date DESC, posts.title
+            ''', (phrase,))
+        else:
+            pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            rows = self.conn.execute(
+                f"SELECT {columns} FROM posts WHERE title LIKE ? ESCAPE '\\' ORDER BY date DESC, title", (pattern,))
+        return [self._row(row) for row in rows]
@@ -5,14 +5,23 @@ Syncs published articles from Notion database to blog markdown files
 """
 
 import os
-import requests
 import json
 import re
-from datetime import datetime
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from notion_api import BLOG_PROPERTIES, NotionClient, RateLimiter, page_properties
+from notion_assets import ASSET_BLOCK_TYPES, AssetDownloadError, AssetMirror, original_name
+from notion_cache import NotionCache, cached_block_tree
+from fingerprint_index import FingerprintIndex, comparable_text
+from notion_index import NotionIndex
 from simple_md_converter import SimpleBlogConverter
 
+def indent_lines(text, indent):
+    """给多行文本的每个非空行加上缩进"""
+    return '\n'.join(f'{indent}{line}' if line else line for line in text.split('\n'))
+
 def load_env_file():
     """Load environment variables from .env file"""
     env_path = Path(__file__).parent.parent.parent / '.env'
@@ -28,7 +37,10 @@ def load_env_file():
 load_env_file()
 
 class NotionBlogSync:
-    def __init__(self):
+    def __init__(self, max_workers=None, rate_limit=None, use_cache=True):
+        # 并发抓取页面内容的线程数与全局请求速率（req/s），可用环境变量覆盖
+        self.max_workers = max_workers or int(os.getenv('NOTION_SYNC_WORKERS', '4'))
+        self.rate_limit = rate_limit if rate_limit is not None else float(os.getenv('NOTION_RATE_LIMIT', '3'))
         self.notion_token = os.getenv('NOTION_TOKEN')
         self.database_id = os.getenv('NOTION_DATABASE_ID')
         
@@ -38,82 +50,38 @@ class NotionBlogSync:
             print("   export NOTION_DATABASE_ID='your_database_id'")
             return
             
-        self.headers = {
-            'Authorization': f'Bearer {self.notion_token}',
-            'Content-Type': 'application/json',
-            'Notion-Version': '2022-06-28'
-        }
+        self.client = NotionClient(
+            self.notion_token,
+            pool_size=max(10, self.max_workers),
+            rate_limiter=RateLimiter(self.rate_limit)
+        )
+        # 本地块树缓存（blog/.cache/notion），--no-cache 时禁用
+        self.cache = NotionCache() if use_cache else None
         
         self.blog_dir = Path(__file__).parent.parent
         self.markdown_dir = self.blog_dir / "markdown"
         self.markdown_dir.mkdir(exist_ok=True)
+        # Notion 中的图片 / 文件按内容哈希镜像到 blog/assets，文章里引用 ../assets/<哈希>.<扩展名>
+        self.assets_dir = self.blog_dir / "assets"
+        # 记录每个页面的 last_edited_time 与生成内容的哈希，用于增量同步
+        self.sync_state_path = self.blog_dir / ".sync-state.json"
         
         print(f"📁 博客目录: {self.blog_dir}")
         print(f"📝 Markdown目录: {self.markdown_dir}")
     
-    def query_published_posts(self):
-        """查询所有已发布的文章"""
-        url = f'https://api.notion.com/v1/databases/{self.database_id}/query'
-        payload = {
-            "filter": {
-                "property": "Status",
-                "select": {
-                    "equals": "Published"
-                }
-            },
-            "sorts": [
-                {
-                    "property": "Date",
-                    "direction": "descending"
-                }
-            ]
-        }
-        
-        try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            if response.status_code == 200:
-                results = response.json()['results']
-                print(f"📚 找到 {len(results)} 篇已发布文章")
-                return results
-            else:
-                print(f"❌ 查询Notion失败: {response.status_code}")
-                print(f"错误信息: {response.text}")
-                return []
-        except Exception as e:
-            print(f"❌ 连接Notion失败: {e}")
-            return []
-
     def query_all_posts(self):
-        """查询数据库中的全部条目（任意 Status），用于清理已改为 Draft 的本地文件"""
-        url = f'https://api.notion.com/v1/databases/{self.database_id}/query'
-        payload = {
-            "sorts": [
-                {"property": "Date", "direction": "descending"}
-            ],
-            "page_size": 100
-        }
-        results = []
-        start_cursor = None
-        try:
-            while True:
-                body = dict(payload)
-                if start_cursor:
-                    body["start_cursor"] = start_cursor
-                response = requests.post(url, headers=self.headers, json=body)
-                if response.status_code != 200:
-                    print(f"❌ 查询Notion(全部)失败: {response.status_code}")
-                    print(f"错误信息: {response.text}")
-                    return results
-                data = response.json()
-                results.extend(data.get("results", []))
-                if not data.get("has_more"):
-                    break
-                start_cursor = data.get("next_cursor")
-            print(f"📚 数据库共 {len(results)} 条（含 Draft 等）")
-            return results
-        except Exception as e:
-            print(f"❌ 连接Notion失败: {e}")
-            return []
+        """
+        单次分页扫描数据库中的全部条目（任意 Status），只取博客用到的属性。
+        Published/Draft 由调用方在本地区分；查询失败时抛出异常，避免用不完整的列表删除本地文章。
+        完整的扫描结果顺便刷新本地元数据索引（manage_notion_posts.py list 等直接读取）
+        """
+        sorts = [{"property": "Date", "direction": "descending"}]
+        results = list(self.client.iter_database(self.database_id, properties=BLOG_PROPERTIES, sorts=sorts))
+        print(f"📚 数据库共 {len(results)} 条（含 Draft 等）")
+        index = NotionIndex()
+        index.replace_all(results)
+        index.close()
+        return results
 
     def get_page_status_name(self, page):
         props = page.get("properties", {})
@@ -122,20 +90,42 @@ class NotionBlogSync:
             return st["select"]["name"]
         return None
 
-    def get_page_content(self, page_id):
-        """获取页面内容"""
-        url = f'https://api.notion.com/v1/blocks/{page_id}/children'
-        
+    def get_page_content(self, page_id, executor=None, last_edited_time=None):
+        """
+        流式获取页面内容（含分页与嵌套子块），逐个 yield (depth, block)。
+        给出 last_edited_time 时优先读本地缓存；
+        请求失败会在迭代中抛出 NotionAPIError，由调用方决定是否跳过这篇文章
+        """
+        return cached_block_tree(self.client, self.cache, page_id, last_edited_time, executor)
+
+    def render_page(self, page, executor=None, assets=None, known_assets=None):
+        """
+        抓取并转换一篇文章为 Markdown，返回 (markdown, 资源记录, 查重用的纯文本)；
+        assets 为 AssetMirror，known_assets 为上次同步记录的资源。失败时返回 None，避免把失败写成空文章
+        """
+        page_assets = assets.for_page(known_assets) if assets is not None else None
+        seen = []
+
+        def collect(blocks):
+            # 流式转换的同时留下块，转换完再提取查重文本，不需要第二次遍历 API
+            for depth, block in blocks:
+                seen.append(block)
+                yield depth, block
+
         try:
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                return response.json()['results']
-            else:
-                print(f"❌ 获取页面内容失败: {response.status_code}")
-                return []
+            blocks = self.get_page_content(page['id'], executor, page.get('last_edited_time'))
+            content = self.convert_notion_to_markdown(collect(blocks), page_assets)
+            records = page_assets.records if page_assets is not None else {}
+            return content, records, comparable_text(seen)
+        except AssetDownloadError as e:
+            print(f"❌ 资源下载失败: {e}")
+            # 缓存的块树里是过期的签名链接，丢掉它，下次同步重新向 Notion 取
+            if self.cache is not None:
+                self.cache.invalidate(page['id'])
+            return None
         except Exception as e:
             print(f"❌ 获取页面内容错误: {e}")
-            return []
+            return None
     
     def extract_rich_text(self, rich_text_array):
         """提取富文本内容"""
@@ -147,13 +137,13 @@ class NotionBlogSync:
             text = text_obj.get('text', {}).get('content', '')
             annotations = text_obj.get('annotations', {})
             
-            # 应用格式
+            # 应用格式；代码在最内层，行内代码中的内容原样输出，不能再包含 ** / *
+            if annotations.get('code'):
+                text = f'`{text}`'
             if annotations.get('bold'):
                 text = f'**{text}**'
             if annotations.get('italic'):
                 text = f'*{text}*'
-            if annotations.get('code'):
-                text = f'`{text}`'
             
             # 处理链接
             link = text_obj.get('text', {}).get('link')
@@ -165,109 +155,113 @@ class NotionBlogSync:
         
         return ''.join(result)
     
-    def convert_notion_to_markdown(self, blocks):
-        """将Notion块转换为Markdown"""
+    def plain_text(self, rich_text_array):
+        return ''.join(t.get('plain_text') or t.get('text', {}).get('content', '') for t in rich_text_array or [])
+
+    def asset_markdown(self, block_type, url, caption, fallback_name):
+        """图片输出为图片语法，视频输出 <video>，其他文件输出为链接"""
+        if block_type == 'image':
+            return f'![{caption}]({url})'
+        if block_type == 'video':
+            video = f'<video controls preload="metadata" src="{url}"></video>'
+            return f'{video}\n\n{caption}' if caption else video
+        return f'[{caption or fallback_name or block_type}]({url})'
+
+    def convert_notion_to_markdown(self, blocks, assets=None):
+        """
+        将Notion块转换为Markdown；blocks 为 (depth, block) 序列，可以是流式生成器。
+        给出 assets（AssetMirror.for_page）时，Notion 托管的文件边遍历边提交下载，
+        全部块转换完后再填入本地路径；未给出时保留原链接
+        """
         markdown_content = []
+        # (markdown_content 中的位置, 块类型, 说明, 原文件名, 缩进, 下载 Future)
+        pending = []
+        # 当前路径上每一层祖先是否为列表项
+        list_ancestors = []
         
-        for block in blocks:
+        for depth, block in blocks:
             block_type = block.get('type')
             block_data = block.get(block_type, {})
+            # 列表项的子块缩进 4 个空格，归入该列表项；toggle 的子块与 toggle 本身对齐
+            del list_ancestors[depth:]
+            indent = '    ' * sum(list_ancestors)
+            list_ancestors.append(block_type in ('bulleted_list_item', 'numbered_list_item'))
+            if indent and block_type not in ('bulleted_list_item', 'numbered_list_item') \
+                    and markdown_content and markdown_content[-1] != '':
+                # 列表项下的段落、引用等需要空一行，才是列表项中的新段落
+                markdown_content.append('')
             
-            if block_type == 'paragraph':
+            if block_type in ('paragraph', 'toggle'):
                 text = self.extract_rich_text(block_data.get('rich_text', []))
                 if text.strip():
-                    markdown_content.append(text)
+                    markdown_content.append(f'{indent}{text}')
                     markdown_content.append('')
             
             elif block_type == 'heading_1':
                 text = self.extract_rich_text(block_data.get('rich_text', []))
-                markdown_content.append(f'# {text}')
+                markdown_content.append(f'{indent}# {text}')
                 markdown_content.append('')
             
             elif block_type == 'heading_2':
                 text = self.extract_rich_text(block_data.get('rich_text', []))
-                markdown_content.append(f'## {text}')
+                markdown_content.append(f'{indent}## {text}')
                 markdown_content.append('')
             
             elif block_type == 'heading_3':
                 text = self.extract_rich_text(block_data.get('rich_text', []))
-                markdown_content.append(f'### {text}')
+                markdown_content.append(f'{indent}### {text}')
                 markdown_content.append('')
             
             elif block_type == 'bulleted_list_item':
                 text = self.extract_rich_text(block_data.get('rich_text', []))
-                markdown_content.append(f'- {text}')
+                markdown_content.append(f'{indent}- {text}')
             
             elif block_type == 'numbered_list_item':
                 text = self.extract_rich_text(block_data.get('rich_text', []))
-                markdown_content.append(f'1. {text}')
+                markdown_content.append(f'{indent}1. {text}')
             
             elif block_type == 'quote':
                 text = self.extract_rich_text(block_data.get('rich_text', []))
-                markdown_content.append(f'> {text}')
+                markdown_content.append(f'{indent}> {text}')
                 markdown_content.append('')
             
             elif block_type == 'code':
                 language = block_data.get('language', '')
                 text = self.extract_rich_text(block_data.get('rich_text', []))
-                markdown_content.append(f'```{language}')
-                markdown_content.append(text)
-                markdown_content.append('```')
+                markdown_content.append(f'{indent}```{language}')
+                markdown_content.append(indent_lines(text, indent))
+                markdown_content.append(f'{indent}```')
                 markdown_content.append('')
             
             elif block_type == 'divider':
-                markdown_content.append('---')
+                markdown_content.append(f'{indent}---')
                 markdown_content.append('')
+            
+            elif block_type in ASSET_BLOCK_TYPES:
+                hosting = block_data.get('type')
+                url = block_data.get(hosting, {}).get('url') if hosting in ('file', 'external') else None
+                if not url:
+                    continue
+                caption = self.plain_text(block_data.get('caption')).replace(']', '\\]')
+                name = block_data.get('name') or original_name(url)
+                if hosting == 'file' and assets is not None:
+                    pending.append((len(markdown_content), block_type, caption, name, indent,
+                                    assets.submit(block, url)))
+                    markdown_content.append(None)
+                else:
+                    markdown_content.append(indent_lines(self.asset_markdown(block_type, url, caption, name), indent))
+                markdown_content.append('')
+        
+        for index, block_type, caption, name, indent, future in pending:
+            # 下载失败时抛出 AssetDownloadError，整篇文章按抓取失败处理
+            local = f"../assets/{future.result()['name']}"
+            markdown_content[index] = indent_lines(self.asset_markdown(block_type, local, caption, name), indent)
         
         return '\n'.join(markdown_content)
     
     def extract_page_properties(self, page):
-        """提取页面属性"""
-        properties = page.get('properties', {})
-        
-        # 标题
-        title = "Untitled"
-        title_prop = properties.get('Title') or properties.get('Name')
-        if title_prop and title_prop.get('title'):
-            title = title_prop['title'][0]['text']['content']
-        
-        # 日期
-        date = datetime.now().strftime('%Y-%m-%d')
-        date_prop = properties.get('Date')
-        if date_prop and date_prop.get('date') and date_prop['date'].get('start'):
-            date = date_prop['date']['start']
-        
-        # 标签 - 尝试多种可能的字段名
-        tags = []
-        # 尝试常见的标签字段名
-        possible_tag_fields = ['Tags', 'Tag', 'tags', 'tag', 'Labels', 'Category', 'Categories']
-        
-        for field_name in possible_tag_fields:
-            tags_prop = properties.get(field_name)
-            if tags_prop:
-                if tags_prop.get('multi_select'):
-                    tags = [tag['name'] for tag in tags_prop['multi_select']]
-                    break
-                elif tags_prop.get('select') and tags_prop['select']:
-                    tags = [tags_prop['select']['name']]
-                    break
-                elif tags_prop.get('status') and tags_prop['status']:
-                    tags = [tags_prop['status']['name']]
-                    break
-        
-        # 摘要
-        summary = ""
-        summary_prop = properties.get('Summary')
-        if summary_prop and summary_prop.get('rich_text') and summary_prop['rich_text']:
-            summary = summary_prop['rich_text'][0]['text']['content']
-        
-        
-        return {
-            'title': title,
-            'date': date,
-            'tags': tags,
-            'summary': summary
-        }
+        """提取页面属性（标题、日期、标签、摘要等，见 notion_api.page_properties）"""
+        return page_properties(page)
     
     def create_filename(self, title):
         """创建URL友好的文件名"""
@@ -342,21 +336,151 @@ class NotionBlogSync:
             print(f"📭 共移除 {removed} 篇本地文章（与 Draft 等状态对齐）")
         return removed
 
-    def sync_posts(self):
-        """同步所有文章"""
+    def load_sync_state(self):
+        """读取上次同步的状态清单 {page_id: {last_edited_time, content_hash, filename}}"""
+        try:
+            with open(self.sync_state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('pages', {})
+        except (OSError, ValueError):
+            return {}
+
+    def save_sync_state(self, pages):
+        """保存状态清单；内容未变化时不改动文件"""
+        text = json.dumps({'version': 1, 'pages': pages}, ensure_ascii=False, indent=2, sort_keys=True) + '\n'
+        return self._write_if_changed(self.sync_state_path, text)
+
+    def _write_if_changed(self, path, text):
+        """仅当字节不同才写入，避免无意义地改动 mtime 与 git 状态"""
+        data = text.encode('utf-8')
+        try:
+            if path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        path.write_bytes(data)
+        return True
+
+    def _is_unchanged(self, post, state):
+        """页面自上次同步后未编辑，且本地文件仍是当时写入的内容、引用的资源文件都还在"""
+        if not state or state.get('last_edited_time') != post.get('last_edited_time'):
+            return False
+        if not all((self.assets_dir / record['name']).is_file() for record in state.get('assets', {}).values()):
+            return False
+        try:
+            data = (self.markdown_dir / state['filename']).read_bytes()
+        except (OSError, KeyError):
+            return False
+        return hashlib.sha256(data).hexdigest() == state.get('content_hash')
+
+    def warn_possible_duplicates(self, fingerprints, post, properties, text):
+        """新页面与指纹索引比对（只查 LSH 桶，与文章数量无关），疑似重复时提示，不阻止写入"""
+        matches = fingerprints.find_similar(post['id'], properties['title'], text)
+        for _, other_title, jaccard, title_similarity in matches[:3]:
+            print(f"⚠️  疑似重复: '{properties['title']}' 与 '{other_title}' "
+                  f"(内容相似度约 {jaccard:.0%}, 标题相似度 {title_similarity:.0%})")
+        if matches:
+            print("   💡 可运行 python3 scripts/cleanup_duplicates.py 检查并清理重复文章")
+        return matches
+
+    def remove_unreferenced_assets(self, previous_state, sync_state):
+        """
+        删除上次同步镜像过、但已没有任何文章引用的资源文件。
+        只看同步记录里的文件，手动放进 blog/assets 的图片不受影响
+        """
+        def names(state):
+            return {record['name'] for page in state.values() for record in page.get('assets', {}).values()}
+
+        removed = 0
+        for name in sorted(names(previous_state) - names(sync_state)):
+            path = self.assets_dir / name
+            if path.is_file():
+                path.unlink()
+                removed += 1
+                print(f"🗑  已移除不再引用的资源: {name}")
+        return removed
+
+    def _write_markdown_post(self, post, properties, content):
+        """
+        把一篇文章的内容转换为 Markdown，字节有变化时才写入。
+        成功返回 (filename, content_hash, written)，失败返回 None
+        """
+        try:
+            print(f"📄 处理文章: {properties['title']}")
+            
+            if content is None:
+                print(f"⚠️  跳过（内容获取失败，保留本地文件）: {properties['title']}")
+                return None
+            
+            # 创建文件名
+            filename = self.create_filename(properties['title'])
+            
+            # 如果没有摘要，从内容中生成
+            if not properties['summary'] and content:
+                # 提取纯文本用于摘要
+                clean_content = re.sub(r'[#*`>\[\]()]', '', content)
+                clean_content = ' '.join(clean_content.split())
+                properties['summary'] = clean_content[:150] + "..." if len(clean_content) > 150 else clean_content
+            
+            # 生成前置信息（notion_page_id 用于下次同步时删除已下线文章）
+            tags_str = ', '.join(properties['tags']) if properties['tags'] else 'Personal'
+            page_id = post['id']
+            frontmatter = f"""---
+title: {properties['title']}
+date: {properties['date']}
+tags: {tags_str}
+summary: {properties['summary']}
+filename: {filename.replace('.md', '')}
+notion_page_id: {page_id}
+---
+
+"""
+            
+            # 组合完整内容
+            full_content = frontmatter + content
+            
+            # 写入文件（内容相同则不动）
+            file_path = self.markdown_dir / filename
+            written = self._write_if_changed(file_path, full_content)
+            content_hash = hashlib.sha256(full_content.encode('utf-8')).hexdigest()
+            
+            if written:
+                print(f"✅ 同步成功: {filename}")
+            else:
+                print(f"⏭  内容未变化: {filename}")
+            return filename, content_hash, written
+            
+        except Exception as e:
+            print(f"❌ 同步文章失败: {e}")
+            return None
+
+    def sync_posts(self, full=False):
+        """
+        同步所有文章；默认只重新抓取自上次同步后编辑过的页面，full=True 时全量重新抓取。
+        上次的同步状态总会读取：改名清理与资源记录在全量同步时同样需要它
+        """
         if not self.notion_token or not self.database_id:
             return
             
         print("🔄 开始从Notion同步文章...")
-        posts = self.query_published_posts()
+        try:
+            all_pages = self.query_all_posts()
+        except Exception as e:
+            print(f"❌ 查询Notion失败: {e}")
+            return
+        posts = [p for p in all_pages if self.get_page_status_name(p) == 'Published']
         published_ids = {p['id'] for p in posts}
-        all_pages = self.query_all_posts()
+        print(f"📚 找到 {len(posts)} 篇已发布文章")
 
         if not posts:
             print("📝 当前没有 Status=Published 的文章")
         
         synced_count = 0
+        # 全量同步只是不跳过未修改的页面；上次的文件名和资源记录照常使用，
+        # 标题改动留下的旧文件能被移除，文件 id 与 last_edited_time 都没变的资源不必重新下载
+        known_state = self.load_sync_state()
+        sync_state = {}
         
+        entries = []
         for post in posts:
             try:
                 # 提取属性
@@ -365,55 +489,74 @@ class NotionBlogSync:
                 if not properties['title'] or properties['title'] == "Untitled":
                     print(f"⚠️  跳过无标题文章")
                     continue
-                
-                print(f"📄 处理文章: {properties['title']}")
-                
-                # 获取内容
-                blocks = self.get_page_content(post['id'])
-                content = self.convert_notion_to_markdown(blocks)
-                
-                # 创建文件名
-                filename = self.create_filename(properties['title'])
-                
-                # 如果没有摘要，从内容中生成
-                if not properties['summary'] and content:
-                    # 提取纯文本用于摘要
-                    clean_content = re.sub(r'[#*`>\[\]()]', '', content)
-                    clean_content = ' '.join(clean_content.split())
-                    properties['summary'] = clean_content[:150] + "..." if len(clean_content) > 150 else clean_content
-                
-                # 生成前置信息（notion_page_id 用于下次同步时删除已下线文章）
-                tags_str = ', '.join(properties['tags']) if properties['tags'] else 'Personal'
-                page_id = post['id']
-                frontmatter = f"""---
-title: {properties['title']}
-date: {properties['date']}
-tags: {tags_str}
-summary: {properties['summary']}
-filename: {filename.replace('.md', '')}
-notion_page_id: {page_id}
----
 
-"""
-                
-                # 组合完整内容
-                full_content = frontmatter + content
-                
-                # 写入文件
-                file_path = self.markdown_dir / filename
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(full_content)
-                
-                print(f"✅ 同步成功: {filename}")
-                synced_count += 1
-                
+                state = known_state.get(post['id'])
+                if not full and self._is_unchanged(post, state):
+                    sync_state[post['id']] = state
+                    continue
+                entries.append((post, properties))
             except Exception as e:
                 print(f"❌ 同步文章失败: {e}")
-                continue
 
-        self.remove_unpublished_local_files(published_ids, all_pages)
+        unchanged_count = len(sync_state)
+        if unchanged_count:
+            print(f"⏭  {unchanged_count} 篇文章自上次同步后未修改，跳过抓取")
+
+        # 每篇文章在工作线程中流式抓取并转换（共享同一个限速器），但按原顺序写入，保证输出确定；
+        # 子块预取使用独立的线程池；资源文件由 AssetMirror 自己的有界线程池下载。
+        # 首次发布的页面先与指纹索引比对，疑似重复时在写入前提示
+        fingerprints = FingerprintIndex()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as block_pool, \
+                AssetMirror(self.assets_dir) as assets:
+            rendered = pool.map(
+                lambda entry: self.render_page(
+                    entry[0], block_pool, assets, known_state.get(entry[0]['id'], {}).get('assets')),
+                entries)
+            for (post, properties), page in zip(entries, rendered):
+                content, page_assets, text = page if page is not None else (None, {}, None)
+                if text is not None and post['id'] not in known_state:
+                    self.warn_possible_duplicates(fingerprints, post, properties, text)
+                result = self._write_markdown_post(post, properties, content)
+                if result is None:
+                    # 抓取失败时保留旧状态，下次再试
+                    if post['id'] in known_state:
+                        sync_state[post['id']] = dict(known_state[post['id']], last_edited_time=None)
+                    continue
+                filename, content_hash, written = result
+                old_filename = known_state.get(post['id'], {}).get('filename')
+                if old_filename and old_filename != filename:
+                    # 标题改动导致文件名变化，移除旧文件避免重复文章
+                    (self.markdown_dir / old_filename).unlink(missing_ok=True)
+                    written = True
+                    print(f"🗑  已移除旧文件名: {old_filename}")
+                sync_state[post['id']] = {
+                    'last_edited_time': post.get('last_edited_time'),
+                    'content_hash': content_hash,
+                    'filename': filename
+                }
+                if page_assets:
+                    sync_state[post['id']]['assets'] = page_assets
+                if post.get('last_edited_time'):
+                    fingerprints.update(post['id'], post['last_edited_time'], properties['title'], text)
+                if written:
+                    synced_count += 1
+        fingerprints.close()
+
+        if assets.downloaded or assets.deduplicated or assets.skipped:
+            print(f"🖼  资源文件: 下载 {assets.downloaded} 个（{assets.bytes_written / 1024:.0f} KB），"
+                  f"与已有文件相同 {assets.deduplicated} 个，未修改跳过 {assets.skipped} 个")
+        removed_count = self.remove_unreferenced_assets(known_state, sync_state)
+        removed_count += self.remove_unpublished_local_files(published_ids, all_pages)
+        state_changed = self.save_sync_state(sync_state)
         
         print(f"\n🎉 同步完成! 共写入 {synced_count} 篇 Published 文章")
+        if self.cache is not None and (self.cache.hits or self.cache.misses):
+            print(f"🗄  缓存命中 {self.cache.hits} 篇，从 Notion 抓取 {self.cache.misses} 篇")
+        
+        if not (synced_count or removed_count or state_changed):
+            print("📭 Notion 中没有变化，跳过构建")
+            return
         
         print("🔨 正在构建博客...")
         self.build_blog()
@@ -438,11 +581,13 @@ notion_page_id: {page_id}
             print(f"❌ 构建博客时出错: {e}")
 
 def main():
+    import sys
+    
     print("🚀 Notion博客同步工具")
     print("=" * 50)
     
-    sync = NotionBlogSync()
-    sync.sync_posts()
+    sync = NotionBlogSync(use_cache='--no-cache' not in sys.argv)
+    sync.sync_posts(full='--full' in sys.argv)
 
 if __name__ == "__main__":
     main()
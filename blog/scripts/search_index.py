@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Build-time full-text search index for Joyce's Blog
+Posts are tokenized into Latin words plus CJK bigrams; postings are delta-encoded and
+sharded by term prefix under blog/search/, so the browser only downloads the shards a query touches.
+"""
+
+import re
+import json
+import shutil
+import sqlite3
+from collections import Counter
+from itertools import accumulate
+from operator import add
+
+# Latin words, or runs of CJK / kana / hangul; blog-script.js tokenizes queries with the same pattern
+TOKEN_PATTERN = re.compile(
+    r'([a-z0-9]+)|([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+)'
+)
+
+# Markdown that should not be indexed as words
+FENCE_BLOCK_PATTERN = re.compile(r'^```.*?^```', re.DOTALL | re.MULTILINE)
+LINK_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^\)]*\)')
+
+# A hit in the title counts more than one in the body
+FIELD_WEIGHTS = {'title': 8, 'tags': 4, 'summary': 2, 'body': 1}
+
+DOCS_PER_CHUNK = 200
+CJK_SHARDS = 64
+INDEX_VERSION = 2
+
+
+def tokenize(text):
+    """Lower-cased Latin words (2+ chars) and CJK bigrams; a lone CJK character is kept as is"""
+    tokens = []
+    for latin, cjk in TOKEN_PATTERN.findall(text.lower()):
+        if latin:
+            if len(latin) > 1:
+                tokens.append(latin)
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(map(add, cjk, cjk[1:]))
+    return tokens
+
+
+def shard_key(term):
+    """
+    Latin terms shard on their first two letters. CJK terms shard on their first character,
+    folded into CJK_SHARDS buckets so thousands of distinct characters don't mean thousands of files
+    """
+    if term[0] < '\u0080':
+        return term[:2]
+    return f"cjk-{ord(term[0]) % CJK_SHARDS:02x}"
+
+
+def document_terms(title, tags, summary, body):
+    """Weighted term frequencies for one post"""
+    if '```' in body:
+        body = FENCE_BLOCK_PATTERN.sub(' ', body)
+    if '](' in body:
+        body = LINK_PATTERN.sub(r'\1', body)
+    weights = Counter()
+    for field, text in (('title', title), ('tags', ' '.join(tags)), ('summary', summary), ('body', body)):
+        weight = FIELD_WEIGHTS[field]
+        for term, count in Counter(tokenize(text)).items():
+            weights[term] += count * weight
+    return dict(weights)
+
+
+def encode_postings(postings):
+    """{doc_id: weight} → flat delta-encoded list [Δdoc, weight, Δdoc, weight, ...] in doc id order"""
+    doc_ids = sorted(postings)
+    encoded = [0] * (2 * len(doc_ids))
+    encoded[0::2] = map(int.__sub__, doc_ids, [0] + doc_ids[:-1])
+    encoded[1::2] = map(postings.__getitem__, doc_ids)
+    return encoded
+
+
+def decode_postings(encoded):
+    return dict(zip(accumulate(encoded[0::2]), encoded[1::2]))
+
+
+class SearchIndexBuilder:
+    """
+    Maintains blog/search incrementally. Every post keeps a stable doc id (recorded in the cache
+    with its term weights), so a changed post only rewrites the term shards and the doc chunk it
+    touches; the rest of the index is left as it is on disk.
+    """
+
+    def __init__(self, converter):
+        self.converter = converter
+        self.retokenized_count = 0
+        # md file → {source_hash, doc_id, doc}; loaded once and kept in memory for watch-mode rebuilds.
+        # Term weights stay in SQLite and are only read back for posts that changed.
+        self.cache = None
+        self._conn = None
+
+    @property
+    def output_dir(self):
+        return self.converter.blog_dir / "search"
+
+    @property
+    def cache_path(self):
+        return self.converter.blog_dir / ".cache" / "search-terms.sqlite3"
+
+    def connect(self):
+        if self._conn is None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_path)
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] != INDEX_VERSION:
+                self._conn.executescript(f'''
+                    DROP TABLE IF EXISTS posts;
+                    CREATE TABLE posts (
+                        md_name TEXT PRIMARY KEY,
+                        source_hash TEXT NOT NULL,
+                        doc_id INTEGER NOT NULL,
+                        doc TEXT NOT NULL,
+                        terms TEXT NOT NULL
+                    );
+                    PRAGMA user_version = {INDEX_VERSION};
+                ''')
+        return self._conn
+
+    def load_cache(self):
+        rows = self.connect().execute('SELECT md_name, source_hash, doc_id, doc FROM posts')
+        return {
+            md_name: {'source_hash': source_hash, 'doc_id': doc_id, 'doc': json.loads(doc)}
+            for md_name, source_hash, doc_id, doc in rows
+        }
+
+    def cached_terms(self, md_name):
+        row = self.connect().execute('SELECT terms FROM posts WHERE md_name = ?', (md_name,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def tokenize_post(self, md_name, entry):
+        with open(self.converter.markdown_dir / md_name, 'r', encoding='utf-8') as f:
+            metadata, body = self.converter.parse_frontmatter(f.read())
+        article = entry['article']
+        self.retokenized_count += 1
+        return document_terms(article['title'], article['tags'], metadata.get('summary', ''), body)
+
+    def update(self, articles, manifest):
+        """
+        Bring blog/search in line with the converter's build manifest and return the number of indexed posts.
+        articles (newest first) fixes the doc id order on a full rebuild: newer posts get higher ids,
+        which the client uses to break score ties.
+        """
+        if self.cache is None:
+            self.cache = self.load_cache()
+        cache = self.cache
+        conn = self.connect()
+        self.retokenized_count = 0
+
+        # Without the previous index on disk the cache can't be patched against; start over
+        if not cache or not (self.output_dir / "meta.json").exists():
+            cache.clear()
+            with conn:
+                conn.execute('DELETE FROM posts')
+            shutil.rmtree(self.output_dir, ignore_errors=True)
+
+        changed_terms = {}   # shard key → {term: {doc_id: weight, or None to drop the posting}}
+        changed_docs = {}    # doc id → doc record, or None for a freed slot
+        deleted_rows = []
+        updated_rows = []
+        for md_name in set(cache) - set(manifest):
+            removed = cache.pop(md_name)
+            self.stage_terms(changed_terms, removed['doc_id'], self.cached_terms(md_name), None)
+            changed_docs[removed['doc_id']] = None
+            deleted_rows.append((md_name,))
+
+        used_ids = {cached['doc_id'] for cached in cache.values()}
+        free_ids = (doc_id for doc_id in range(len(used_ids) + len(manifest) + 1) if doc_id not in used_ids)
+
+        # Oldest first, so new posts take the highest ids
+        order = {article['filename']: position for position, article in enumerate(articles)}
+        names = sorted(manifest, key=lambda name: -order.get(manifest[name]['article']['filename'], -1))
+        for md_name in names:
+            entry = manifest[md_name]
+            article = entry['article']
+            doc = [article['title'], f"posts/{article['filename']}", article['date_iso'], article['summary']]
+            cached = cache.get(md_name)
+            if cached and cached['source_hash'] == entry['source_hash'] and cached['doc'] == doc:
+                continue
+
+            terms = self.tokenize_post(md_name, entry)
+            if cached:
+                doc_id = cached['doc_id']
+                self.stage_terms(changed_terms, doc_id, self.cached_terms(md_name), None)
+            else:
+                doc_id = next(free_ids)
+            self.stage_terms(changed_terms, doc_id, terms, terms)
+            changed_docs[doc_id] = doc
+            cache[md_name] = {'source_hash': entry['source_hash'], 'doc_id': doc_id, 'doc': doc}
+            updated_rows.append((md_name, entry['source_hash'], doc_id,
+                                 json.dumps(doc, ensure_ascii=False), json.dumps(terms, ensure_ascii=False)))
+
+        if changed_terms or changed_docs or not (self.output_dir / "meta.json").exists():
+            self.write_shards(changed_terms)
+            self.write_docs(changed_docs)
+            self.write_meta(len(cache), max((cached['doc_id'] for cached in cache.values()), default=-1) + 1)
+            # Committed after the shards: if interrupted in between, replaying the same change is harmless
+            with conn:
+                conn.executemany('DELETE FROM posts WHERE md_name = ?', deleted_rows)
+                conn.executemany('INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?)', updated_rows)
+        return len(cache)
+
+    def stage_terms(self, changed_terms, doc_id, terms, weights):
+        """Record doc_id's new weight for each term (weights=None drops its postings)"""
+        for term in terms:
+            postings = changed_terms.setdefault(shard_key(term), {}).setdefault(term, {})
+            postings[doc_id] = weights[term] if weights is not None else None
+
+    def write_shards(self, changed_terms):
+        """Patch only the term shards that changed; everything else stays as it is on disk"""
+        terms_dir = self.output_dir / "terms"
+        terms_dir.mkdir(parents=True, exist_ok=True)
+        for key, updates in changed_terms.items():
+            path = terms_dir / f"{key}.json"
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    shard = json.load(f)
+            except OSError:
+                shard = {}
+            for term, changes in updates.items():
+                postings = decode_postings(shard.get(term, []))
+                for doc_id, weight in changes.items():
+                    if weight is None:
+                        postings.pop(doc_id, None)
+                    else:
+                        postings[doc_id] = weight
+                if postings:
+                    shard[term] = encode_postings(postings)
+                else:
+                    shard.pop(term, None)
+            if shard:
+                text = json.dumps(dict(sorted(shard.items())), ensure_ascii=False, separators=(',', ':')) + '\n'
+                self.converter.write_if_changed(path, text)
+            else:
+                path.unlink(missing_ok=True)
+
+    def write_docs(self, changed_docs):
+        """Patch the doc chunks holding changed doc ids ([title, url, date, summary] per slot)"""
+        docs_dir = self.output_dir / "docs"
+        docs_dir.mkdir(parents=True, exist_ok=True)
+        chunks = {}
+        for doc_id, doc in changed_docs.items():
+            chunks.setdefault(doc_id // DOCS_PER_CHUNK, {})[doc_id % DOCS_PER_CHUNK] = doc
+        for chunk, updates in chunks.items():
+            path = docs_dir / f"{chunk}.json"
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    docs = json.load(f)
+            except OSError:
+                docs = []
+            for offset, doc in updates.items():
+                docs.extend([None] * (offset + 1 - len(docs)))
+                docs[offset] = doc
+            # Free slots at the end of a chunk don't need to be stored
+            while docs and docs[-1] is None:
+                docs.pop()
+            if docs:
+                self.converter.write_if_changed(path, json.dumps(docs, ensure_ascii=False, separators=(',', ':')) + '\n')
+            else:
+                path.unlink(missing_ok=True)
+
+    def write_meta(self, doc_count, doc_id_limit):
+        shards = sorted(path.stem for path in (self.output_dir / "terms").glob('*.json'))
+        meta = {
+            'version': INDEX_VERSION,
+            'docs': doc_count,
+            'doc_ids': doc_id_limit,
+            'docs_per_chunk': DOCS_PER_CHUNK,
+            'shards': shards,
+        }
+        self.converter.write_if_changed(self.output_dir / "meta.json",
+                                        json.dumps(meta, ensure_ascii=False, separators=(',', ':')) + '\n')
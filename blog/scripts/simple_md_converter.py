@@ -6,20 +6,100 @@ No external dependencies required - uses only Python standard library
 
 import os
 import re
+import io
+import sys
 import json
-from datetime import datetime
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from html import escape as html_escape
 from pathlib import Path
 
+import build_trace
+from build_trace import span
+from feeds import FEED_FULL_CONTENT, FEED_ITEMS, FeedBuilder
+from listing_pages import ListingPagesBuilder, tag_slug
+from search_index import SearchIndexBuilder
+from template_engine import load_template
+
+# convert_image.py (responsive image manifests) lives at the site root
+SITE_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(SITE_ROOT) not in sys.path:
+    sys.path.append(str(SITE_ROOT))
+import convert_image
+
+# Posts on blog/index.html; older posts go to page/2/, page/3/, ... with a JSON shard each
+POSTS_PER_PAGE = int(os.getenv('BLOG_POSTS_PER_PAGE', '10'))
+
+# Article images are at most the width of the 800px content column
+ARTICLE_IMAGE_SIZES = '(max-width: 800px) 100vw, 800px'
+
+# A post's date: the leading YYYY-MM-DD of its frontmatter value (Notion datetimes included) or file name
+DATE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+# Block patterns, matched once per line
+HEADING_PATTERN = re.compile(r'(#{1,3}) (.*)')
+ORDERED_ITEM_PATTERN = re.compile(r'\d+\. ')
+FENCE_PATTERN = re.compile(r'```([^`]*)$')
+
+# Inline spans; alternatives are listed in the order the original regex passes ran
+# (bold, italic, links, code) so overlapping markup resolves the same way.
+# '***' (bold italic) is tried first, otherwise '**' would take two of its stars.
+# Images come just before links, so the '!' is not left behind as text.
+# A single '*' only opens or closes italics when it is not half of a '**' pair.
+INLINE_PATTERN = re.compile(
+    r'\*\*\*(?P<strong_em>[^*].*?)\*\*\*'
+    r'|\*\*(?P<strong>.*?)\*\*'
+    r'|(?<!\*)\*(?!\*)(?P<em>(?:[^*]|\*\*[^*]*?\*\*)*?)(?<!\*)\*(?!\*)'
+    r'|!\[(?P<alt>[^\]]*)\]\((?P<src>[^\)\s]+)(?:\s+"[^"]*")?\)'
+    r'|\[(?P<text>[^\]]+)\]\((?P<href>[^\)]+)\)'
+    r'|`(?P<code>[^`]+)`'
+)
+
+def parse_post_date(value, md_name):
+    """
+    Resolve a post's date from its frontmatter value, else from a YYYY-MM-DD in its file name.
+    Never the clock: a post without a usable date gets SOURCE_DATE_EPOCH (or 1970-01-01),
+    so the generated HTML, index and feed don't change from one build to the next.
+    """
+    for candidate in (value, md_name):
+        match = DATE_PATTERN.search(str(candidate or ''))
+        if match:
+            try:
+                return datetime.strptime(match.group(1), '%Y-%m-%d')
+            except ValueError:
+                pass
+    fallback = datetime.fromtimestamp(int(os.getenv('SOURCE_DATE_EPOCH', '0')), timezone.utc)
+    print(f"⚠️  {md_name}: missing or invalid date {value!r}, using {fallback:%Y-%m-%d}")
+    return datetime(fallback.year, fallback.month, fallback.day)
+
+
 class SimpleBlogConverter:
-    def __init__(self):
+    def __init__(self, feed_items=FEED_ITEMS, feed_full_content=FEED_FULL_CONTENT):
         self.blog_dir = Path(__file__).parent.parent
         self.markdown_dir = self.blog_dir / "markdown"
         self.posts_dir = self.blog_dir / "posts"
+        self.template_path = self.blog_dir / "templates" / "article-template.html"
         
         # Ensure directories exist
         self.posts_dir.mkdir(exist_ok=True)
         self.markdown_dir.mkdir(exist_ok=True)
         
+        # Maps each markdown file to its source hash, converter version and output hash
+        # (kept with the Notion cache under blog/.cache, which is git-ignored)
+        self.manifest_path = self.blog_dir / ".cache" / "build-manifest.json"
+        self.rebuilt_count = 0
+        self.skipped_count = 0
+        # Manifest entries of the last build, kept in memory for watch-mode rebuilds
+        self.manifest = {}
+        self.posts_per_page = POSTS_PER_PAGE
+        self.pages_dir = self.blog_dir / "page"
+        self.search_index = SearchIndexBuilder(self)
+        self.listing_pages = ListingPagesBuilder(self)
+        self.feeds = FeedBuilder(self, item_count=feed_items, full_content=feed_full_content)
+        
     def parse_frontmatter(self, content):
         """Parse simple frontmatter from markdown content"""
         if content.startswith('---'):
@@ -62,79 +142,90 @@ class SimpleBlogConverter:
         return {}, content
     
     def simple_markdown_to_html(self, markdown_text):
-        """Convert basic markdown to HTML using regex"""
-        html = markdown_text
-        
-        # Headers
-        html = re.sub(r'^### (.*$)', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-        html = re.sub(r'^## (.*$)', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-        html = re.sub(r'^# (.*$)', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-        
-        # Bold and italic
-        html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
-        html = re.sub(r'\*(.*?)\*', r'<em>\1</em>', html)
-        
-        # Links
-        html = re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', r'<a href="\2">\1</a>', html)
-        
-        # Code blocks
-        html = re.sub(r'```(.*?)```', r'<pre><code>\1</code></pre>', html, flags=re.DOTALL)
-        html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)
-        
-        # Blockquotes
-        html = re.sub(r'^> (.*$)', r'<blockquote><p>\1</p></blockquote>', html, flags=re.MULTILINE)
-        
-        # Lists
-        lines = html.split('\n')
-        in_ul = False
-        in_ol = False
-        result_lines = []
+        """
+        Convert basic markdown to HTML in a single pass over the lines.
+        Blocks (headings, quotes, lists, code fences, paragraphs) are recognised line by line
+        and inline spans are rendered by one precompiled scan per line, so the cost is linear
+        in the document size. Code fences are emitted verbatim (HTML-escaped), never formatted.
+        """
+        chunks = []      # paragraph chunks, separated by blank lines
+        chunk = []       # lines of the current chunk
+        list_tag = None  # 'ul' / 'ol' while inside a list
+        lines = iter(markdown_text.split('\n'))
         
         for line in lines:
             stripped = line.strip()
             
-            # Unordered lists
+            fence = FENCE_PATTERN.match(stripped)
+            if fence:
+                # Collect the fenced block up to the closing fence as its own chunk;
+                # a fence nested under a list item drops the item's indentation
+                fence_indent = ' ' * (len(line) - len(line.lstrip(' ')))
+                code_lines = []
+                for code_line in lines:
+                    if code_line.strip().startswith('```'):
+                        break
+                    if fence_indent and code_line.startswith(fence_indent):
+                        code_line = code_line[len(fence_indent):]
+                    code_lines.append(code_line)
+                if list_tag:
+                    chunk.append(f'</{list_tag}>')
+                    list_tag = None
+                if chunk:
+                    chunks.append(chunk)
+                    chunk = []
+                language = fence.group(1).strip()
+                class_attr = f' class="language-{html_escape(language)}"' if language else ''
+                code = html_escape('\n'.join(code_lines), quote=False)
+                chunks.append([f'<pre><code{class_attr}>{code}</code></pre>'])
+                continue
+            
             if stripped.startswith('- '):
-                if not in_ul:
-                    result_lines.append('<ul>')
-                    in_ul = True
-                if in_ol:
-                    result_lines.append('</ol>')
-                    in_ol = False
-                result_lines.append(f'<li>{stripped[2:]}</li>')
-            # Ordered lists
-            elif re.match(r'^\d+\. ', stripped):
-                if not in_ol:
-                    result_lines.append('<ol>')
-                    in_ol = True
-                if in_ul:
-                    result_lines.append('</ul>')
-                    in_ul = False
-                content = re.sub(r'^\d+\. ', '', stripped)
-                result_lines.append(f'<li>{content}</li>')
+                item_tag = 'ul'
+                item = stripped[2:]
             else:
-                if in_ul:
-                    result_lines.append('</ul>')
-                    in_ul = False
-                if in_ol:
-                    result_lines.append('</ol>')
-                    in_ol = False
-                result_lines.append(line)
-        
-        # Close any open lists
-        if in_ul:
-            result_lines.append('</ul>')
-        if in_ol:
-            result_lines.append('</ol>')
-        
-        html = '\n'.join(result_lines)
-        
-        # Paragraphs (simple approach)
-        paragraphs = html.split('\n\n')
-        html_paragraphs = []
+                ordered = ORDERED_ITEM_PATTERN.match(stripped)
+                item_tag = 'ol' if ordered else None
+                item = stripped[ordered.end():] if ordered else None
+            
+            if item_tag:
+                if list_tag != item_tag:
+                    if list_tag:
+                        chunk.append(f'</{list_tag}>')
+                    chunk.append(f'<{item_tag}>')
+                    list_tag = item_tag
+                chunk.append(f'<li>{self.render_inline(item)}</li>')
+                continue
+            
+            if list_tag:
+                chunk.append(f'</{list_tag}>')
+                list_tag = None
+            
+            if not line:
+                # Blank line ends the current paragraph chunk
+                if chunk:
+                    chunks.append(chunk)
+                    chunk = []
+                continue
+            
+            heading = HEADING_PATTERN.match(stripped)
+            if heading:
+                level = len(heading.group(1))
+                chunk.append(f'<h{level}>{self.render_inline(heading.group(2))}</h{level}>')
+            elif stripped.startswith('> '):
+                chunk.append(f'<blockquote><p>{self.render_inline(stripped[2:])}</p></blockquote>')
+            else:
+                chunk.append(self.render_inline(line))
         
-        for para in paragraphs:
-            para = para.strip()
+        if list_tag:
+            chunk.append(f'</{list_tag}>')
+        if chunk:
+            chunks.append(chunk)
+        
+        # Paragraphs: wrap chunks that do not already start with a tag
+        html_paragraphs = []
+        for chunk in chunks:
+            para = '\n'.join(chunk).strip()
             if para and not para.startswith('<'):
                 html_paragraphs.append(f'<p>{para}</p>')
             elif para:
@@ -142,6 +233,41 @@ class SimpleBlogConverter:
         
         return '\n\n'.join(html_paragraphs)
     
+    def render_inline(self, text):
+        """
+        Render bold, italic, images, links and inline code in one left-to-right scan.
+        Code spans are emitted verbatim (HTML-escaped), never formatted.
+        """
+        if '*' not in text and '[' not in text and '`' not in text:
+            return text
+        return INLINE_PATTERN.sub(self._render_inline_match, text)
+    
+    def _render_inline_match(self, match):
+        kind = match.lastgroup
+        if kind == 'strong_em':
+            return f'<strong><em>{self.render_inline(match.group("strong_em"))}</em></strong>'
+        if kind == 'strong':
+            return f'<strong>{self.render_inline(match.group("strong"))}</strong>'
+        if kind == 'em':
+            return f'<em>{self.render_inline(match.group("em"))}</em>'
+        if kind == 'href':
+            return f'<a href="{match.group("href")}">{self.render_inline(match.group("text"))}</a>'
+        if kind == 'src':
+            return self.render_image(match.group('alt'), match.group('src'))
+        return f'<code>{html_escape(match.group("code"), quote=False)}</code>'
+    
+    def render_image(self, alt, src):
+        """<picture> with WebP/JPEG srcsets when convert_image.py has variants of src (relative to posts/), else <img>"""
+        alt = html_escape(alt)
+        # Small images stay a plain <img>; they are inlined as data URIs once the page is rendered
+        if ('://' not in src and not src.startswith(('/', 'data:'))
+                and convert_image.small_image_data_uri(self.posts_dir / src) is None):
+            root, entry = convert_image.lookup(self.posts_dir / src)
+            if entry:
+                prefix = os.path.relpath(root / convert_image.RESPONSIVE_DIR, self.posts_dir).replace(os.sep, '/') + '/'
+                return convert_image.picture_html(entry, prefix, ARTICLE_IMAGE_SIZES, f' alt="{alt}" loading="lazy"')
+        return f'<img src="{src}" alt="{alt}" loading="lazy">'
+    
     def calculate_reading_time(self, content):
         """Calculate reading time based on word count"""
         word_count = len(content.split())
@@ -154,31 +280,32 @@ class SimpleBlogConverter:
         filename = re.sub(r'[-\s]+', '-', filename)
         return f"{filename}.html"
     
-    def convert_markdown_file(self, md_file_path):
-        """Convert a single markdown file to HTML"""
-        with open(md_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def convert_markdown_file(self, md_file_path, images=None):
+        """
+        Convert a single markdown file to HTML.
+        images, if given, collects the local files the page references (see convert_image.inline_signature).
+        """
+        with span('read'):
+            with open(md_file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
         
         # Parse frontmatter
-        metadata, markdown_content = self.parse_frontmatter(content)
+        with span('frontmatter'):
+            metadata, markdown_content = self.parse_frontmatter(content)
         
         # Extract metadata with defaults
         title = metadata.get('title', 'Untitled')
-        date_str = metadata.get('date', datetime.now().strftime('%Y-%m-%d'))
         tags = metadata.get('tags', [])
         summary = metadata.get('summary', '')
         
-        # Convert date
-        try:
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            date_iso = date_obj.strftime('%Y-%m-%d')
-            date_formatted = date_obj.strftime('%B %d, %Y')
-        except:
-            date_iso = datetime.now().strftime('%Y-%m-%d')
-            date_formatted = datetime.now().strftime('%B %d, %Y')
+        # Convert date (taken from the post itself, never from the build time)
+        date_obj = parse_post_date(metadata.get('date'), md_file_path.name)
+        date_iso = date_obj.strftime('%Y-%m-%d')
+        date_formatted = date_obj.strftime('%B %d, %Y')
         
         # Convert markdown to HTML
-        html_content = self.simple_markdown_to_html(markdown_content)
+        with span('render'):
+            html_content = self.simple_markdown_to_html(markdown_content)
         
         # Calculate reading time
         reading_time = self.calculate_reading_time(markdown_content)
@@ -186,7 +313,7 @@ class SimpleBlogConverter:
         # Generate tags HTML
         tags_html = ""
         if tags:
-            tag_elements = [f'<span class="tag">{tag}</span>' for tag in tags]
+            tag_elements = [f'<a class="tag" href="../tags/{tag_slug(tag)}/">{tag}</a>' for tag in tags]
             tags_html = '\n                        '.join(tag_elements)
         
         # Create filename
@@ -194,80 +321,26 @@ class SimpleBlogConverter:
         if not filename.endswith('.html'):
             filename += '.html'
         
-        # HTML template
-        html_template = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - Joyce's Blog</title>
-    <link rel="stylesheet" href="../blog-styles.css">
-    <link rel="stylesheet" href="../templates/article-styles.css">
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap" rel="stylesheet">
-</head>
-<body>
-    <div class="container">
-        <!-- Header -->
-        <header class="header">
-            <div class="nav">
-                <a href="../../" class="site-title">Back to Joyce's Playground</a>
-                <div class="nav-links">
-                    <a href="../" class="nav-link">Home</a>
-                    <a href="#archives" class="nav-link">Archives</a>
-                    <a href="#tags" class="nav-link">Tags</a>
-                </div>
-            </div>
-        </header>
-
-        <!-- Article Content -->
-        <main class="main">
-            <article class="article">
-                <!-- Article Header -->
-                <header class="article-header">
-                    <h1 class="article-title">{title}</h1>
-                    <div class="article-meta">
-                        <time datetime="{date_iso}">{date_formatted}</time>
-                        <span class="reading-time">{reading_time} min</span>
-                        <span class="author">Joyce Gu</span>
-                    </div>
-                    <div class="article-tags">
-                        {tags_html}
-                    </div>
-                </header>
-
-                <!-- Article Content -->
-                <div class="article-content">
-                    {html_content}
-                </div>
-
-                <!-- Article Footer -->
-                <footer class="article-footer">
-                    <div class="article-navigation">
-                        <a href="../" class="nav-prev">← Back to Blog</a>
-                        <a href="#" class="nav-next">Next Article →</a>
-                    </div>
-                    
-                    <div class="article-share">
-                        <p>Share this article:</p>
-                        <div class="share-buttons">
-                            <a href="https://twitter.com/intent/tweet?text={title}&url=https://joycegu.github.io/CuriousBuild/blog/posts/{filename}" class="share-button" target="_blank">Twitter</a>
-                            <a href="https://www.linkedin.com/sharing/share-offsite/?url=https://joycegu.github.io/CuriousBuild/blog/posts/{filename}" class="share-button" target="_blank">LinkedIn</a>
-                            <a href="#" class="share-button" onclick="navigator.clipboard.writeText(window.location.href); alert('Link copied to clipboard!')">Copy Link</a>
-                        </div>
-                    </div>
-                </footer>
-            </article>
-        </main>
-    </div>
-
-    <script src="../blog-script.js"></script>
-</body>
-</html>'''
-        
-        # Write HTML file
+        # Render the article template (compiled once, reloaded only when the file changes)
+        with span('template'):
+            html_template = load_template(self.template_path).render({
+                'ARTICLE_TITLE': title,
+                'ARTICLE_DATE': date_iso,
+                'ARTICLE_DATE_FORMATTED': date_formatted,
+                'READING_TIME': reading_time,
+                'ARTICLE_TAGS': tags_html,
+                'ARTICLE_CONTENT': html_content,
+                'ARTICLE_URL': f"https://joycegu.github.io/CuriousBuild/blog/posts/{filename}",
+            })
+        
+        # Inline small local images (src="..." and CSS url(...)) to save a request each
+        with span('inline'):
+            html_template = convert_image.inline_small_images(html_template, self.posts_dir, references=images)
+        
+        # Write HTML file (left untouched when the bytes are identical)
         output_path = self.posts_dir / filename
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_template)
+        with span('write'):
+            self.write_if_changed(output_path, html_template)
         
         print(f"✅ Converted: {md_file_path.name} → {filename}")
         
@@ -281,23 +354,146 @@ class SimpleBlogConverter:
             'summary': summary or f"{markdown_content[:150]}..." if len(markdown_content) > 150 else markdown_content,
         }
     
-    def convert_all_markdown(self):
-        """Convert all markdown files"""
+    def converter_version(self):
+        """Hash of the converter and image pipeline sources, article template and image manifests; any change invalidates the manifest"""
+        digest = hashlib.sha256(Path(__file__).read_bytes())
+        digest.update(self.template_path.read_bytes())
+        # Image markup depends on convert_image.py itself, the responsive variants available and the inlining threshold
+        digest.update(Path(convert_image.__file__).read_bytes())
+        digest.update(str(convert_image.INLINE_IMAGE_BYTES).encode('utf-8'))
+        for root in convert_image.IMAGE_ROOTS:
+            manifest_path = root / convert_image.RESPONSIVE_DIR / convert_image.MANIFEST_NAME
+            if manifest_path.exists():
+                digest.update(manifest_path.read_bytes())
+        return digest.hexdigest()[:16]
+    
+    def load_build_manifest(self):
+        """Load the build manifest, or an empty one if missing or written by another converter version"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != self.converter_version():
+            return {}
+        return manifest.get('files', {})
+    
+    def save_build_manifest(self, files):
+        """Save the build manifest (sorted and timestamp-free, so it only changes when inputs do)"""
+        manifest = {'version': self.converter_version(), 'files': files}
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        # Compact separators keep json on its C encoder; indent=2 is several times slower on large blogs
+        text = json.dumps(manifest, ensure_ascii=False, separators=(',', ':'), sort_keys=True) + '\n'
+        self.write_if_changed(self.manifest_path, text)
+    
+    def write_if_changed(self, path, text):
+        """Write text to path only if the bytes differ; returns True when the file was written"""
+        data = text.encode('utf-8')
+        try:
+            if path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        path.write_bytes(data)
+        return True
+    
+    def build_post(self, md_file, source_hash):
+        """Render one post and return its manifest entry"""
+        with span('post', file=md_file.name):
+            images = {}
+            article_info = self.convert_markdown_file(md_file, images)
+            output_path = self.posts_dir / article_info['filename']
+            return {
+                'source_hash': source_hash,
+                'output_hash': hashlib.sha256(output_path.read_bytes()).hexdigest(),
+                'article': article_info,
+                # Inlined small images end up in the HTML, so their bytes are inputs of the post too
+                'images': images,
+            }
+    
+    def is_fresh(self, entry, source_hash):
+        """Whether a manifest entry still matches its markdown source, output file and referenced images"""
+        return bool(entry and entry['source_hash'] == source_hash
+                    and (self.posts_dir / entry['article']['filename']).exists()
+                    and all(convert_image.inline_signature(self.posts_dir / ref) == signature
+                            for ref, signature in entry.get('images', {}).items()))
+    
+    def render_posts(self, md_files, jobs=1):
+        """
+        Render md_files, a list of (markdown file, source hash), in order, yielding (entry, error) per file.
+        With jobs > 1 the posts are rendered in a process pool; each worker's console output
+        is replayed here in file order, so the log reads the same as a serial build.
+        """
+        if jobs <= 1 or len(md_files) <= 1:
+            for md_file, source_hash in md_files:
+                try:
+                    yield self.build_post(md_file, source_hash), None
+                except Exception as e:
+                    yield None, e
+            return
+        
+        chunksize = max(1, len(md_files) // (jobs * 4))
+        # Each worker sets up one converter (pointed at this converter's directories) and reuses it;
+        # workers record spans too when tracing is on, shipped back with each result
+        paths = (self.blog_dir, self.markdown_dir, self.posts_dir, self.template_path)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(paths, build_trace.is_enabled())) as pool:
+            results = pool.map(_build_post_in_worker, md_files, chunksize=chunksize)
+            for entry, log, error, events in results:
+                print(log, end='')
+                build_trace.merge(events)
+                yield entry, error
+    
+    def convert_all_markdown(self, force=False, jobs=1):
+        """
+        Convert all markdown files, skipping those unchanged since the last build unless force is set.
+        jobs > 1 renders the changed posts in parallel; results are merged back in sorted order.
+        """
         md_files = list(self.markdown_dir.glob('*.md'))
         if not md_files:
             print(f"📝 No markdown files found in {self.markdown_dir}")
             return []
         
+        manifest = {} if force else self.load_build_manifest()
+        new_manifest = {}
+        self.rebuilt_count = 0
+        self.skipped_count = 0
+        
+        # Decide what is stale first, so all stale posts can be handed to the renderer at once
+        plan = []
+        with span('plan', files=len(md_files)):
+            for md_file in sorted(md_files):
+                try:
+                    source_hash = hashlib.sha256(md_file.read_bytes()).hexdigest()
+                except Exception as e:
+                    print(f"❌ Error converting {md_file.name}: {e}")
+                    continue
+                entry = manifest.get(md_file.name)
+                if not self.is_fresh(entry, source_hash):
+                    entry = None
+                plan.append((md_file, source_hash, entry))
+        
+        rendered = self.render_posts([(md_file, source_hash) for md_file, source_hash, entry in plan
+                                      if entry is None], jobs)
+        
         articles = []
         active_html = set()
-        for md_file in sorted(md_files):
-            try:
-                article_info = self.convert_markdown_file(md_file)
-                articles.append(article_info)
-                active_html.add(article_info['filename'])
-            except Exception as e:
-                print(f"❌ Error converting {md_file.name}: {e}")
-
+        for md_file, source_hash, entry in plan:
+            if entry is None:
+                entry, error = next(rendered)
+                if error is not None:
+                    print(f"❌ Error converting {md_file.name}: {error}")
+                    continue
+                self.rebuilt_count += 1
+            else:
+                self.skipped_count += 1
+            new_manifest[md_file.name] = entry
+            articles.append(entry['article'])
+            active_html.add(entry['article']['filename'])
+        
+        with span('manifest'):
+            self.save_build_manifest(new_manifest)
+        self.manifest = new_manifest
         for html_path in list(self.posts_dir.glob('*.html')):
             if html_path.name not in active_html:
                 html_path.unlink(missing_ok=True)
@@ -305,18 +501,92 @@ class SimpleBlogConverter:
         
         return articles
     
-    def update_blog_index(self, articles):
-        """Update the blog index with articles"""
+    def update_changed_markdown(self, changed, removed=()):
+        """
+        Re-render only the changed markdown files on top of the last build's manifest (watch mode).
+        Removed files drop their HTML; a post that fails to render keeps its previous output.
+        Returns the full article list, ready for update_blog_index.
+        """
+        for md_file in sorted(removed):
+            entry = self.manifest.pop(md_file.name, None)
+            if entry:
+                (self.posts_dir / entry['article']['filename']).unlink(missing_ok=True)
+                print(f"🗑 Removed: {md_file.name} → {entry['article']['filename']}")
+        
+        for md_file in sorted(changed):
+            try:
+                source_hash = hashlib.sha256(md_file.read_bytes()).hexdigest()
+                previous = self.manifest.get(md_file.name)
+                if self.is_fresh(previous, source_hash):
+                    continue
+                entry = self.build_post(md_file, source_hash)
+            except Exception as e:
+                print(f"❌ Error converting {md_file.name}: {e}")
+                continue
+            if previous and previous['article']['filename'] != entry['article']['filename']:
+                (self.posts_dir / previous['article']['filename']).unlink(missing_ok=True)
+            self.manifest[md_file.name] = entry
+        
+        with span('manifest'):
+            self.save_build_manifest(self.manifest)
+        return [self.manifest[name]['article'] for name in sorted(self.manifest)]
+    
+    def update_blog_index(self, articles, search=True):
+        """
+        Update the blog index with the newest posts and paginate the rest.
+        blog/index.html only ever holds posts_per_page posts; page N (N >= 2) is written to
+        page/N/index.html for readers without JavaScript and page/N/posts.json for lazy loading.
+        The feeds, the tag and archive pages and (unless search is False) the search index
+        are refreshed as well.
+        """
         if not articles:
             return
         
-        # Sort articles by date (newest first)
-        articles.sort(key=lambda x: x['date_iso'], reverse=True)
-        
-        # Generate article items HTML
-        articles_html = []
-        for article in articles:
-            article_html = f'''                <article class="post-item">
+        with span('index', articles=len(articles)):
+            # Sort articles by date (newest first)
+            articles.sort(key=lambda x: x['date_iso'], reverse=True)
+            pages = [articles[i:i + self.posts_per_page] for i in range(0, len(articles), self.posts_per_page)]
+            
+            # Read current blog index
+            blog_index_path = self.blog_dir / "index.html"
+            with open(blog_index_path, 'r', encoding='utf-8') as f:
+                current_content = f.read()
+            
+            index_content = self.splice_posts_section(current_content, pages, 1)
+            self.write_if_changed(blog_index_path, index_content)
+            self.write_index_pages(index_content, pages)
+        
+        if len(pages) > 1:
+            print(f"✅ Updated blog index with {len(pages[0])} of {len(articles)} articles ({len(pages)} pages)")
+        else:
+            print(f"✅ Updated blog index with {len(articles)} articles")
+        
+        # RSS, Atom and JSON Feed
+        with span('feeds'):
+            items = self.feeds.update(articles)
+        print(f"✅ Generated RSS, Atom and JSON feeds with {items} articles "
+              f"({self.feeds.rendered_count} re-rendered)")
+        
+        with span('listings'):
+            tag_count, month_count = self.listing_pages.update(articles)
+        print(f"✅ Updated tag and archive pages: {tag_count} tags, {month_count} months "
+              f"({self.listing_pages.rendered_count} re-rendered)")
+        
+        if search:
+            self.update_search_index(articles)
+    
+    def update_search_index(self, articles):
+        """Patch blog/search for the posts changed since the last build (see search_index.py)"""
+        if not self.manifest:
+            return
+        with span('search'):
+            indexed = self.search_index.update(articles, self.manifest)
+        print(f"✅ Updated search index with {indexed} articles "
+              f"({self.search_index.retokenized_count} re-tokenized)")
+    
+    def render_post_item(self, article):
+        """HTML for one post in an index listing"""
+        return f'''                <article class="post-item">
                     <div class="post-content">
                         <h3 class="post-title">
                             <a href="posts/{article['filename']}">{article['title']}</a>
@@ -329,99 +599,102 @@ class SimpleBlogConverter:
                         <span class="author">Joyce Gu</span>
                     </div>
                 </article>'''
-            articles_html.append(article_html)
-        
-        # Read current blog index
-        blog_index_path = self.blog_dir / "index.html"
-        with open(blog_index_path, 'r', encoding='utf-8') as f:
-            current_content = f.read()
-        
-        # Replace the posts section
-        posts_section = '\n'.join(articles_html)
+    
+    def render_pagination(self, number, page_count):
+        """Newer / older links under a listing; links are relative to blog/ (page shells set <base>)"""
+        if page_count <= 1:
+            return ''
+        links = []
+        if number > 1:
+            newer = './' if number == 2 else f'page/{number - 1}/'
+            links.append(f'                    <a class="pagination-newer" href="{newer}">← Newer posts</a>')
+        links.append(f'                    <span class="pagination-status">Page {number} of {page_count}</span>')
+        if number < page_count:
+            links.append(f'                    <a class="pagination-older" href="page/{number + 1}/">Older posts →</a>')
+        return '                <nav class="pagination">\n' + '\n'.join(links) + '\n                </nav>\n'
+    
+    def splice_posts_section(self, content, pages, number):
+        """Replace the <!-- Posts List --> section of content with page `number` of the listing"""
+        posts_section = '\n'.join(self.render_post_item(article) for article in pages[number - 1])
+        # The listing page tells blog-script.js where the next shard lives
+        next_shard = f' data-next-shard="page/{number + 1}/posts.json"' if number < len(pages) else ''
         new_posts_section = f'''            <!-- Posts List -->
-            <section class="posts">
+            <section class="posts"{next_shard}>
 {posts_section}
-            </section>'''
-        
-        # Update the blog index
-        pattern = r'<!-- Posts List -->.*?</section>'
-        updated_content = re.sub(pattern, new_posts_section, current_content, flags=re.DOTALL)
-        
-        with open(blog_index_path, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
-        
-        print(f"✅ Updated blog index with {len(articles)} articles")
-        
-        # Generate RSS feed
-        self.generate_rss_feed(articles)
+{self.render_pagination(number, len(pages))}            </section>'''
+        
+        # Splice with str.find rather than a lazy DOTALL regex: on a large index the
+        # regex walks the old posts section character by character
+        start = content.find('<!-- Posts List -->')
+        end = content.find('</section>', start) if start != -1 else -1
+        if end == -1:
+            return content
+        # Replace from the start of the marker's line, so its indentation doesn't pile up on every build
+        start = content.rfind('\n', 0, start) + 1
+        end += len('</section>')
+        return content[:start] + new_posts_section + content[end:]
+    
+    def write_index_pages(self, index_content, pages):
+        """Write page/N/index.html and page/N/posts.json for pages 2..N and drop pages that no longer exist"""
+        # Page shells reuse the index chrome; <base> keeps its relative links pointing at blog/
+        shell = index_content.replace('<head>', '<head>\n    <base href="../../">', 1)
+        for number in range(2, len(pages) + 1):
+            page_dir = self.pages_dir / str(number)
+            page_dir.mkdir(parents=True, exist_ok=True)
+            page_html = self.splice_posts_section(shell, pages, number)
+            page_html = page_html.replace('</title>', f' - Page {number}</title>', 1)
+            self.write_if_changed(page_dir / "index.html", page_html)
+            
+            shard = {
+                'page': number,
+                'pages': len(pages),
+                'next': f"page/{number + 1}/posts.json" if number < len(pages) else None,
+                'posts': [
+                    {
+                        'title': article['title'],
+                        'url': f"posts/{article['filename']}",
+                        'date': article['date_iso'],
+                        'date_formatted': article['date_formatted'],
+                        'reading_time': article['reading_time'],
+                        'summary': article['summary'],
+                    }
+                    for article in pages[number - 1]
+                ],
+            }
+            self.write_if_changed(page_dir / "posts.json",
+                                  json.dumps(shard, ensure_ascii=False, separators=(',', ':')) + '\n')
+        
+        if self.pages_dir.exists():
+            for page_dir in self.pages_dir.iterdir():
+                if page_dir.is_dir() and not (page_dir.name.isdigit() and 2 <= int(page_dir.name) <= len(pages)):
+                    shutil.rmtree(page_dir)
+            if not any(self.pages_dir.iterdir()):
+                self.pages_dir.rmdir()
 
-    def generate_rss_feed(self, articles):
-        """Generate RSS feed for the blog"""
-        from email.utils import formatdate
-        import time
-        
-        # Sort articles by date (newest first)
-        sorted_articles = sorted(articles, key=lambda x: x['date_iso'], reverse=True)
-        
-        # Take only the latest 10 articles for RSS
-        recent_articles = sorted_articles[:10]
-        
-        # RSS template
-        rss_template = '''<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
-    <channel>
-        <title>Joyce's Digital Garden</title>
-        <link>https://joycegu.github.io/CuriousBuild/blog/</link>
-        <description>Thoughts, discoveries, and adventures in technology, growth, and life insights.</description>
-        <language>en-us</language>
-        <lastBuildDate>{last_build_date}</lastBuildDate>
-        <atom:link href="https://joycegu.github.io/CuriousBuild/blog/feed.xml" rel="self" type="application/rss+xml"/>
-        <generator>Joyce's Blog Generator</generator>
-        <webMaster>joyce@example.com (Joyce Gu)</webMaster>
-        <managingEditor>joyce@example.com (Joyce Gu)</managingEditor>
-        <ttl>1440</ttl>
-{items}
-    </channel>
-</rss>'''
+# The converter of a render_posts worker process, set up once by _init_worker
+_worker_converter = None
 
-        # Generate RSS items
-        items = []
-        for article in recent_articles:
-            # Convert date to RFC 822 format
-            try:
-                article_date = datetime.strptime(article['date_iso'], '%Y-%m-%d')
-                pub_date = formatdate(time.mktime(article_date.timetuple()))
-            except:
-                pub_date = formatdate()
-            
-            # Clean summary for RSS (remove HTML if any)
-            clean_summary = article['summary'].replace('<', '&lt;').replace('>', '&gt;')
-            
-            item = f'''        <item>
-            <title><![CDATA[{article['title']}]]></title>
-            <link>https://joycegu.github.io/CuriousBuild/blog/posts/{article['filename']}</link>
-            <guid>https://joycegu.github.io/CuriousBuild/blog/posts/{article['filename']}</guid>
-            <description><![CDATA[{clean_summary}]]></description>
-            <pubDate>{pub_date}</pubDate>
-            <author>joyce@example.com (Joyce Gu)</author>
-        </item>'''
-            items.append(item)
-        
-        # Current timestamp for lastBuildDate
-        last_build_date = formatdate()
-        
-        # Generate final RSS content
-        rss_content = rss_template.format(
-            last_build_date=last_build_date,
-            items='\n'.join(items)
-        )
-        
-        # Write RSS file
-        rss_path = self.blog_dir / "feed.xml"
-        with open(rss_path, 'w', encoding='utf-8') as f:
-            f.write(rss_content)
-        
-        print(f"✅ Generated RSS feed with {len(recent_articles)} articles")
+def _init_worker(paths, trace):
+    """Process-pool initializer: build the worker's converter once instead of once per post"""
+    global _worker_converter
+    if trace:
+        build_trace.enable()
+    _worker_converter = SimpleBlogConverter()
+    (_worker_converter.blog_dir, _worker_converter.markdown_dir,
+     _worker_converter.posts_dir, _worker_converter.template_path) = paths
+
+def _build_post_in_worker(task):
+    """Process-pool entry point: render one post, capturing its console output and spans for the parent"""
+    md_file, source_hash = task
+    log = io.StringIO()
+    with redirect_stdout(log):
+        try:
+            entry = _worker_converter.build_post(md_file, source_hash)
+            error = None
+        except Exception as e:
+            entry = None
+            error = str(e)
+    return entry, log.getvalue(), error, build_trace.drain()
 
 def main():
     converter = SimpleBlogConverter()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Minimal template engine for Joyce's Blog
+Templates use the [PLACEHOLDER] slots documented in templates/HOW-TO-CREATE-ARTICLES.md
+"""
+
+import re
+from pathlib import Path
+
+SLOT_PATTERN = re.compile(r'\[([A-Z][A-Z_]*)\]')
+
+# path -> (mtime_ns, Template); a template is recompiled only when its file changes
+_template_cache = {}
+
+
+class Template:
+    def __init__(self, source):
+        """Compile source once into alternating literal / slot segments"""
+        pieces = SLOT_PATTERN.split(source)
+        self.parts = pieces[:]
+        # Odd positions hold slot names; remember where each one goes
+        self.slots = [(index, pieces[index]) for index in range(1, len(pieces), 2)]
+        self.slot_names = {name for _, name in self.slots}
+
+    def render(self, values):
+        """Fill every slot from values and join the segments in one pass"""
+        parts = self.parts[:]
+        for index, name in self.slots:
+            parts[index] = str(values[name])
+        return ''.join(parts)
+
+
+def load_template(path):
+    """Return the compiled template at path, recompiling only if its mtime changed"""
+    path = Path(path)
+    mtime = path.stat().st_mtime_ns
+    cached = _template_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    template = Template(path.read_text(encoding='utf-8'))
+    _template_cache[path] = (mtime, template)
+    return template
@@ -65,8 +65,9 @@ def main():
         return
     
     try:
-        sync = NotionBlogSync()
-        sync.sync_posts()
+        # --no-cache 不使用本地块树缓存；--full 忽略同步状态清单，重新抓取全部文章
+        sync = NotionBlogSync(use_cache='--no-cache' not in sys.argv)
+        sync.sync_posts(full='--full' in sys.argv)
         
         print("\n" + "=" * 50)
         print("✨ 同步完成!")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for inlining small images as data URIs
+Run with: python3 -m unittest discover blog/tests
+"""
+
+import struct
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import convert_image
+
+
+def tiny_png():
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    header = struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(b'\x00\xff\x00\x00')) + chunk(b'IEND', b''))
+
+
+class InlineSmallImagesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        (self.base / 'icon.png').write_bytes(tiny_png())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def inline(self, text, **kwargs):
+        return convert_image.inline_small_images(text, self.base, threshold=4096, **kwargs)
+
+    def test_img_and_css_are_inlined(self):
+        html = self.inline('<img alt="x" src="icon.png"><div style="background: url(icon.png)"></div>'
+                           '<style>.a { background: url("icon.png") }</style>')
+        self.assertEqual(html.count('data:image/png;base64,'), 3)
+        self.assertNotIn('icon.png', html)
+
+    def test_code_and_prose_are_left_alone(self):
+        text = ('<p>Use url(icon.png) or src="icon.png" in prose.</p>'
+                '<code>background: url(icon.png)</code>'
+                '<pre><code class="language-html">&lt;img src="icon.png"&gt;\n<img src="icon.png"></code></pre>'
+                '<script src="icon.png"></script>')
+        self.assertEqual(self.inline(text), text)
+
+    def test_stylesheet(self):
+        css = self.inline('.a { background: url(icon.png) }', css=True)
+        self.assertIn('url(data:image/png;base64,', css)
+
+    def test_references(self):
+        references = {}
+        self.inline('<img src="icon.png"><img src="missing.png"><code>url(other.png)</code>', references=references)
+        self.assertEqual(set(references), {'icon.png', 'missing.png'})
+        self.assertIsNone(references['missing.png'])
+
+
+if __name__ == '__main__':
+    unittest.main()
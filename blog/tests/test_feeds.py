@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for the feed helpers
+Run with: python3 -m unittest discover blog/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import convert_image
+from feeds import absolute_urls
+
+BASE = 'https://joycegu.github.io/CuriousBuild/blog/posts/post.html'
+RESPONSIVE = 'https://joycegu.github.io/CuriousBuild/blog/assets/responsive/'
+
+
+class AbsoluteUrlsTest(unittest.TestCase):
+    def test_picture_srcset_and_src(self):
+        entry = {
+            'width': 960, 'height': 480,
+            'webp': [(480, 'a-480w.webp'), (960, 'a-960w.webp')],
+            'jpeg': [(480, 'a-480w.jpg'), (960, 'a-960w.jpg')],
+        }
+        html = absolute_urls(convert_image.picture_html(entry, '../assets/responsive/'), BASE)
+        self.assertIn(f'srcset="{RESPONSIVE}a-480w.webp 480w, {RESPONSIVE}a-960w.webp 960w"', html)
+        self.assertIn(f'srcset="{RESPONSIVE}a-480w.jpg 480w, {RESPONSIVE}a-960w.jpg 960w"', html)
+        self.assertIn(f'src="{RESPONSIVE}a-960w.jpg"', html)
+        self.assertNotIn('../', html)
+
+    def test_links_and_absolute_urls(self):
+        html = absolute_urls('<a href="other.html">x</a> <img src="https://example.com/a.png">', BASE)
+        self.assertEqual(html, '<a href="https://joycegu.github.io/CuriousBuild/blog/posts/other.html">x</a> '
+                               '<img src="https://example.com/a.png">')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the inline renderer of SimpleBlogConverter
+Run with: python3 -m unittest discover blog/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from simple_md_converter import SimpleBlogConverter
+
+
+class RenderInlineTest(unittest.TestCase):
+    def setUp(self):
+        self.converter = SimpleBlogConverter()
+
+    def render(self, text):
+        return self.converter.render_inline(text)
+
+    def test_bold_italic(self):
+        self.assertEqual(self.render('***x***'), '<strong><em>x</em></strong>')
+        self.assertEqual(self.render('a ***b c*** d'), 'a <strong><em>b c</em></strong> d')
+
+    def test_bold_and_italic_still_render(self):
+        self.assertEqual(self.render('**a** and *b*'), '<strong>a</strong> and <em>b</em>')
+        self.assertEqual(self.render('*a **b** c*'), '<em>a <strong>b</strong> c</em>')
+
+    def test_code_span_is_verbatim(self):
+        self.assertEqual(self.render('`a*b*c`'), '<code>a*b*c</code>')
+        self.assertEqual(self.render('`**x**` and **y**'), '<code>**x**</code> and <strong>y</strong>')
+        self.assertEqual(self.render('`[a](b)`'), '<code>[a](b)</code>')
+
+    def test_code_span_is_escaped(self):
+        self.assertEqual(self.render('`<div> & x`'), '<code>&lt;div&gt; &amp; x</code>')
+
+
+
+class NestedBlockTest(unittest.TestCase):
+    def test_indented_children_keep_their_block_type(self):
+        html = SimpleBlogConverter().simple_markdown_to_html(
+            '- item\n\n    > quote\n\n    ```python\n    x = 1\n        y = 2\n    ```\n'
+        )
+        self.assertIn('<blockquote><p>quote</p></blockquote>', html)
+        self.assertIn('<pre><code class="language-python">x = 1\n    y = 2</code></pre>', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
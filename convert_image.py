@@ -1,23 +1,131 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+"""
+图片工具：单张图片转 base64 data URI（直接编码原始字节，按文件头识别类型），
+以及批量生成响应式图片（python convert_image.py --responsive）
+响应式模式为 images/ 和 blog/assets/ 中的图片生成多种宽度的 WebP / JPEG，文件名带内容哈希；
+manifest.json 记录每张原图的哈希，未修改的图片不会重新处理。Pillow 只在真正处理图片时才导入。
+"""
+
+import argparse
 import base64
+import hashlib
+import itertools
+import json
 import os
-import sys
-from PIL import Image
+import re
 import io
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SITE_ROOT = Path(__file__).resolve().parent
+# 处理这些目录下的图片；结果写到各自的 responsive/ 子目录
+IMAGE_ROOTS = [SITE_ROOT / "images", SITE_ROOT / "blog" / "assets"]
+RESPONSIVE_DIR = "responsive"
+MANIFEST_NAME = "manifest.json"
+
+SOURCE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.webp'}
+# 目标宽度；不超过原图宽度，原图比最大宽度窄时保留原宽度
+RESPONSIVE_WIDTHS = (480, 960, 1440, 1920)
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+# 编码参数变化时改这个版本号，让所有图片重新生成（它也参与文件名哈希）
+PIPELINE_VERSION = 1
+
+# <!-- responsive images/image.png alt="..." sizes="..." --> ... <!-- /responsive -->
+MARKER_PATTERN = re.compile(
+    r'(?P<open><!-- responsive (?P<src>\S+)(?P<attrs>[^>]*?) -->)(?P<body>.*?)(?P<close><!-- /responsive -->)',
+    re.DOTALL
+)
+
+# (manifest 路径) -> (mtime_ns, manifest)；构建时每篇文章都会查询，只在文件变化时重新读取
+_manifest_cache = {}
+
+# 流式 base64 每块读取的字节数；3 的倍数，块与块之间不会产生填充
+BASE64_CHUNK = 3 * 64 * 1024
+
+# 文件头 → MIME 类型（按文件内容判断，不看扩展名）
+MIME_SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'BM', 'image/bmp'),
+    (b'\x00\x00\x01\x00', 'image/x-icon'),
+]
+
+# 构建时小于这个字节数的本地图片直接以 data URI 内联进文章（0 表示不内联）
+INLINE_IMAGE_BYTES = int(os.getenv('BLOG_INLINE_IMAGE_BYTES', '4096'))
+
+# 文章 HTML 中引用本地图片的位置：<img> 的 src，以及 CSS（<style> 块、style 属性）里的 url(...)。
+# 模式都以固定字符串开头，正则引擎可以直接跳到候选位置，而不是逐字符尝试
+IMG_SRC_PATTERN = re.compile(r'(<img\b[^>]*?\s)src="([^"]+)"', re.IGNORECASE)
+CSS_URL_PATTERN = re.compile(r'url\((\s*)([\'"]?)([^\'")]+)\2(\s*)\)')
+STYLE_BLOCK_PATTERN = re.compile(r'(<style\b[^>]*>)(.*?)(</style>)', re.IGNORECASE | re.DOTALL)
+STYLE_ATTR_PATTERN = re.compile(r'(\sstyle=")([^"]*)(")', re.IGNORECASE)
+# <pre> / <code> 里是文章正文（代码示例），其中的 src= 和 url(...) 原样保留
+VERBATIM_PATTERN = re.compile(r'<(pre|code)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+
+# (路径, mtime_ns, 大小) -> data URI；同一个小图标在每篇文章里只编码一次
+_data_uri_cache = {}
+
 
-def image_to_base64(image_path):
+def sniff_mime(header):
+    """根据文件开头的字节判断图片类型；不是图片时返回 None"""
+    for signature, mime_type in MIME_SIGNATURES:
+        if header.startswith(signature):
+            return mime_type
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'image/webp'
+    if header[4:12] in (b'ftypavif', b'ftypavis'):
+        return 'image/avif'
+    text = header.lstrip(b'\xef\xbb\xbf \t\r\n')
+    if (text.startswith(b'<svg') or text.startswith(b'<?xml')) and b'<svg' in header:
+        return 'image/svg+xml'
+    return None
+
+
+def iter_data_uri(image_path):
+    """
+    逐块生成图片的 data URI：原始字节经 mmap 分块 base64，不解码、不重新编码，
+    内存中只有当前这一块。不是可识别的图片时抛出 ValueError
     """
-    将图片文件转换为base64编码
+    import mmap
+
+    with open(image_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        header = f.read(1024)
+        mime_type = sniff_mime(header)
+        if mime_type is None:
+            raise ValueError(f"无法识别的图片格式: {image_path}")
+        yield f"data:{mime_type};base64,"
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            try:
+                for offset in range(0, size, BASE64_CHUNK):
+                    yield base64.b64encode(view[offset:offset + BASE64_CHUNK]).decode('ascii')
+            finally:
+                view.release()
+
+
+def image_to_base64(image_path, reencode=False):
+    """
+    将图片文件转换为base64编码的 data URI
     
     参数:
         image_path: 图片文件路径
+        reencode: 先用 Pillow 解码再按原格式重新保存（旧行为，一般不需要）
         
     返回:
         base64编码的字符串
     """
     try:
+        if not reencode:
+            return ''.join(iter_data_uri(image_path))
+        
+        from PIL import Image
+        
         # 打开图片
         img = Image.open(image_path)
         
@@ -39,42 +147,339 @@ def image_to_base64(image_path):
         print(f"转换失败: {e}")
         return None
 
+
+def small_image_data_uri(path, threshold=INLINE_IMAGE_BYTES):
+    """不超过 threshold 字节的图片返回 data URI，其余（或不是图片、不存在）返回 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if stat.st_size > threshold or not os.path.isfile(path):
+        return None
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _data_uri_cache:
+        try:
+            _data_uri_cache[key] = ''.join(iter_data_uri(path))
+        except ValueError:
+            _data_uri_cache[key] = None
+    return _data_uri_cache[key]
+
+
+def inline_signature(path, threshold=INLINE_IMAGE_BYTES):
+    """
+    path 的内联结果摘要：会被内联时为 data URI 的哈希（图片内容变化即变化），不内联时为 None
+    （超过阈值、不是图片或不存在）。增量构建用它判断文章是否需要重新生成
+    """
+    data_uri = small_image_data_uri(path, threshold)
+    return hashlib.sha256(data_uri.encode('ascii')).hexdigest()[:16] if data_uri is not None else None
+
+
+def inline_small_images(text, base_dir, threshold=INLINE_IMAGE_BYTES, references=None, css=False):
+    """
+    把 HTML 中 <img src="..."> 和 CSS（<style> 块、style="..." 属性）里 url(...) 引用的本地小图片替换成 data URI；
+    css=True 时 text 整体是样式表。<pre> / <code> 中的内容不改动。
+    相对路径以 base_dir 为基准；远程地址、已内联的和超过 threshold 的图片保持不变。
+    references 为 dict 时记录每个本地引用 {相对路径: inline_signature}
+    """
+    if threshold <= 0:
+        return text
+
+    def data_uri_for(ref):
+        if ref.startswith(('data:', '#', '/')) or '://' in ref:
+            return None
+        ref = ref.split('#', 1)[0].split('?', 1)[0]
+        path = os.path.join(base_dir, ref)
+        if references is not None:
+            references[ref] = inline_signature(path, threshold)
+        return small_image_data_uri(path, threshold)
+
+    def replace_src(match):
+        data_uri = data_uri_for(match[2])
+        return f'{match[1]}src="{data_uri}"' if data_uri else match.group(0)
+
+    def replace_url(match):
+        data_uri = data_uri_for(match[3])
+        # 保留原来的引号（style="..." 里不能再出现双引号）；base64 本身不需要引号
+        return f'url({match[1]}{match[2]}{data_uri}{match[2]}{match[4]})' if data_uri else match.group(0)
+
+    def inline_css(css_text):
+        return CSS_URL_PATTERN.sub(replace_url, css_text) if 'url(' in css_text else css_text
+
+    def inline_html(html):
+        if 'src="' in html:
+            html = IMG_SRC_PATTERN.sub(replace_src, html)
+        if 'url(' in html:
+            html = STYLE_BLOCK_PATTERN.sub(lambda match: match[1] + inline_css(match[2]) + match[3], html)
+            html = STYLE_ATTR_PATTERN.sub(lambda match: match[1] + inline_css(match[2]) + match[3], html)
+        return html
+
+    if css:
+        return inline_css(text)
+    parts = []
+    position = 0
+    for match in VERBATIM_PATTERN.finditer(text):
+        parts += [inline_html(text[position:match.start()]), match.group(0)]
+        position = match.end()
+    parts.append(inline_html(text[position:]))
+    return ''.join(parts)
+
+
 def save_to_file(base64_string, output_file):
     """
     将base64字符串保存到文件
     
     参数:
-        base64_string: base64编码的字符串
+        base64_string: base64编码的字符串，或 iter_data_uri 生成的分块（边编码边写入）
         output_file: 输出文件路径
     """
     try:
         with open(output_file, 'w') as f:
-            f.write(base64_string)
+            if isinstance(base64_string, str):
+                f.write(base64_string)
+            else:
+                f.writelines(base64_string)
         print(f"Base64编码已保存至: {output_file}")
     except Exception as e:
         print(f"保存失败: {e}")
 
+
+def source_digest(data):
+    """原图内容 + 处理参数的哈希，决定输出文件名"""
+    digest = hashlib.sha256(data)
+    digest.update(f"{PIPELINE_VERSION}:{RESPONSIVE_WIDTHS}:{WEBP_QUALITY}:{JPEG_QUALITY}".encode('utf-8'))
+    return digest.hexdigest()[:10]
+
+
+def target_widths(width):
+    widths = [target for target in RESPONSIVE_WIDTHS if target < width]
+    if width <= RESPONSIVE_WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def render_variants(source_path, output_dir, digest):
+    """
+    进程池任务：解码一次原图，为每个目标宽度各写出 WebP 和 JPEG。
+    返回 manifest 条目 {hash, width, height, webp: [[宽度, 文件名], ...], jpeg: [...]}
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as img:
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+        # JPEG 不支持透明，透明区域铺白底
+        if has_alpha:
+            flat = Image.new('RGB', img.size, (255, 255, 255))
+            flat.paste(img, mask=img.getchannel('A'))
+        else:
+            flat = img
+
+        entry = {'hash': digest, 'width': img.width, 'height': img.height, 'webp': [], 'jpeg': []}
+        stem = re.sub(r'[^\w-]+', '-', Path(source_path).stem).strip('-') or 'image'
+        for width in target_widths(img.width):
+            height = round(img.height * width / img.width)
+            for fmt, source, options in (
+                ('webp', img, {'quality': WEBP_QUALITY, 'method': 4}),
+                ('jpeg', flat, {'quality': JPEG_QUALITY, 'optimize': True, 'progressive': True}),
+            ):
+                resized = source if width == img.width else source.resize((width, height), Image.LANCZOS)
+                name = f"{stem}-{digest}-{width}w.{'jpg' if fmt == 'jpeg' else fmt}"
+                # 先写临时文件再改名，中断时不会留下半张图
+                temp_path = Path(output_dir) / f".{name}.tmp"
+                resized.save(temp_path, format=fmt.upper(), **options)
+                os.replace(temp_path, Path(output_dir) / name)
+                entry[fmt].append([width, name])
+    return entry
+
+
+def find_sources(root):
+    output_dir = root / RESPONSIVE_DIR
+    return sorted(
+        path for path in root.rglob('*')
+        if path.suffix.lower() in SOURCE_SUFFIXES and path.is_file() and output_dir not in path.parents
+    )
+
+
+def load_manifest(root):
+    """读取 root/responsive/manifest.json（{原图相对路径: 条目}），文件未变化时直接用缓存"""
+    path = Path(root) / RESPONSIVE_DIR / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f).get('images', {})
+    _manifest_cache[path] = (mtime, manifest)
+    return manifest
+
+
+def process_root(root, jobs=1):
+    """
+    为 root 下的所有图片生成响应式版本。内容哈希未变且输出文件都在的图片直接跳过；
+    不再被引用的旧输出会被删除。返回 (处理数量, 跳过数量)
+    """
+    root = Path(root)
+    if not root.exists():
+        return 0, 0
+    output_dir = root / RESPONSIVE_DIR
+    output_dir.mkdir(exist_ok=True)
+    previous = load_manifest(root)
+
+    manifest = {}
+    todo = []
+    for source in find_sources(root):
+        key = source.relative_to(root).as_posix()
+        digest = source_digest(source.read_bytes())
+        entry = previous.get(key)
+        if entry and entry['hash'] == digest and all(
+            (output_dir / name).exists() for fmt in ('webp', 'jpeg') for _, name in entry[fmt]
+        ):
+            manifest[key] = entry
+        else:
+            todo.append((key, source, digest))
+
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [(key, pool.submit(render_variants, source, output_dir, digest)) for key, source, digest in todo]
+            results = [(key, future.result()) for key, future in futures]
+    else:
+        results = [(key, render_variants(source, output_dir, digest)) for key, source, digest in todo]
+    for key, entry in results:
+        manifest[key] = entry
+        print(f"🖼  {root.name}/{key}: {len(entry['webp'])} 种宽度 × WebP/JPEG")
+
+    keep = {name for entry in manifest.values() for fmt in ('webp', 'jpeg') for _, name in entry[fmt]}
+    for path in output_dir.iterdir():
+        if path.name != MANIFEST_NAME and path.name not in keep:
+            path.unlink()
+
+    text = json.dumps({'version': PIPELINE_VERSION, 'images': dict(sorted(manifest.items()))},
+                      ensure_ascii=False, indent=2) + '\n'
+    manifest_path = output_dir / MANIFEST_NAME
+    if not manifest_path.exists() or manifest_path.read_text(encoding='utf-8') != text:
+        manifest_path.write_text(text, encoding='utf-8')
+    return len(todo), len(manifest) - len(todo)
+
+
+def lookup(image_path):
+    """原图路径 → (所在根目录, manifest 条目)；不在流水线管理范围内时返回 (None, None)"""
+    image_path = Path(os.path.abspath(image_path))
+    for root in IMAGE_ROOTS:
+        try:
+            key = image_path.relative_to(root).as_posix()
+        except ValueError:
+            continue
+        entry = load_manifest(root).get(key)
+        if entry:
+            return root, entry
+    return None, None
+
+
+def picture_html(entry, url_prefix, sizes='100vw', attrs=' loading="lazy"'):
+    """
+    <picture> 标记：WebP 的 srcset 放在 <source>，JPEG 作为 <img> 的 srcset 和兜底 src。
+    url_prefix 是从页面到 responsive/ 目录的相对路径；attrs 原样加到 <img> 上（alt、class、loading 等）
+    """
+    def srcset(fmt):
+        return ', '.join(f"{url_prefix}{name} {width}w" for width, name in entry[fmt])
+
+    fallback = entry['jpeg'][-1][1]
+    return (
+        f'<picture>'
+        f'<source type="image/webp" srcset="{srcset("webp")}" sizes="{sizes}">'
+        f'<img src="{url_prefix}{fallback}" srcset="{srcset("jpeg")}" sizes="{sizes}"'
+        f' width="{entry["width"]}" height="{entry["height"]}" decoding="async"{attrs}>'
+        f'</picture>'
+    )
+
+
+def update_markup(html_path):
+    """
+    重写 html_path 中 <!-- responsive 图片路径 属性... --> 与 <!-- /responsive --> 之间的 <picture>。
+    图片路径相对于 HTML 文件；属性里的 sizes="..." 用于 <source> 和 <img>，其余属性加到 <img> 上
+    """
+    html_path = Path(html_path)
+    content = html_path.read_text(encoding='utf-8')
+
+    def replace(match):
+        source = html_path.parent / match['src']
+        root, entry = lookup(source)
+        if entry is None:
+            print(f"⚠️  {html_path.name}: {match['src']} 还没有响应式版本")
+            return match.group(0)
+        attrs = match['attrs']
+        sizes = re.search(r'\ssizes="([^"]*)"', attrs)
+        if sizes:
+            attrs = attrs.replace(sizes.group(0), '')
+        prefix = os.path.relpath(root / RESPONSIVE_DIR, html_path.parent).replace(os.sep, '/') + '/'
+        picture = picture_html(entry, prefix, sizes.group(1) if sizes else '100vw', attrs)
+        # 与标记同样缩进
+        line_start = content.rfind('\n', 0, match.start()) + 1
+        indent = content[line_start:match.start()]
+        indent = indent if not indent.strip() else ''
+        return f"{match['open']}\n{indent}{picture}\n{indent}{match['close']}"
+
+    updated = MARKER_PATTERN.sub(replace, content)
+    if updated != content:
+        html_path.write_text(updated, encoding='utf-8')
+        print(f"✅ 已更新 {html_path.name} 中的响应式图片")
+
+
 def main():
     """主函数"""
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="图片转 base64 data URI，或批量生成响应式图片")
+    parser.add_argument('image', nargs='?', help="要转换为 data URI 的图片")
+    parser.add_argument('output', nargs='?', help="保存 data URI 的文件（默认打印）")
+    parser.add_argument('--reencode', action='store_true',
+                        help="先用 Pillow 解码再重新保存（旧行为；默认直接编码原始字节）")
+    parser.add_argument('--responsive', nargs='*', type=Path, metavar='DIR',
+                        help="为这些目录生成 WebP/JPEG 多尺寸版本（默认 images/ 和 blog/assets/）")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="响应式模式的并行进程数（默认 CPU 核数）")
+    args = parser.parse_args()
+    
+    if args.responsive is not None:
+        for root in args.responsive or IMAGE_ROOTS:
+            processed, skipped = process_root(root.resolve(), jobs=args.jobs)
+            print(f"📦 {root}: 处理 {processed} 张，跳过 {skipped} 张未修改的图片")
+        update_markup(SITE_ROOT / "index.html")
+        return
+    
+    if not args.image:
         print("使用方法: python convert_image.py <图片文件路径> [输出文件路径]")
+        print("        python convert_image.py --responsive [目录 ...] [--jobs N]")
         return
     
-    image_path = sys.argv[1]
+    image_path = args.image
     
     if not os.path.exists(image_path):
         print(f"错误: 文件 '{image_path}' 不存在")
         return
     
-    base64_string = image_to_base64(image_path)
+    # 写文件时边编码边写，不在内存里拼出整个字符串
+    if args.output and not args.reencode:
+        try:
+            chunks = iter_data_uri(image_path)
+            header = next(chunks)
+        except ValueError as e:
+            print(f"转换失败: {e}")
+            return
+        print("转换成功!")
+        save_to_file(itertools.chain([header], chunks), args.output)
+        return
+    
+    base64_string = image_to_base64(image_path, reencode=args.reencode)
     
     if base64_string:
         print("转换成功!")
         
         # 如果指定了输出文件，则保存到文件
-        if len(sys.argv) > 2:
-            output_file = sys.argv[2]
-            save_to_file(base64_string, output_file)
+        if args.output:
+            save_to_file(base64_string, args.output)
         else:
             print("\nBase64编码:")
             print(base64_string[:100] + "..." if len(base64_string) > 100 else base64_string)